@@ -2,7 +2,8 @@
 import streamlit as st
 
 from modules.ui import init_app, topbar, require_login, goto, sync_route_from_query, logout
-from modules import login, data_input, extract_customers, marketing_strategy
+from modules import login, data_input, extract_customers, marketing_strategy, dashboard
+from modules.jobs import render_jobs_panel
 
 init_app()
 sync_route_from_query()  # URL에서 route와 로그인 상태 복원
@@ -24,6 +25,7 @@ if route != "login":
 # 상단바는 로그인 페이지 제외하고 표시
 if route != "login":
     topbar(route)
+    render_jobs_panel()  # 백그라운드 분석 작업 진행/완료 처리 (모든 페이지 공통)
 
 # 실제 페이지 렌더
 if route == "login":
@@ -34,5 +36,7 @@ elif route == "extract":
     extract_customers.render()
 elif route == "strategy":
     marketing_strategy.render()
+elif route == "dashboard":
+    dashboard.render()
 else:
     goto("data")
\ No newline at end of file
@@ -0,0 +1,44 @@
+# benchmarks/bench_cluster.py
+"""
+샤드 분산 스코어링 확장성: localhost worker 수를 늘려가며 처리량(rows/s) 측정
+
+    python -m benchmarks.bench_cluster --rows 2000000 --workers 1 2 4 8 --shards 64
+
+- worker는 modules.cluster.start_local_workers (실제 다중 호스트와 같은 TCP 경로)
+- 1 worker 대비 처리량 배율(speedup)과 효율(speedup / worker 수) 출력
+"""
+import argparse
+
+from benchmarks.synth import make_customers
+from modules.cluster import new_authkey, score_sharded, start_local_workers, stop_workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--shards", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    df = make_customers(args.rows)
+    print(f"rows={args.rows:,} shards={args.shards}")
+    print(f"{'workers':>8}{'wall_s':>9}{'rows/s':>12}{'speedup':>9}{'eff':>7}")
+
+    authkey = new_authkey()
+    base = None
+    for n in args.workers:
+        addresses, _ = start_local_workers(n, authkey)
+        try:
+            # 첫 샤드의 모델 로드 비용은 제외: 워밍업 1회
+            score_sharded(df.head(1000), addresses, n_shards=n, authkey=authkey)
+            _, summary = score_sharded(df, addresses, n_shards=args.shards, authkey=authkey)
+        finally:
+            stop_workers(addresses, authkey)
+
+        rate = summary["rows_per_s"]
+        base = base or rate
+        print(f"{n:>8}{summary['wall_s']:>9.2f}{rate:>12,.0f}{rate / base:>9.2f}{rate / base / n:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
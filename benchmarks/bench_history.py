@@ -0,0 +1,68 @@
+# benchmarks/bench_history.py
+"""
+점수 이력 저장소: 실행 N회 추가 후 고객 1명 추이 조회 지연(ms) 측정
+
+    python -m benchmarks.bench_history --customers 1000000 --runs 24 --queries 200
+
+- 월 1회 실행을 흉내 내도록 run_key 시각을 한 달씩 당겨서 기록 (customers x runs 행)
+- --compact면 조회 전에 compact(older_than_days=0)로 버킷·월별 파일 병합
+- 고객 ID는 무작위로 골라 조회 (p50 / p95 / max)
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from modules.history import append_run, compact, customer_history, new_run_key
+
+TIERS = np.array(["Tier 1", "Tier 2", "Tier 3", "Tier 4"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--customers", type=int, default=1_000_000)
+    parser.add_argument("--runs", type=int, default=24)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--compact", action="store_true")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    ids = pd.Series([f"C{i:09d}" for i in range(args.customers)])
+    root = tempfile.mkdtemp(prefix="score_history_")
+    try:
+        t0 = time.perf_counter()
+        now = datetime.now()
+        for r in range(args.runs):
+            p = rng.random(args.customers)
+            out = pd.DataFrame({
+                "customer_id": ids,
+                "churn_proba": p,
+                "risk_tier": TIERS[3 - np.digitize(p, [0.9, 0.95, 0.99])],
+                "model_version": "bench",
+            })
+            append_run(out, run_key=new_run_key(now - timedelta(days=31 * (args.runs - 1 - r))), root=root)
+        print(f"append: {args.runs} runs x {args.customers:,} rows  {time.perf_counter() - t0:.1f}s")
+
+        if args.compact:
+            t0 = time.perf_counter()
+            stats = compact(root, older_than_days=0)
+            print(f"compact: {stats}  {time.perf_counter() - t0:.1f}s")
+
+        customer_history(ids.iat[0], root=root)  # 워밍업
+        lat = []
+        for cid in rng.choice(ids.to_numpy(), args.queries):
+            t0 = time.perf_counter()
+            hist = customer_history(cid, root=root)
+            lat.append((time.perf_counter() - t0) * 1000)
+        lat = np.array(lat)
+        print(f"query: {len(hist)} points/customer  p50={np.percentile(lat, 50):.1f}ms p95={np.percentile(lat, 95):.1f}ms max={lat.max():.1f}ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
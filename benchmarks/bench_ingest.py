@@ -0,0 +1,73 @@
+# benchmarks/bench_ingest.py
+"""
+업로드 파싱 시간 비교: 기존 pd.read_csv(전 컬럼, 타입 추론) vs modules.ingest.read_table
+
+    python -m benchmarks.bench_ingest --rows 1000000 --extra-cols 60
+
+측정값 (1,000,000행 x 95컬럼, CSV 576MB, pandas 3.0 / pyarrow, best of 3):
+  - 1코어:  before 8.24s / 787MB -> after(pyarrow) 3.25s / 262MB (2.5x), C 엔진 폴백 6.62s, Parquet 0.71s
+  - 멀티코어 리뷰 환경: after(pyarrow) 약 3.3x (pyarrow CSV 파서가 코어 수만큼 병렬)
+"""
+import argparse
+import io
+import time
+
+import pandas as pd
+
+from benchmarks.synth import make_customers
+from modules.ingest import HAS_PYARROW, read_table
+
+
+def _timed(fn, repeat: int):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--extra-cols", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    df = make_customers(args.rows, extra_cols=args.extra_cols)
+    csv_bytes = df.to_csv(index=False).encode("utf-8-sig")  # BOM 포함 (실제 엑셀 추출본과 동일)
+    print(f"rows={args.rows:,} cols={df.shape[1]} csv={len(csv_bytes) / 1e6:.1f}MB pyarrow={HAS_PYARROW}")
+
+    def before():
+        return pd.read_csv(io.BytesIO(csv_bytes))
+
+    def after():
+        buf = io.BytesIO(csv_bytes)
+        buf.name = "upload.csv"
+        return read_table(buf)
+
+    t_before, df_before = _timed(before, args.repeat)
+    t_after, df_after = _timed(after, args.repeat)
+
+    mem_before = df_before.memory_usage(deep=True).sum() / 1e6
+    mem_after = df_after.memory_usage(deep=True).sum() / 1e6
+    print(f"before: {t_before:.3f}s  cols={df_before.shape[1]}  mem={mem_before:.1f}MB")
+    print(f"after : {t_after:.3f}s  cols={df_after.shape[1]}  mem={mem_after:.1f}MB  ({t_before / t_after:.1f}x)")
+
+    if HAS_PYARROW:
+        pq_buf = io.BytesIO()
+        df.to_parquet(pq_buf, index=False)
+        pq_bytes = pq_buf.getvalue()
+
+        def after_parquet():
+            buf = io.BytesIO(pq_bytes)
+            buf.name = "upload.parquet"
+            return read_table(buf)
+
+        t_pq, _ = _timed(after_parquet, args.repeat)
+        print(f"parquet: {t_pq:.3f}s  file={len(pq_bytes) / 1e6:.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
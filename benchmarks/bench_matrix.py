@@ -0,0 +1,101 @@
+# benchmarks/bench_matrix.py
+"""
+피처 행렬 형식 비교: dense(get_dummies int64 + reindex) vs narrow(float32) vs sparse(CSR float32)
+
+    python -m benchmarks.bench_matrix --rows 500000 --regions 10 100 1000 5000
+
+- region 카디널리티를 늘려가며 행렬 생성 시간 / 행렬 메모리 / 생성 중 peak 메모리(tracemalloc) 측정
+- 합성 데이터로 학습한 LogisticRegression(dense/sparse 입력 모두 지원)으로 예측 처리량(rows/s) 측정
+- 세 형식의 예측 확률 최대 차이도 함께 출력 (형식 변경이 결과를 바꾸지 않는지 확인)
+
+측정값 (--rows 50000 --regions 10 100 1000, pandas 3.0 / scikit-learn, 1코어):
+  regions mode     cols  build_s  matrix_MB  peak_MB  pred_rows/s   max|dp|
+       10 dense      34    0.107       13.6     34.9    4,973,125  0
+       10 narrow     34    1.020        6.8     32.8    6,733,254  2.1e-11
+       10 sparse     34    1.056        7.1     67.8    9,443,825  2.1e-11
+      100 dense     124    0.124       49.6    106.1    1,339,142  0
+      100 narrow    124    0.550       24.8     50.6    1,684,820  1.6e-10
+      100 sparse    124    0.562        7.1     67.8   12,388,402  1.6e-10
+     1000 dense    1024    0.379      409.6    826.3      212,786  0
+     1000 narrow   1024    0.460      204.8    230.8      268,409  4.8e-11
+     1000 sparse   1024    0.610        7.1     68.0   10,528,133  4.8e-11
+  -> 고카디널리티에서 행렬 메모리 409.6MB -> 204.8MB(narrow) / 7.1MB(sparse), peak 826MB -> 231MB / 68MB,
+     sparse 예측 처리량 약 50x. 저카디널리티(10)에서는 narrow/sparse 생성이 dense보다 느림 (행렬이 작아 이득 없음)
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+from benchmarks.synth import make_customers
+from modules.ai_lib import (
+    CORE_CATEGORICAL_FEATURES, HIGH_IMPORTANCE_FEATURES, HAS_SCIPY, build_feature_matrix, preprocess_data,
+)
+
+FIT_ROWS = 20_000
+
+
+def _model_features(df: pd.DataFrame) -> list:
+    cats = [f"{c}_{v}" for c in CORE_CATEGORICAL_FEATURES for v in sorted(df[c].astype(str).unique())]
+    return HIGH_IMPORTANCE_FEATURES + cats
+
+
+def _build(mode: str, df: pd.DataFrame, features: list):
+    if mode == "dense":
+        return preprocess_data(df, model_features=features)
+    return build_feature_matrix(df, model_features=features, mode=mode)
+
+
+def _nbytes(X) -> int:
+    if isinstance(X, pd.DataFrame):
+        return int(X.memory_usage(index=False).sum())
+    return int(X.data.nbytes + X.indices.nbytes + X.indptr.nbytes)
+
+
+def _measure(mode: str, df: pd.DataFrame, features: list, model):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    X = _build(mode, df, features)
+    t_build = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    p = model.predict_proba(X)[:, 1]
+    t_pred = time.perf_counter() - t0
+    return t_build, _nbytes(X), peak, t_pred, p
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--regions", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    args = parser.parse_args(argv)
+
+    modes = ["dense", "narrow"] + (["sparse"] if HAS_SCIPY else [])
+    print(f"rows={args.rows:,} scipy={HAS_SCIPY}")
+    print(f"{'regions':>8} {'mode':<7}{'cols':>7}{'build_s':>9}{'matrix_MB':>11}{'peak_MB':>9}{'pred_rows/s':>13}{'max|dp|':>10}")
+
+    for n_regions in args.regions:
+        df = make_customers(args.rows, n_regions=n_regions, seed=n_regions)
+        features = _model_features(df)
+
+        fit = df.head(FIT_ROWS)
+        X_fit = preprocess_data(fit, model_features=features)
+        model = LogisticRegression(max_iter=200).fit(X_fit.astype(float), fit["churn"])
+
+        base = None
+        for mode in modes:
+            t_build, nbytes, peak, t_pred, p = _measure(mode, df, features, model)
+            base = p if base is None else base
+            print(
+                f"{n_regions:>8} {mode:<7}{len(features):>7}{t_build:>9.3f}{nbytes / 1e6:>11.1f}"
+                f"{peak / 1e6:>9.1f}{args.rows / t_pred:>13,.0f}{float(np.abs(p - base).max()):>10.2e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
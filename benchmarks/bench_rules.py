@@ -0,0 +1,44 @@
+# benchmarks/bench_rules.py
+"""
+규칙 기반 전략 엔진 처리량: 고객 1명 호출 지연(µs)과 일괄(rule_strategy_frame) 처리량(rows/s)
+
+    python -m benchmarks.bench_rules --rows 2000000 --single 100000
+
+- 단건: modules.rule_strategy.rule_strategy (dict 입력, 코드 계산 + 캐시 조회)
+- 일괄: modules.export.rule_strategy_frame (벡터 코드 계산 + 고유 코드별 평탄화 + take)
+- 티어는 모델 없이 무작위 배정 (엔진 비용만 측정)
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synth import make_customers
+from modules.export import rule_strategy_frame
+from modules.rule_strategy import TIERS, rule_strategy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--single", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    df = make_customers(args.rows)
+    df["risk_tier"] = np.random.default_rng(0).choice(TIERS, len(df))
+
+    records = df.head(args.single).to_dict("records")
+    t0 = time.perf_counter()
+    for r in records:
+        rule_strategy(r)
+    single = time.perf_counter() - t0
+    print(f"single: {len(records):,} calls  {single / len(records) * 1e6:.1f} µs/call")
+
+    t0 = time.perf_counter()
+    out = rule_strategy_frame(df)
+    bulk = time.perf_counter() - t0
+    print(f"bulk:   {len(out):,} rows  {bulk:.2f}s  ({len(out) / bulk:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+# benchmarks/loadtest_app.py
+"""
+Streamlit 앱 동시 세션 부하 테스트 (헤드리스).
+
+    python -m benchmarks.loadtest_app --sessions 8 --rows 50000 --llm-latency 0.8
+
+- streamlit.testing의 AppTest로 실제 app.py를 세션별로 실행
+  로그인 -> 데이터 입력(합성 CSV 업로드, 분석 실행) -> 작업 완료 polling -> 고객 추출(ID 검색)
+  -> 마케팅 전략(전략 생성) 흐름을 N개 세션이 동시에 수행
+- AppTest는 file_uploader를 지원하지 않으므로 st.file_uploader만 합성 CSV를 돌려주도록 교체
+- LLM은 로컬 가짜 OpenAI(Responses API) 서버로 대체 (OPENAI_BASE_URL) -> 앱 코드는 그대로
+- 점수 이력(SCORE_HISTORY_DIR)/내보내기(EXPORT_DIR) 저장소는 실행마다 임시 디렉터리 -> 실제 data/, exports/를 건드리지 않음
+- rerun별 지연 p50/p90/p99, 처리량(rerun/s), 프로세스 메모리(RSS) 리포트
+"""
+import argparse
+import io
+import json
+import os
+import resource
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.synth import make_customers
+
+APP_PATH = "app.py"
+RUN_TIMEOUT = 120
+
+FAKE_STRATEGY = {
+    "strategy_cards": [
+        {
+            "title": f"추천 전략 0{i}", "headline": "부하 테스트", "desc": "가짜 LLM 응답",
+            "bullets": ["a", "b", "c"],
+            "kpi_left_label": "이탈률", "kpi_left_value": 10, "kpi_left_direction": "down",
+            "kpi_right_label": "반응률", "kpi_right_value": 20, "kpi_right_direction": "up",
+        }
+        for i in range(1, 4)
+    ],
+    "channel_table": [
+        {"channel": ch, "score": 3, "message_point": "-", "reason": "-"}
+        for ch in ["Push", "SMS", "Email", "In-app"]
+    ],
+    "message_examples": [{"channel": "Push", "text": "테스트 메시지"}],
+}
+
+
+# =========================
+# Fake local LLM
+# =========================
+def _start_fake_llm(latency: float) -> ThreadingHTTPServer:
+    body = json.dumps({
+        "id": "resp_loadtest", "object": "response", "created_at": int(time.time()),
+        "model": "fake", "status": "completed",
+        "output": [{
+            "type": "message", "id": "msg_loadtest", "status": "completed", "role": "assistant",
+            "content": [{"type": "output_text", "text": json.dumps(FAKE_STRATEGY, ensure_ascii=False), "annotations": []}],
+        }],
+    }, ensure_ascii=False).encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _patch_uploader(csv_bytes: bytes):
+    def fake_file_uploader(*args, **kwargs):
+        buf = io.BytesIO(csv_bytes)
+        buf.name = "loadtest.csv"
+        return buf
+
+    st.file_uploader = fake_file_uploader
+
+
+# =========================
+# Session flow
+# =========================
+class _Recorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def timed(self, step: str, fn):
+        t0 = time.perf_counter()
+        out = fn()
+        with self.lock:
+            self.samples[step].append(time.perf_counter() - t0)
+        return out
+
+
+def _button(at: AppTest, label: str):
+    return next(b for b in at.button if b.label == label)
+
+
+def _has_preview(at: AppTest) -> bool:
+    return "preview" in at.session_state and at.session_state["preview"] is not None
+
+
+def _session(rec: _Recorder, think: float, poll: float):
+    at = AppTest.from_file(APP_PATH, default_timeout=RUN_TIMEOUT)
+    rec.timed("login:load", at.run)
+
+    at.text_input(key="login_id").input("admin")
+    at.text_input(key="login_pw").input("1234")
+    rec.timed("login:submit", _button(at, "Login").click().run)
+    time.sleep(think)
+
+    # 분석 실행 -> 백그라운드 작업 완료까지 polling rerun
+    rec.timed("data:submit", _button(at, "예측 결과 보기").click().run)
+    t0 = time.perf_counter()
+    # 미리보기(중간 결과)는 세션에만 반영되고, 작업 완료 시 extract로 이동 + preview 제거
+    while at.session_state["route"] != "extract" or _has_preview(at):
+        if time.perf_counter() - t0 > RUN_TIMEOUT:
+            raise TimeoutError("스코어링 작업이 제한 시간 내에 끝나지 않았습니다.")
+        time.sleep(poll)
+        rec.timed("data:poll", at.run)
+    with rec.lock:
+        rec.samples["job:wall"].append(time.perf_counter() - t0)
+    time.sleep(think)
+
+    # 추출 페이지: 최상위 고객 ID 검색 -> 전략 페이지로
+    top_id = str(at.session_state["df"]["customer_id"].iloc[0])
+    rec.timed("extract:search", at.text_input(key="customer_search").input(top_id).run)
+    time.sleep(think)
+    rec.timed("extract:to_strategy", at.button(key="customer_search_go").click().run)
+    time.sleep(think)
+
+    rec.timed("strategy:generate", _button(at, "전략 생성").click().run)
+    time.sleep(think)
+    rec.timed("strategy:rerun", at.run)
+
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return float("nan")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ChurnSight 동시 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=4, help="동시 세션 수")
+    parser.add_argument("--rows", type=int, default=20_000, help="세션별 합성 업로드 행 수")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="가짜 LLM 응답 지연(초)")
+    parser.add_argument("--think", type=float, default=0.1, help="단계 사이 사용자 대기(초)")
+    parser.add_argument("--poll", type=float, default=0.5, help="작업 완료 polling 간격(초)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="loadtest_") as tmp:
+        # 저장소 경로는 modules import 시점에 읽으므로 AppTest 세션 시작 전에 설정
+        os.environ["SCORE_HISTORY_DIR"] = os.path.join(tmp, "score_history")
+        os.environ["EXPORT_DIR"] = os.path.join(tmp, "exports")
+        _run(args)
+
+
+def _run(args):
+    server = _start_fake_llm(args.llm_latency)
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    os.environ["GPT_API_KEY"] = "loadtest"
+    _patch_uploader(make_customers(args.rows).to_csv(index=False).encode("utf-8"))
+
+    rss_before = _rss_mb()
+    rec = _Recorder()
+    errors = []
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as ex:
+        futures = [ex.submit(_session, rec, args.think, args.poll) for _ in range(args.sessions)]
+        for fut in futures:
+            try:
+                fut.result()
+            except Exception as e:
+                errors.append(repr(e))
+    wall = time.perf_counter() - t0
+    server.shutdown()
+
+    reruns = sum(len(v) for k, v in rec.samples.items() if k != "job:wall")
+    print(f"sessions={args.sessions} rows={args.rows:,} wall={wall:.1f}s errors={len(errors)}")
+    print(f"{'step':<22}{'n':>5}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for step, vals in sorted(rec.samples.items()):
+        a = np.asarray(vals)
+        p50, p90, p99 = np.percentile(a, [50, 90, 99])
+        print(f"{step:<22}{len(a):>5}{p50:>9.3f}{p90:>9.3f}{p99:>9.3f}{a.max():>9.3f}")
+    print(f"throughput={reruns / wall:.2f} reruns/s  sessions/min={args.sessions / wall * 60:.1f}")
+    print(f"rss: before={rss_before:.0f}MB after={_rss_mb():.0f}MB peak={resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f}MB")
+    for e in errors[:5]:
+        print("error:", e)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# benchmarks/synth.py
+"""벤치마크/부하테스트용 합성 고객 데이터 (업로드 CSV와 같은 wide 형식)."""
+import numpy as np
+import pandas as pd
+
+REGIONS = ["서울", "경기", "인천", "부산", "대구", "광주", "대전", "울산", "강원", "제주"]
+INCOME_BANDS = ["low", "mid", "high", "very_high"]
+CARD_GRADES = ["basic", "silver", "gold", "platinum"]
+GENDERS = ["M", "F"]
+
+
+def make_customers(n: int, extra_cols: int = 0, n_regions: int = len(REGIONS), seed: int = 0) -> pd.DataFrame:
+    """
+    n: 고객 수
+    extra_cols: 모델/화면이 쓰지 않는 잡음 컬럼 수 (실제 추출 파일의 넓은 스키마 재현용)
+    n_regions: region 카디널리티 (REGIONS를 넘으면 region_XX 형태로 생성)
+    """
+    rng = np.random.default_rng(seed)
+    regions = REGIONS[:n_regions] if n_regions <= len(REGIONS) else [f"region_{i:03d}" for i in range(n_regions)]
+
+    df = pd.DataFrame({
+        "customer_id": [f"C{i:09d}" for i in range(n)],
+        "age": rng.integers(20, 80, n),
+        "gender": rng.choice(GENDERS, n),
+        "region": rng.choice(regions, n),
+        "tenure_months": rng.integers(1, 240, n),
+        "income_band": rng.choice(INCOME_BANDS, n),
+        "card_grade": rng.choice(CARD_GRADES, n),
+        "contract_cancelled": rng.integers(0, 2, n),
+        "complaints_6m": rng.poisson(0.4, n),
+        "marketing_open_rate_6m": rng.random(n).round(3),
+    })
+    for m in range(1, 7):
+        df[f"spent_m{m}"] = rng.gamma(2.0, 250_000, n).round(0)
+        df[f"txn_m{m}"] = rng.poisson(15, n)
+        df[f"login_m{m}"] = rng.poisson(8, n)
+
+    df["total_spent_6m"] = df[[f"spent_m{m}" for m in range(1, 7)]].sum(axis=1)
+    df["total_txn_6m"] = df[[f"txn_m{m}" for m in range(1, 7)]].sum(axis=1)
+    df["total_login_6m"] = df[[f"login_m{m}" for m in range(1, 7)]].sum(axis=1)
+    df["points_balance"] = rng.integers(0, 200_000, n)
+    df["revolving_usage"] = rng.integers(0, 2, n)
+    df["cash_service_usage"] = rng.integers(0, 2, n)
+    df["churn"] = (rng.random(n) < 0.08).astype(int)
+
+    for i in range(extra_cols):
+        df[f"extra_{i:03d}"] = rng.random(n).round(4)
+
+    return df
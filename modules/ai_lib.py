@@ -1,7 +1,14 @@
 # ai_lib.py
 import pandas as pd
 import numpy as np
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import scipy.sparse as sp
+    HAS_SCIPY = True
+except ImportError:
+    sp = None
+    HAS_SCIPY = False
 
 # 범주형 변수 (One-Hot Encoding 대상)
 CORE_CATEGORICAL_FEATURES = ["gender", "region", "income_band", "card_grade"]
@@ -15,9 +22,27 @@ HIGH_IMPORTANCE_FEATURES = [
     "txn_m1", "txn_m2", "txn_m3",
 ]
 
+# 피처 행렬 형식
+#   dense : get_dummies(int64) + reindex DataFrame (기존 방식)
+#   narrow: float32 단일 블록 DataFrame, One-Hot은 범주 코드로 직접 채움
+#   sparse: float32 CSR (0이 아닌 값만 저장, 범주 카디널리티가 커도 메모리 ~ 행 수)
+MATRIX_MODES = ("dense", "narrow", "sparse")
+
 # 파생변수 계산에 필요한 원본 컬럼
 _SPENT_M1_M6 = [f"spent_m{i}" for i in range(1, 7)]
 
+# 화면(추출 페이지 표/검색)에 보여주는 원본 속성 컬럼 (업로드 시 이 컬럼까지 읽음)
+RAW_COLS = [
+    "age", "gender", "region", "tenure_months",
+    "income_band", "card_grade", "contract_cancelled", "complaints_6m",
+    "marketing_open_rate_6m", "spent_m6", "txn_m6", "login_m6", "spent_m5",
+    "txn_m5", "login_m5", "spent_m4", "txn_m4", "login_m4", "spent_m3",
+    "txn_m3", "login_m3", "spent_m2", "txn_m2", "login_m2", "spent_m1",
+    "txn_m1", "login_m1", "total_spent_6m", "total_txn_6m",
+    "total_login_6m", "points_balance", "revolving_usage",
+    "cash_service_usage", "churn"
+]
+
 def _ensure_columns(
     df: pd.DataFrame,
     numeric_cols: List[str],
@@ -45,17 +70,10 @@ def _ensure_columns(
 
     return out
 
-def preprocess_data(
-    df_input: pd.DataFrame,
-    model_features: List[str],
-    id_col: str = "customer_id",
-) -> pd.DataFrame:
+def prepare_frame(df_input: pd.DataFrame, id_col: str = "customer_id") -> pd.DataFrame:
     """
-    raw 입력(df_input)을 모델 입력 형태로 변환:
-      - 파생변수 생성
-      - 범주형 One-Hot
-      - 학습 피처(model_features)와 컬럼/순서 완전 일치(reindex)
-      - ID 컬럼 제거
+    preprocess_data의 앞 단계(누락 컬럼 보정 + 타입 정리 + 파생변수)만 수행.
+    One-Hot 이전 값 기준이 필요한 곳(드리프트 기준 프로파일 등)에서 재사용.
     """
     if df_input is None or len(df_input) == 0:
         raise ValueError("입력 데이터가 비어 있습니다.")
@@ -88,6 +106,28 @@ def preprocess_data(
     df_temp["past_3m_spent"] = df_temp["spent_m4"] + df_temp["spent_m5"] + df_temp["spent_m6"]
     df_temp["spent_change_ratio"] = df_temp["recent_3m_spent"] / (df_temp["past_3m_spent"] + 1.0)
 
+    return df_temp
+
+def preprocess_data(
+    df_input: pd.DataFrame,
+    model_features: List[str],
+    id_col: str = "customer_id",
+    profile=None,
+) -> pd.DataFrame:
+    """
+    raw 입력(df_input)을 모델 입력 형태로 변환:
+      - 파생변수 생성
+      - 범주형 One-Hot
+      - 학습 피처(model_features)와 컬럼/순서 완전 일치(reindex)
+      - ID 컬럼 제거
+    profile(update(df) 메서드를 가진 누적기, 예: drift.DriftAccumulator)이 주어지면
+    같은 pass에서 타입 정리된 값으로 분포를 누적.
+    """
+    df_temp = prepare_frame(df_input, id_col=id_col)
+
+    if profile is not None:
+        profile.update(df_temp)
+
     # 3) 필요한 컬럼만 선택 (ID + 핵심 수치 + 범주형)
     features_to_use = [id_col] + HIGH_IMPORTANCE_FEATURES + CORE_CATEGORICAL_FEATURES
     # 존재하는 컬럼만 선택(안전)
@@ -109,3 +149,75 @@ def preprocess_data(
             df_processed[col] = pd.to_numeric(df_processed[col], errors="coerce").fillna(0.0)
 
     return df_processed
+
+def _feature_layout(model_features: List[str], id_col: str) -> Tuple[List[str], List[str], Dict[str, Dict[str, int]]]:
+    """
+    학습 피처 목록 -> (최종 컬럼 목록, 수치형 피처, 범주별 {값: 열 위치}).
+    get_dummies 컬럼명 규칙(<범주>_<값>)을 역으로 풀어 One-Hot 열 위치를 찾음.
+    """
+    features = [f for f in model_features if f != id_col]
+    numeric = [f for f in features if f in HIGH_IMPORTANCE_FEATURES]
+    onehot = {}
+    for c in CORE_CATEGORICAL_FEATURES:
+        prefix = c + "_"
+        onehot[c] = {f[len(prefix):]: j for j, f in enumerate(features) if f.startswith(prefix) and f not in numeric}
+    return features, numeric, onehot
+
+def category_levels(model_features: List[str], id_col: str = "customer_id") -> Dict[str, List[str]]:
+    """범주형 변수별로 학습 때 본 값 목록 (One-Hot 컬럼명에서 복원)."""
+    _, _, onehot = _feature_layout(model_features, id_col)
+    return {c: list(values) for c, values in onehot.items()}
+
+def build_feature_matrix(
+    df_input: pd.DataFrame,
+    model_features: List[str],
+    id_col: str = "customer_id",
+    profile=None,
+    mode: str = "narrow",
+):
+    """
+    preprocess_data와 같은 값의 피처 행렬을 get_dummies/reindex 없이 생성.
+      - narrow: float32 DataFrame (컬럼명 = 학습 피처, 블록 1개라 복사 없이 모델로 전달)
+      - sparse: scipy.sparse CSR float32 (열 순서 = 학습 피처)
+    트리 계열 sklearn 모델은 내부에서 float32로 변환하므로 narrow의 예측값은 dense와 같음.
+    """
+    if mode not in ("narrow", "sparse"):
+        raise ValueError(f"지원하지 않는 행렬 형식입니다: {mode} (narrow/sparse)")
+    if mode == "sparse" and not HAS_SCIPY:
+        raise ValueError("sparse 행렬을 만들려면 scipy가 필요합니다. (pip install scipy)")
+
+    df_temp = prepare_frame(df_input, id_col=id_col)
+
+    if profile is not None:
+        profile.update(df_temp)
+
+    features, numeric, onehot = _feature_layout(model_features, id_col)
+    pos = {f: j for j, f in enumerate(features)}
+    n = len(df_temp)
+
+    num_cols = np.array([pos[f] for f in numeric], dtype=np.int64)
+    num_vals = df_temp[numeric].to_numpy(dtype=np.float32)
+
+    # One-Hot: 범주 코드 -> 열 위치 (학습 때 없던 값은 코드 -1 -> 전부 0, reindex와 동일)
+    hot_rows, hot_cols = [], []
+    for c, values in onehot.items():
+        if not values:
+            continue
+        codes = pd.Categorical(df_temp[c], categories=list(values)).codes
+        hit = codes >= 0
+        hot_rows.append(np.flatnonzero(hit))
+        hot_cols.append(np.fromiter(values.values(), dtype=np.int64, count=len(values))[codes[hit]])
+    hot_rows = np.concatenate(hot_rows) if hot_rows else np.empty(0, dtype=np.int64)
+    hot_cols = np.concatenate(hot_cols) if hot_cols else np.empty(0, dtype=np.int64)
+
+    if mode == "narrow":
+        X = np.zeros((n, len(features)), dtype=np.float32)
+        X[:, num_cols] = num_vals
+        X[hot_rows, hot_cols] = 1.0
+        return pd.DataFrame(X, columns=features, copy=False)
+
+    r, k = np.nonzero(num_vals)
+    rows = np.concatenate([r, hot_rows])
+    cols = np.concatenate([num_cols[k], hot_cols])
+    data = np.concatenate([num_vals[r, k], np.ones(len(hot_rows), dtype=np.float32)])
+    return sp.csr_matrix((data, (rows, cols)), shape=(n, len(features)), dtype=np.float32)
@@ -0,0 +1,173 @@
+# modules/artifacts.py
+"""
+버전별 모델 아티팩트 저장소.
+
+    models/versions/<version>/model.pkl
+                             /thresholds.pkl
+                             /manifest.json   (버전, 생성 시각, 파일 sha256, 학습 피처 목록, 임계값)
+    models/versions/ACTIVE                    활성 버전 이름 한 줄
+
+    python -m modules.artifacts publish --model new_model.pkl --thresholds new_th.pkl --version 2611 --activate
+    python -m modules.artifacts activate 2610      # 롤백
+    python -m modules.artifacts list
+
+- 버전 디렉터리는 임시 디렉터리에 다 쓴 뒤 rename, ACTIVE는 임시 파일 + os.replace
+  -> 실행 중인 앱이 반쯤 쓰인 아티팩트를 읽는 일이 없음
+- 실행 중인 앱은 ACTIVE 변경을 주기적으로 감지해 재시작 없이 교체 (modules.inference.ModelStore)
+- 로드 시 manifest의 sha256으로 파일 무결성 확인
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import joblib
+
+ARTIFACT_DIR = "models/versions"
+ACTIVE_NAME = "ACTIVE"
+MANIFEST_NAME = "manifest.json"
+MODEL_FILE = "model.pkl"
+THRESH_FILE = "thresholds.pkl"
+HASH_BLOCK_BYTES = 1 << 20
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def version_dir(version: str) -> str:
+    return os.path.join(ARTIFACT_DIR, version)
+
+
+def active_version() -> Optional[str]:
+    """활성 버전 이름. 버전 저장소를 쓰지 않으면 None."""
+    path = os.path.join(ARTIFACT_DIR, ACTIVE_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        version = f.read().strip()
+    return version or None
+
+
+def read_manifest(version: str) -> Dict[str, Any]:
+    path = os.path.join(version_dir(version), MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise ValueError(f"모델 버전 '{version}'의 manifest가 없습니다: {path}")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_versions() -> List[Dict[str, Any]]:
+    if not os.path.isdir(ARTIFACT_DIR):
+        return []
+    out = []
+    for name in sorted(os.listdir(ARTIFACT_DIR)):
+        if os.path.exists(os.path.join(version_dir(name), MANIFEST_NAME)):
+            out.append(read_manifest(name))
+    return out
+
+
+def verify(manifest: Dict[str, Any]):
+    """manifest의 sha256과 실제 파일이 다르면 ValueError."""
+    d = version_dir(manifest["version"])
+    for file_key, hash_key in [("model_file", "model_sha256"), ("thresholds_file", "thresholds_sha256")]:
+        path = os.path.join(d, manifest[file_key])
+        if file_hash(path) != manifest[hash_key]:
+            raise ValueError(f"모델 버전 '{manifest['version']}'의 {manifest[file_key]} 해시가 manifest와 다릅니다.")
+
+
+def _thresholds_json(thresholds: Any) -> Any:
+    """manifest 기록용 (원본 형식 유지: dict/list). 해석은 inference._get_thresholds가 담당."""
+    if isinstance(thresholds, dict):
+        return {str(k): float(v) for k, v in thresholds.items()}
+    if isinstance(thresholds, (list, tuple)):
+        return [float(v) for v in thresholds]
+    return None
+
+
+def publish(model_path: str, thresholds_path: str, version: Optional[str] = None, activate_now: bool = False) -> Dict[str, Any]:
+    """모델/임계값 파일을 새 버전으로 등록. 반환: manifest."""
+    version = version or datetime.now().strftime("%Y%m%d-%H%M%S")
+    final_dir = version_dir(version)
+    if os.path.exists(final_dir):
+        raise ValueError(f"이미 존재하는 모델 버전입니다: {version}")
+
+    model = joblib.load(model_path)
+    if not hasattr(model, "feature_names_in_"):
+        raise ValueError("모델에 feature_names_in_가 없습니다. 학습 피처 목록을 확인할 수 없습니다.")
+    thresholds = joblib.load(thresholds_path)
+
+    tmp_dir = final_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    shutil.copy2(model_path, os.path.join(tmp_dir, MODEL_FILE))
+    shutil.copy2(thresholds_path, os.path.join(tmp_dir, THRESH_FILE))
+
+    manifest = {
+        "version": version,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "source_model": os.path.abspath(model_path),
+        "model_file": MODEL_FILE,
+        "model_sha256": file_hash(os.path.join(tmp_dir, MODEL_FILE)),
+        "thresholds_file": THRESH_FILE,
+        "thresholds_sha256": file_hash(os.path.join(tmp_dir, THRESH_FILE)),
+        "thresholds": _thresholds_json(thresholds),
+        "features": [str(f) for f in model.feature_names_in_],
+    }
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_dir, final_dir)
+
+    if activate_now:
+        activate(version)
+    return manifest
+
+
+def activate(version: str):
+    """ACTIVE 포인터를 원자적으로 교체."""
+    verify(read_manifest(version))
+    path = os.path.join(ARTIFACT_DIR, ACTIVE_NAME)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(version + "\n")
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모델 아티팩트 버전 관리")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_pub = sub.add_parser("publish", help="새 버전 등록")
+    p_pub.add_argument("--model", required=True)
+    p_pub.add_argument("--thresholds", required=True)
+    p_pub.add_argument("--version", default=None)
+    p_pub.add_argument("--activate", action="store_true", help="등록 후 바로 활성화")
+
+    p_act = sub.add_parser("activate", help="활성 버전 교체 (롤백 포함)")
+    p_act.add_argument("version")
+
+    sub.add_parser("list", help="등록된 버전 목록")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "publish":
+        manifest = publish(args.model, args.thresholds, version=args.version, activate_now=args.activate)
+        print(f"published {manifest['version']} (features={len(manifest['features'])}, active={args.activate})")
+    elif args.cmd == "activate":
+        activate(args.version)
+        print(f"active -> {args.version}")
+    else:
+        active = active_version()
+        for m in list_versions():
+            mark = "*" if m["version"] == active else " "
+            print(f"{mark} {m['version']:<20} {m['created_at']}  {m['model_sha256'][:12]}  features={len(m['features'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# modules/batch.py
+"""
+파티션 디렉터리(지역/일자별 파일) 무인 배치 스코어링.
+
+    python -m modules.batch --input data/incoming --output data/scored --workers 4
+    python -m modules.batch --input data/incoming --output data/scored --every 3600   # 주기 실행
+
+- 입력 디렉터리를 재귀 탐색해 파티션 파일 1개 = 출력 파일 1개로 스코어링
+- 파티션이 끝날 때마다 manifest.json을 원자적으로 갱신(checkpoint)
+  -> 중단/재시작 시 완료된 파티션은 건너뛰고 남은 것만 처리
+- 출력은 원본 확장자를 유지한 <파티션>.scored.csv (a.csv / a.parquet가 같은 출력으로 겹치지 않음)
+- 검증에서 격리된 행은 <파티션>.quarantine.csv로 따로 기록 (modules.validation)
+- 입력 탐색에서 출력 디렉터리, *.scored.* / *.quarantine.* 파일, manifest는 제외
+- 파티션에 라벨(churn)이 있으면 ROC-AUC/PR-AUC/ECE를 manifest에 함께 기록 (modules.evaluation)
+- --history면 파티션 결과를 점수 이력 저장소에 같은 실행 키로 추가 (modules.history)
+- 내용 해시와 모델 버전이 지난 실행과 같고 출력이 남아 있으면 재스코어링하지 않음
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from modules.inference import load_registry, predict_and_build
+from modules.ingest import SUPPORTED_EXTS, read_table
+from modules.ai_lib import category_levels
+from modules.validation import summarize, validate
+from modules.evaluation import EvalAccumulator
+from modules.history import append_run, new_run_key
+
+PARTITION_EXTS = SUPPORTED_EXTS
+MANIFEST_NAME = "manifest.json"
+OUTPUT_SUFFIX = ".scored.csv"
+QUARANTINE_SUFFIX = ".quarantine.csv"
+HASH_BLOCK_BYTES = 1 << 20
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_BYTES), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _is_output_name(name: str) -> bool:
+    """배치가 직접 쓰는 파일 (출력/격리/manifest) -> 입력으로 다시 읽지 않음."""
+    lower = name.lower()
+    return lower.startswith(MANIFEST_NAME) or ".scored." in lower or ".quarantine." in lower
+
+
+def _scan_partitions(input_dir: str, output_dir: Optional[str] = None) -> List[str]:
+    """
+    입력 디렉터리 기준 상대경로 목록 (정렬 = 처리 순서 고정).
+    output_dir가 input_dir 아래에 있어도 그 안은 탐색하지 않음.
+    """
+    skip = os.path.realpath(output_dir) if output_dir else None
+    keys = []
+    for root, dirs, files in os.walk(input_dir):
+        dirs[:] = [d for d in dirs if os.path.realpath(os.path.join(root, d)) != skip]
+        for name in files:
+            if name.lower().endswith(PARTITION_EXTS) and not _is_output_name(name):
+                keys.append(os.path.relpath(os.path.join(root, name), input_dir))
+    return sorted(keys)
+
+
+def _output_key(key: str) -> str:
+    """원본 확장자 유지: a.csv -> a.csv.scored.csv, a.parquet -> a.parquet.scored.csv"""
+    return key + OUTPUT_SUFFIX
+
+
+def _atomic_write_json(path: str, obj: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def load_manifest(output_dir: str) -> dict:
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {"partitions": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _score_partition(src: str, dst: str, id_col: str, history_key: Optional[str] = None) -> dict:
+    """워커 프로세스에서 실행: 파티션 1개 스코어링 후 출력 파일 원자적 기록."""
+    df_raw = read_table(src, id_col=id_col)
+    total = len(df_raw)
+    df_raw, quarantine, report = validate(
+        df_raw, id_col=id_col, categories=category_levels(load_registry()[0]["features"], id_col=id_col),
+    )
+    if len(df_raw) == 0:
+        raise ValueError(f"모든 행({total:,}건)이 검증에서 격리되었습니다.")
+    evaluator = EvalAccumulator() if "churn" in df_raw.columns else None
+    out = predict_and_build(df_raw, id_col=id_col, evaluator=evaluator)
+    evaluation = evaluator.report() if evaluator is not None else None
+
+    if history_key is not None:
+        # 파티션마다 파일 이름 조각(part)을 달리해서 같은 실행 키로 추가
+        append_run(out, run_key=history_key, id_col=id_col, part=hashlib.sha1(src.encode("utf-8")).hexdigest()[:10])
+
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    tmp = dst + ".tmp"
+    out.to_csv(tmp, index=False)
+    os.replace(tmp, dst)
+
+    # 격리 행은 출력 옆에 사유 코드와 함께 기록 (없으면 이전 실행의 파일 제거)
+    q_dst = dst[:-len(OUTPUT_SUFFIX)] + QUARANTINE_SUFFIX
+    if len(quarantine):
+        quarantine.to_csv(q_dst + ".tmp", index=False)
+        os.replace(q_dst + ".tmp", q_dst)
+    elif os.path.exists(q_dst):
+        os.remove(q_dst)
+
+    return {
+        "rows": int(len(out)),
+        "validation": summarize(total, quarantine, report),
+        "model_version": str(out["model_version"].iat[0]),
+        "tier_counts": {k: int(v) for k, v in out["risk_tier"].value_counts().sort_index().items()},
+        "evaluation": (
+            {k: evaluation[k] for k in ("labeled", "base_rate", "roc_auc", "pr_auc", "ece")}
+            if evaluation is not None else None
+        ),
+    }
+
+
+def run_batch(
+    input_dir: str,
+    output_dir: str,
+    id_col: str = "customer_id",
+    workers: int = 2,
+    force: bool = False,
+    history: bool = False,
+) -> Dict[str, int]:
+    """
+    한 번의 배치 실행. 반환: {"scored": n, "skipped": n, "failed": n}
+    force=True면 해시가 같아도 전부 재스코어링.
+    history=True면 이번 실행에서 스코어링한 파티션을 점수 이력에 추가 (건너뛴 파티션은 제외).
+    활성 모델 버전이 바뀌면 해당 파티션은 새 버전으로 다시 스코어링.
+    """
+    if not os.path.isdir(input_dir):
+        raise ValueError(f"입력 디렉터리가 없습니다: {input_dir}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    manifest = load_manifest(output_dir)
+    partitions = manifest.setdefault("partitions", {})
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+
+    model_version = load_registry()[0]["version"]
+
+    todo: List[Tuple[str, str, str]] = []
+    skipped = 0
+    for key in _scan_partitions(input_dir, output_dir):
+        src = os.path.join(input_dir, key)
+        digest = _file_hash(src)
+        prev = partitions.get(key)
+        dst = os.path.join(output_dir, _output_key(key))
+        if (
+            not force
+            and prev is not None
+            and prev.get("status") == "done"
+            and prev.get("hash") == digest
+            and prev.get("model_version") == model_version
+            and os.path.exists(dst)
+        ):
+            skipped += 1
+            continue
+        todo.append((key, src, digest))
+
+    history_key = new_run_key() if history else None
+    scored = failed = 0
+    with ProcessPoolExecutor(max_workers=max(1, int(workers))) as ex:
+        futures = {
+            ex.submit(_score_partition, src, os.path.join(output_dir, _output_key(key)), id_col, history_key): (key, digest)
+            for key, src, digest in todo
+        }
+        for fut in as_completed(futures):
+            key, digest = futures[fut]
+            entry = {"hash": digest, "output": _output_key(key), "finished_at": datetime.now().isoformat(timespec="seconds")}
+            try:
+                entry.update(fut.result())
+                entry["status"] = "done"
+                scored += 1
+            except Exception as e:
+                entry["status"] = "failed"
+                entry["error"] = str(e)
+                failed += 1
+
+            # checkpoint: 파티션 완료마다 manifest 갱신
+            partitions[key] = entry
+            manifest["updated_at"] = entry["finished_at"]
+            _atomic_write_json(manifest_path, manifest)
+
+    return {"scored": scored, "skipped": skipped, "failed": failed}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="파티션 디렉터리 배치 스코어링")
+    parser.add_argument("--input", required=True, help="파티션 파일이 쌓이는 입력 디렉터리")
+    parser.add_argument("--output", required=True, help="스코어링 결과/manifest 출력 디렉터리")
+    parser.add_argument("--id-col", default="customer_id")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--force", action="store_true", help="해시가 같아도 전부 재스코어링")
+    parser.add_argument("--every", type=int, default=0, help="N초마다 반복 실행 (0이면 1회)")
+    parser.add_argument("--history", action="store_true", help="스코어링 결과를 점수 이력 저장소에 추가")
+    args = parser.parse_args(argv)
+
+    while True:
+        stats = run_batch(
+            args.input, args.output, id_col=args.id_col, workers=args.workers, force=args.force, history=args.history,
+        )
+        print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] scored={stats['scored']} skipped={stats['skipped']} failed={stats['failed']}")
+        if args.every <= 0:
+            break
+        args.force = False  # 강제 재스코어링은 첫 회차에만
+        time.sleep(args.every)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# modules/campaign.py
+"""
+예산 제약 캠페인 타겟 선정.
+
+고객 i, 채널 k에 대해
+    기대 방어가치 ev[i, k] = churn_proba[i] * value[i] * success_rate[k]
+    비용 cost[k]
+고객당 채널 최대 1개를 고르는 multiple-choice knapsack을 greedy(LP 완화)로 풂:
+  - ev는 고객 항(p·value)과 채널 항(rate)의 곱이라 (cost, rate)의 오목 껍질(hull)이 모든 고객에 공통
+    -> hull 위 채널만 후보, 비싼 채널로의 단계별 업그레이드 효율 Δev/Δcost는 고객 안에서 감소
+  - 첫 단계(미접촉 -> 가장 싼 hull 채널)와 업그레이드를 전부 한 목록으로 Δev/Δcost 내림차순 정렬
+  - 순수익(Δev > Δcost)인 단계만 순서대로 담고, 남은 예산을 넘는 단계는 건너뛰고 계속 채움
+    (건너뛴 단계의 같은 고객 이후 업그레이드도 제외) -> 고객별 최종 채널 = 선정된 마지막 단계
+전부 numpy 벡터 연산(O(n·K) + 정렬 O(nK log nK))이라 수백만 명도 수 초 내 처리.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.ui import goto
+from modules.customer_index import CustomerIndex
+
+# 채널별 1회 접촉 비용(원)과 접촉 시 방어 성공률 가정 (UI에서 수정 가능)
+DEFAULT_CHANNELS = {
+    "Push": {"cost": 5.0, "success_rate": 0.02},
+    "SMS": {"cost": 20.0, "success_rate": 0.04},
+    "Email": {"cost": 2.0, "success_rate": 0.01},
+    "In-app": {"cost": 1.0, "success_rate": 0.01},
+    "Call": {"cost": 1500.0, "success_rate": 0.15},
+}
+
+# 고객 가치 대용치 후보 (원본 컬럼)
+VALUE_COLUMNS = ["total_spent_6m", "points_balance"]
+
+# 전략 페이지 세그먼트 선택지에 추가되는 라벨
+CAMPAIGN_SEGMENT = "캠페인 타겟"
+
+
+def _channel_hull(cost: np.ndarray, rate: np.ndarray) -> List[int]:
+    """
+    (비용, 성공률) 점의 원점 기준 위쪽 오목 껍질 (비용 오름차순 채널 위치).
+    같거나 더 싼 채널보다 성공률이 낮거나, 업그레이드 효율이 다음 단계보다 낮은 채널은 제외.
+    """
+    hull: List[int] = []
+    for k in np.lexsort((-rate, cost)):
+        if rate[k] <= 0 or (hull and rate[k] <= rate[hull[-1]]):
+            continue
+        while hull:
+            c0, r0 = (cost[hull[-2]], rate[hull[-2]]) if len(hull) >= 2 else (0.0, 0.0)
+            c1, r1 = cost[hull[-1]], rate[hull[-1]]
+            # 직전 단계 기울기 <= 새 단계 기울기면 직전 채널은 껍질 위에 있지 않음
+            if (r1 - r0) * (cost[k] - c1) <= (rate[k] - r1) * (c1 - c0):
+                hull.pop()
+            else:
+                break
+        hull.append(int(k))
+    return hull
+
+
+def _fill_budget(ci: np.ndarray, cj: np.ndarray, d_cost: np.ndarray, budget: float, n: int) -> np.ndarray:
+    """
+    정렬된 단계 목록을 앞에서부터 담되 남은 예산보다 비싼 단계는 건너뛰고 계속 진행 (순차 greedy와 같은 결과).
+    건너뛴 단계가 있는 고객은 그 이후 단계도 제외 (업그레이드 순서 유지).
+    벡터 처리: 담을 수 있는 prefix를 한 번에 담고, 남은 예산보다 비싼 단계는 일괄 제외 -> 반복.
+    단계 비용은 단계 번호(j)로만 정해지므로 반복 횟수는 hull 단계 수 정도.
+    반환: 담은 단계 위치 (목록 순서)
+    """
+    cost = d_cost[cj]
+    alive = np.ones(len(ci), dtype=bool)
+    dead = np.full(n, len(d_cost))      # 고객별 처음 제외된 단계 (이후 단계도 제외)
+    taken = []
+    remaining = budget
+    while True:
+        idx = np.flatnonzero(alive)
+        if not len(idx):
+            break
+        cs = np.cumsum(cost[idx])
+        k = int(np.searchsorted(cs, remaining, side="right"))
+        if k:
+            taken.append(idx[:k])
+            remaining -= cs[k - 1]
+        alive[idx[:k]] = False
+        rest = idx[k:]
+        rej = rest[cost[rest] > remaining]
+        if not len(rej):
+            break
+        alive[rej] = False
+        np.minimum.at(dead, ci[rej], cj[rej])
+        alive &= cj < dead[ci]
+    return np.sort(np.concatenate(taken)) if taken else np.array([], dtype=np.int64)
+
+
+def select_targets(
+    df_pred: pd.DataFrame,
+    df_raw: pd.DataFrame,
+    budget: float,
+    channels: Dict[str, Dict[str, float]],
+    value_col: str = "total_spent_6m",
+    tiers: Optional[List[str]] = None,
+    index: Optional[CustomerIndex] = None,
+) -> Tuple[pd.DataFrame, dict]:
+    """
+    반환: (선정 고객 df[첫 접촉 효율 내림차순], 요약 dict)
+    선정 df 컬럼: customer_id, churn_proba, risk_tier, risk_group, value,
+                 campaign_channel, campaign_cost, expected_value
+    """
+    names = [k for k, v in channels.items() if float(v.get("cost", 0)) > 0]
+    if not names:
+        raise ValueError("비용이 0보다 큰 채널이 하나 이상 필요합니다.")
+
+    if value_col not in df_raw.columns:
+        raise ValueError(f"가치 컬럼 '{value_col}'이(가) 원본 데이터에 없습니다.")
+
+    index = index if index is not None else CustomerIndex(df_pred, df_raw)
+    pos = np.arange(len(df_pred)) if not tiers else np.flatnonzero(df_pred["risk_tier"].isin(tiers).to_numpy())
+    pred = df_pred.iloc[pos]
+    p = pred["churn_proba"].to_numpy(dtype=float)
+
+    # 원본 가치 컬럼을 인덱스의 행 위치로 조회 (없거나 결측/음수면 0)
+    raw_pos = index.pred_raw_pos[pos]
+    raw_vals = pd.to_numeric(df_raw[value_col], errors="coerce").to_numpy(dtype=float)
+    value = np.where(raw_pos < 0, 0.0, raw_vals[np.where(raw_pos < 0, 0, raw_pos)])
+    value = np.clip(np.nan_to_num(value, nan=0.0), 0.0, None)
+
+    cost = np.array([float(channels[k]["cost"]) for k in names])
+    rate = np.array([float(channels[k].get("success_rate", 1.0)) for k in names])
+
+    # 업그레이드 단계 j: hull[j-1] -> hull[j] (j=0은 미접촉 -> hull[0])
+    hull = np.array(_channel_hull(cost, rate), dtype=np.int64)
+    final = np.full(len(pred), -1)
+    if len(hull):
+        d_cost = np.diff(np.concatenate([[0.0], cost[hull]]))
+        d_rate = np.diff(np.concatenate([[0.0], rate[hull]]))
+
+        # (n, H) 단계별 증분 가치 / 효율. 순수익 단계(Δev > Δcost)만 후보
+        a = p * value
+        gain = a[:, None] * d_rate[None, :]
+        eff = gain / d_cost[None, :]
+        cand_i, cand_j = np.nonzero(eff > 1.0)
+
+        # 효율 내림차순(동률이면 앞 단계 먼저). 고객 안에서는 효율이 단계마다 감소하므로 앞 단계가 먼저 옴
+        order = np.lexsort((cand_j, -eff[cand_i, cand_j]))
+        taken = _fill_budget(cand_i[order], cand_j[order], d_cost, float(budget), len(pred))
+        taken = order[taken]
+        np.maximum.at(final, cand_i[taken], cand_j[taken])
+
+        # 출력 순서: 첫 단계가 선정된 순서 (= 효율 내림차순)
+        first = taken[cand_j[taken] == 0]
+        chosen = cand_i[first]
+    else:
+        chosen = np.array([], dtype=np.int64)
+
+    channel = hull[final[chosen]] if len(chosen) else np.array([], dtype=np.int64)
+    out = pred.iloc[chosen][["customer_id", "churn_proba", "risk_tier", "risk_group"]].reset_index(drop=True)
+    out["value"] = value[chosen]
+    out["campaign_channel"] = np.asarray(names)[channel]
+    out["campaign_cost"] = cost[channel]
+    out["expected_value"] = np.round((p * value)[chosen] * rate[channel], 2)
+
+    summary = {
+        "selected": int(len(out)),
+        "candidates": int(len(pred)),
+        "total_cost": float(out["campaign_cost"].sum()),
+        "expected_value": float(out["expected_value"].sum()),
+        "by_channel": out["campaign_channel"].value_counts().to_dict(),
+    }
+    return out, summary
+
+
+# =========================
+# UI
+# =========================
+def render_campaign_panel():
+    """추출 페이지의 예산 기반 타겟 선정 패널. 선정 결과는 전략 페이지 세그먼트로 전달."""
+    df = st.session_state.get("df")
+    df_raw = st.session_state.get("df_raw")
+    if df is None or df_raw is None:
+        return
+
+    with st.expander("예산 기반 캠페인 타겟 선정", expanded=False):
+        c1, c2, c3 = st.columns([1, 1, 1.4])
+        with c1:
+            budget = st.number_input("캠페인 예산(원)", min_value=0, value=10_000_000, step=1_000_000, key="campaign_budget")
+        with c2:
+            value_cols = [c for c in VALUE_COLUMNS if c in df_raw.columns]
+            value_col = st.selectbox("고객 가치 기준", value_cols or VALUE_COLUMNS, key="campaign_value_col")
+        with c3:
+            tiers = st.multiselect(
+                "대상 티어", ["Tier 1", "Tier 2", "Tier 3", "Tier 4"],
+                default=["Tier 1", "Tier 2", "Tier 3"], key="campaign_tiers",
+            )
+
+        channel_df = st.data_editor(
+            pd.DataFrame([{"channel": k, **v} for k, v in DEFAULT_CHANNELS.items()]),
+            hide_index=True, use_container_width=True, key="campaign_channels",
+            column_config={
+                "channel": st.column_config.TextColumn("채널", disabled=True),
+                "cost": st.column_config.NumberColumn("접촉 비용(원)", min_value=0.0),
+                "success_rate": st.column_config.NumberColumn("방어 성공률", min_value=0.0, max_value=1.0, format="%.3f"),
+            },
+        )
+
+        if st.button("타겟 선정", use_container_width=True, key="campaign_run"):
+            channels = {r["channel"]: {"cost": r["cost"], "success_rate": r["success_rate"]} for r in channel_df.to_dict("records")}
+            try:
+                targets, summary = select_targets(
+                    df, df_raw, budget, channels, value_col=value_col, tiers=tiers,
+                    index=st.session_state.get("customer_index"),
+                )
+                st.session_state.campaign_targets = targets
+                st.session_state.campaign_summary = summary
+            except Exception as e:
+                st.error(f"타겟 선정 오류: {e}")
+
+        summary = st.session_state.get("campaign_summary")
+        targets = st.session_state.get("campaign_targets")
+        if summary and targets is not None:
+            m1, m2, m3 = st.columns(3)
+            m1.metric("선정 고객", f"{summary['selected']:,} / {summary['candidates']:,}")
+            m2.metric("집행 비용", f"{summary['total_cost']:,.0f}원")
+            m3.metric("기대 방어가치", f"{summary['expected_value']:,.0f}원")
+            st.caption(" · ".join(f"{k} {v:,}명" for k, v in summary["by_channel"].items()))
+            st.dataframe(targets.head(50), use_container_width=True, hide_index=True)
+
+            if st.button("선정 고객으로 전략 수립 →", use_container_width=True, key="campaign_to_strategy"):
+                st.session_state.strategy_segment = CAMPAIGN_SEGMENT
+                goto("strategy")
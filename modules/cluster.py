@@ -0,0 +1,343 @@
+# modules/cluster.py
+"""
+여러 호스트에 나눠서 스코어링하는 샤드 coordinator / worker.
+
+    # 공유 비밀키: worker/coordinator 모두 같은 값 (없으면 worker는 시작하지 않음)
+    export CLUSTER_AUTHKEY=$(python -c "import secrets; print(secrets.token_hex(32))")
+    # 각 호스트에서 (코어 수만큼 띄워도 됨). 기본은 127.0.0.1 -> 다른 호스트에서 받으려면 명시
+    python -m modules.cluster worker --listen 10.0.0.5:6001
+    # coordinator
+    python -m modules.cluster run --input data/all.parquet --output data/scored.csv \
+        --workers hostA:6001,hostB:6001 --shards 64
+    # 로컬 테스트: worker 프로세스 N개를 localhost에 띄워서 같은 경로로 실행 (키는 실행마다 무작위 생성)
+    python -m modules.cluster run --input data/all.csv --output data/scored.csv --local 4
+
+- customer_id 해시로 샤드 분할 (같은 고객은 항상 같은 샤드)
+- 전송은 multiprocessing.connection (TCP + authkey, pickle) -> 표준 라이브러리만으로 다중 호스트
+  pickle은 받은 메시지로 코드를 실행할 수 있으므로 authkey가 유일한 방어선:
+  기본 키 없음(CLUSTER_AUTHKEY 필수), 기본 listen 주소는 127.0.0.1, 신뢰할 수 있는 망에서만 사용
+- worker 연결마다 dispatcher 스레드 1개가 샤드 큐에서 꺼내 보냄 -> 빠른 worker가 더 많이 처리
+- 샤드 실패(worker 오류/연결 끊김/시간 초과)는 큐에 되돌려 다른 worker가 재시도 (최대 retries회)
+- 결과: 샤드 출력 concat + 확률순 정렬, 티어 집계/평균 확률/worker별 처리량 요약
+"""
+import argparse
+import os
+import queue
+import secrets
+import threading
+import time
+from multiprocessing import Process, Queue
+from multiprocessing.connection import Client, Listener
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from modules.ai_lib import category_levels
+from modules.inference import load_registry, predict_and_build
+from modules.ingest import read_table
+from modules.sharding import shard_of
+from modules.validation import validate
+
+DEFAULT_SHARDS = 32
+DEFAULT_RETRIES = 2
+# 샤드 1개 응답 대기 한도(초). 넘으면 worker를 끊고 샤드를 재배정
+SHARD_TIMEOUT = 600
+AUTHKEY_ENV = "CLUSTER_AUTHKEY"
+DEFAULT_LISTEN = "127.0.0.1:6001"
+
+Address = Tuple[str, int]
+
+
+def parse_address(text: str) -> Address:
+    host, port = text.rsplit(":", 1)
+    return host, int(port)
+
+
+def env_authkey() -> bytes:
+    """CLUSTER_AUTHKEY 환경변수 (없으면 ValueError: 알려진 기본 키로 worker를 열지 않음)."""
+    key = os.getenv(AUTHKEY_ENV)
+    if not key:
+        raise ValueError(
+            f"{AUTHKEY_ENV} 환경변수가 없습니다. worker와 coordinator에 같은 무작위 키를 설정하세요. "
+            "(예: python -c \"import secrets; print(secrets.token_hex(32))\")"
+        )
+    return key.encode("utf-8")
+
+
+def new_authkey() -> bytes:
+    """로컬 worker 전용 일회용 키 (프로세스 밖으로 나가지 않음)."""
+    return secrets.token_hex(32).encode("utf-8")
+
+
+# =========================
+# Worker
+# =========================
+def _handle(msg) -> tuple:
+    kind = msg[0]
+    if kind == "ping":
+        return ("pong", os.getpid())
+    if kind == "score":
+        _, shard_id, id_col, df = msg
+        t0 = time.perf_counter()
+        out = predict_and_build(df, id_col=id_col)
+        return ("ok", shard_id, out, time.perf_counter() - t0)
+    return ("error", None, f"알 수 없는 요청: {kind}")
+
+
+def serve(address: Address, authkey: bytes, ready: Optional[Queue] = None):
+    """worker 본체: 연결을 받아 요청을 하나씩 처리 ("stop"을 받으면 종료)."""
+    with Listener(address, authkey=authkey) as listener:
+        if ready is not None:
+            ready.put(listener.address)
+        while True:
+            conn = listener.accept()
+            with conn:
+                while True:
+                    try:
+                        msg = conn.recv()
+                    except EOFError:
+                        break
+                    if msg[0] == "stop":
+                        return
+                    try:
+                        conn.send(_handle(msg))
+                    except Exception as e:
+                        shard_id = msg[1] if msg[0] == "score" else None
+                        conn.send(("error", shard_id, str(e)))
+
+
+def start_local_workers(n: int, authkey: bytes) -> Tuple[List[Address], List[Process]]:
+    """localhost에 worker 프로세스 n개 (빈 포트 자동 선택). 다중 호스트 대용."""
+    ready: Queue = Queue()
+    procs = []
+    for _ in range(n):
+        p = Process(target=serve, args=(("127.0.0.1", 0), authkey, ready), daemon=True)
+        p.start()
+        procs.append(p)
+    return [ready.get(timeout=60) for _ in procs], procs
+
+
+def stop_workers(addresses: List[Address], authkey: bytes):
+    for addr in addresses:
+        try:
+            with Client(addr, authkey=authkey) as conn:
+                conn.send(("stop",))
+        except OSError:
+            pass
+
+
+# =========================
+# Coordinator
+# =========================
+class _ShardQueue:
+    """남은 샤드 + 시도 횟수. 모든 샤드가 끝나거나(성공/최종 실패) 할 worker가 없으면 종료."""
+
+    def __init__(self, shard_ids: List[int], retries: int):
+        self.q: "queue.Queue[int]" = queue.Queue()
+        for s in shard_ids:
+            self.q.put(s)
+        self.attempts: Dict[int, int] = {s: 0 for s in shard_ids}
+        self.retries = retries
+        self.pending = len(shard_ids)
+        self.errors: Dict[int, str] = {}
+        self.lock = threading.Lock()
+
+    def done(self, shard_id: int):
+        with self.lock:
+            self.pending -= 1
+
+    def failed(self, shard_id: int, error: str):
+        with self.lock:
+            self.attempts[shard_id] += 1
+            if self.attempts[shard_id] > self.retries:
+                self.errors[shard_id] = error
+                self.pending -= 1
+                return
+        self.q.put(shard_id)
+
+    def finished(self) -> bool:
+        with self.lock:
+            return self.pending == 0
+
+
+def _dispatch(
+    addr: Address,
+    shards: Dict[int, pd.DataFrame],
+    work: _ShardQueue,
+    results: Dict[int, pd.DataFrame],
+    stats: Dict[str, dict],
+    id_col: str,
+    authkey: bytes,
+    timeout: float,
+):
+    """worker 1개 담당 스레드: 샤드를 보내고 결과를 받음. 연결이 끊기면 이 worker는 제외."""
+    name = f"{addr[0]}:{addr[1]}"
+    w = stats.setdefault(name, {"shards": 0, "rows": 0, "busy_s": 0.0, "errors": 0, "alive": True})
+    try:
+        conn = Client(addr, authkey=authkey)
+    except OSError as e:
+        w["alive"] = False
+        w["last_error"] = str(e)
+        return
+
+    with conn:
+        while not work.finished():
+            try:
+                shard_id = work.q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            try:
+                conn.send(("score", shard_id, id_col, shards[shard_id]))
+                if not conn.poll(timeout):
+                    raise TimeoutError(f"{timeout:.0f}초 내 응답 없음")
+                reply = conn.recv()
+            except (OSError, EOFError, TimeoutError) as e:
+                # 연결 문제: 샤드는 되돌리고 이 worker는 더 쓰지 않음
+                w["errors"] += 1
+                w["alive"] = False
+                w["last_error"] = str(e)
+                work.failed(shard_id, f"{name}: {e}")
+                return
+
+            if reply[0] == "ok":
+                _, _, out, elapsed = reply
+                results[shard_id] = out
+                w["shards"] += 1
+                w["rows"] += len(out)
+                w["busy_s"] += elapsed
+                work.done(shard_id)
+            else:
+                w["errors"] += 1
+                work.failed(shard_id, f"{name}: {reply[2]}")
+
+
+def score_sharded(
+    df_raw: pd.DataFrame,
+    workers: List[Address],
+    id_col: str = "customer_id",
+    n_shards: int = DEFAULT_SHARDS,
+    retries: int = DEFAULT_RETRIES,
+    authkey: Optional[bytes] = None,
+    timeout: float = SHARD_TIMEOUT,
+) -> Tuple[pd.DataFrame, dict]:
+    """
+    authkey: worker와 공유하는 키 (None이면 CLUSTER_AUTHKEY)
+    반환: (전체 스코어링 결과[확률 내림차순], 요약 dict)
+    요약: rows, shards, tier_counts, mean_proba, wall_s, rows_per_s, workers(별 처리량)
+    재시도 후에도 실패한 샤드가 있으면 RuntimeError
+    """
+    if not workers:
+        raise ValueError("worker 주소가 하나 이상 필요합니다.")
+    if id_col not in df_raw.columns:
+        raise ValueError(f"ID 컬럼 '{id_col}'이(가) 입력에 없습니다.")
+    authkey = authkey if authkey is not None else env_authkey()
+
+    t0 = time.perf_counter()
+    sid = shard_of(df_raw[id_col], n_shards)
+    order = np.argsort(sid, kind="stable")
+    bounds = np.searchsorted(sid[order], np.arange(n_shards + 1))
+    shards = {
+        s: df_raw.iloc[order[bounds[s]:bounds[s + 1]]]
+        for s in range(n_shards) if bounds[s + 1] > bounds[s]
+    }
+
+    work = _ShardQueue(list(shards), retries)
+    results: Dict[int, pd.DataFrame] = {}
+    stats: Dict[str, dict] = {}
+    threads = [
+        threading.Thread(target=_dispatch, args=(addr, shards, work, results, stats, id_col, authkey, timeout), daemon=True)
+        for addr in workers
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # 모든 worker가 빠졌는데 샤드가 남은 경우
+    for s in shards:
+        if s not in results and s not in work.errors:
+            work.errors[s] = "처리할 수 있는 worker가 없습니다."
+    if work.errors:
+        raise RuntimeError(f"샤드 {len(work.errors)}개 실패: " + "; ".join(f"#{k} {v}" for k, v in sorted(work.errors.items())[:5]))
+
+    out = pd.concat([results[s] for s in sorted(results)], ignore_index=True)
+    out = out.sort_values("churn_proba", ascending=False).reset_index(drop=True)
+    wall = time.perf_counter() - t0
+
+    summary = {
+        "rows": int(len(out)),
+        "shards": len(shards),
+        "tier_counts": {k: int(v) for k, v in out["risk_tier"].value_counts().sort_index().items()},
+        "mean_proba": float(out["churn_proba"].mean()) if len(out) else None,
+        "wall_s": wall,
+        "rows_per_s": len(out) / wall if wall > 0 else None,
+        "workers": stats,
+    }
+    return out, summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="샤드 분산 스코어링")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_w = sub.add_parser("worker", help="worker 실행")
+    p_w.add_argument("--listen", default=DEFAULT_LISTEN, help="host:port (다른 호스트에서 받으려면 해당 인터페이스 주소)")
+
+    p_r = sub.add_parser("run", help="coordinator 실행")
+    p_r.add_argument("--input", required=True)
+    p_r.add_argument("--output", required=True)
+    p_r.add_argument("--id-col", default="customer_id")
+    p_r.add_argument("--workers", default="", help="host:port 목록 (쉼표 구분)")
+    p_r.add_argument("--local", type=int, default=0, help="localhost worker 프로세스 N개를 띄워서 사용")
+    p_r.add_argument("--shards", type=int, default=DEFAULT_SHARDS)
+    p_r.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "worker":
+        try:
+            authkey = env_authkey()
+        except ValueError as e:
+            parser.error(str(e))
+        serve(parse_address(args.listen), authkey)
+        return
+
+    addresses = [parse_address(a) for a in args.workers.split(",") if a.strip()]
+    if addresses:
+        try:
+            authkey = env_authkey()
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        # 로컬 worker만 쓰면 실행마다 무작위 키
+        authkey = new_authkey()
+    local: List[Address] = []
+    if args.local > 0:
+        local, _ = start_local_workers(args.local, authkey)
+        addresses += local
+
+    try:
+        df_raw = read_table(args.input, id_col=args.id_col)
+        df_raw, quarantine, _ = validate(
+            df_raw, id_col=args.id_col, categories=category_levels(load_registry()[0]["features"], id_col=args.id_col),
+        )
+        if len(quarantine):
+            quarantine.to_csv(os.path.splitext(args.output)[0] + ".quarantine.csv", index=False)
+        out, summary = score_sharded(
+            df_raw, addresses, id_col=args.id_col, n_shards=args.shards, retries=args.retries, authkey=authkey,
+        )
+    finally:
+        stop_workers(local, authkey)
+
+    tmp = args.output + ".tmp"
+    out.to_csv(tmp, index=False)
+    os.replace(tmp, args.output)
+
+    print(f"rows={summary['rows']:,} shards={summary['shards']} wall={summary['wall_s']:.1f}s ({summary['rows_per_s']:,.0f} rows/s)")
+    print("tiers:", summary["tier_counts"])
+    for name, w in summary["workers"].items():
+        print(f"  {name:<22} shards={w['shards']:>4} rows={w['rows']:>10,} busy={w['busy_s']:.1f}s errors={w['errors']} alive={w['alive']}")
+
+
+if __name__ == "__main__":
+    main()
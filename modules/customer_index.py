@@ -0,0 +1,66 @@
+# modules/customer_index.py
+"""
+customer_id -> 행 위치 인덱스 (스코어링 실행마다 1회 생성, 세션의 customer_index).
+
+- 정확 일치: pandas Index 해시 테이블 (get_indexer, 평균 O(1))
+- 접두 일치: 정렬된 ID 배열 + searchsorted (O(log n + k)), 첫 접두 검색 시 1회 정렬
+- pred_raw_pos: 예측 결과(df) 각 행에 대응하는 원본(df_raw) 행 위치 (-1 = 없음)
+  -> 내보내기/캠페인/요약 집계가 전체 merge 없이 원본 속성을 위치로 가져감
+"""
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PREFIX_LIMIT = 20
+
+# 전략 페이지 세그먼트 선택지에 추가되는 라벨 (ID 검색으로 넘어온 고객)
+SEARCH_SEGMENT = "검색 고객"
+
+
+class CustomerIndex:
+    def __init__(self, df_pred: pd.DataFrame, df_raw: pd.DataFrame, id_col: str = "customer_id"):
+        pred_ids = df_pred[id_col].astype(str).to_numpy()
+        raw_ids = df_raw[id_col].astype(str)
+
+        # 원본: customer_id 첫 등장 행 기준 (기존 merge 결과의 첫 행과 동일)
+        raw_first = ~raw_ids.duplicated().to_numpy()
+        raw_hit = pd.Index(raw_ids.to_numpy()[raw_first]).get_indexer(pred_ids)
+        self.pred_raw_pos = np.where(raw_hit < 0, -1, np.flatnonzero(raw_first)[np.where(raw_hit < 0, 0, raw_hit)])
+
+        # 예측: 확률 내림차순 정렬이므로 첫 등장 행 = 최고 확률 행
+        pred_first = ~pd.Series(pred_ids).duplicated().to_numpy()
+        self._ids = pd.Index(pred_ids[pred_first])
+        self._pred_pos = np.flatnonzero(pred_first)
+        self._ids.get_indexer(self._ids[:1])  # 해시 테이블을 생성 시점에 미리 구축
+
+        self._sorted_ids: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def lookup(self, customer_id: str) -> Optional[Tuple[int, int]]:
+        """정확 일치 -> (df 행 위치, df_raw 행 위치 또는 -1). 없으면 None."""
+        k = self._ids.get_indexer([str(customer_id).strip()])[0]
+        if k < 0:
+            return None
+        pred_pos = int(self._pred_pos[k])
+        return pred_pos, int(self.pred_raw_pos[pred_pos])
+
+    def pred_positions(self, customer_ids) -> np.ndarray:
+        """여러 ID의 df 행 위치 (없으면 -1)."""
+        k = self._ids.get_indexer(pd.Index(customer_ids).astype(str))
+        return np.where(k < 0, -1, self._pred_pos[np.where(k < 0, 0, k)])
+
+    def prefix(self, prefix: str, limit: int = PREFIX_LIMIT) -> List[str]:
+        """접두 일치 ID 목록 (사전순, 최대 limit개)."""
+        prefix = str(prefix).strip()
+        if not prefix:
+            return []
+        if self._sorted_ids is None:
+            # 고정폭 유니코드 배열로 정렬 (object 배열 정렬보다 빠름)
+            self._sorted_ids = np.sort(self._ids.to_numpy().astype(str))
+
+        lo = np.searchsorted(self._sorted_ids, prefix, side="left")
+        hi = np.searchsorted(self._sorted_ids, prefix + "\U0010ffff", side="left")
+        return self._sorted_ids[lo:min(hi, lo + limit)].tolist()
@@ -0,0 +1,131 @@
+# modules/dashboard.py
+"""
+포트폴리오 요약 대시보드.
+집계는 스코어링 직후 build_summary()로 1회 계산해 세션(summary)에 저장하고,
+이 페이지는 저장된 집계만 그리므로 포트폴리오 크기와 무관하게 즉시 전환됨.
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.ui import shell_open, shell_close, goto
+from modules.inference import tier_to_korean_label
+from modules.customer_index import CustomerIndex
+from modules.history import tier_trend
+
+SUMMARY_DIMENSIONS = ["region", "card_grade", "income_band"]
+HIST_BINS = 50
+TIERS = ["Tier 1", "Tier 2", "Tier 3", "Tier 4"]
+
+
+def build_summary(df_pred: pd.DataFrame, df_raw: pd.DataFrame, index: Optional[CustomerIndex] = None) -> Dict[str, object]:
+    """티어 분포 / 점수 히스토그램 / 범주별 평균 확률 / 상위 10% 구성 집계."""
+    p = df_pred["churn_proba"].to_numpy(dtype=float)
+    n = len(df_pred)
+
+    tier_counts = (
+        df_pred["risk_tier"].value_counts()
+        .reindex(TIERS, fill_value=0)
+        .rename_axis("risk_tier").reset_index(name="count")
+    )
+    tier_counts["risk_group"] = tier_counts["risk_tier"].map(tier_to_korean_label)
+    tier_counts["share"] = tier_counts["count"] / max(n, 1)
+
+    counts, edges = np.histogram(p, bins=HIST_BINS, range=(0.0, 1.0))
+    histogram = pd.DataFrame({"churn_proba": np.round(edges[:-1], 3), "count": counts})
+
+    # 예측 행 순서대로 원본 범주값 정렬
+    raw_pos = (index if index is not None else CustomerIndex(df_pred, df_raw)).pred_raw_pos
+
+    dims = [c for c in SUMMARY_DIMENSIONS if c in df_raw.columns]
+    frame = pd.DataFrame({
+        "churn_proba": p,
+        "tier1": df_pred["risk_tier"].to_numpy() == "Tier 1",
+        # df_pred는 확률 내림차순 정렬 -> 앞쪽 10%가 상위 decile
+        "top_decile": np.arange(n) < int(np.ceil(n * 0.1)),
+    })
+    for c in dims:
+        vals = df_raw[c].astype(str).to_numpy()[np.where(raw_pos < 0, 0, raw_pos)]
+        frame[c] = np.where(raw_pos < 0, "UNKNOWN", vals)
+
+    by_category = {}
+    top_decile = {}
+    for c in dims:
+        g = frame.groupby(c, sort=False).agg(
+            count=("churn_proba", "size"),
+            mean_proba=("churn_proba", "mean"),
+            tier1_share=("tier1", "mean"),
+            top_decile_count=("top_decile", "sum"),
+        )
+        by_category[c] = g[["count", "mean_proba", "tier1_share"]].sort_values("mean_proba", ascending=False).reset_index()
+
+        comp = pd.DataFrame({
+            "top_decile_share": g["top_decile_count"] / max(int(frame["top_decile"].sum()), 1),
+            "overall_share": g["count"] / max(n, 1),
+        })
+        comp["lift"] = comp["top_decile_share"] / comp["overall_share"]
+        top_decile[c] = comp.sort_values("top_decile_share", ascending=False).reset_index()
+
+    return {
+        "rows": n,
+        "mean_proba": float(p.mean()) if n else None,
+        "tier_counts": tier_counts,
+        "histogram": histogram,
+        "by_category": by_category,
+        "top_decile": top_decile,
+    }
+
+
+def render():
+    shell_open()
+
+    st.markdown('<div class="cs-title">포트폴리오 요약</div>', unsafe_allow_html=True)
+    st.markdown('<div class="cs-sub">스코어링 직후 계산된 집계로 위험 분포와 구성을 확인합니다.</div>', unsafe_allow_html=True)
+
+    df = st.session_state.get("df")
+    if df is None:
+        st.warning("먼저 데이터 입력 페이지에서 예측을 실행하세요.")
+        if st.button("데이터 입력으로 이동", use_container_width=True):
+            goto("data")
+        shell_close()
+        return
+
+    summary = st.session_state.get("summary")
+    if summary is None:
+        # 이전 버전 세션 등 집계가 없는 경우에만 1회 계산해서 저장
+        summary = build_summary(df, st.session_state.get("df_raw"), index=st.session_state.get("customer_index"))
+        st.session_state.summary = summary
+
+    # Tier metrics
+    tc = summary["tier_counts"]
+    cols = st.columns(len(tc) + 1)
+    cols[0].metric("전체 고객", f"{summary['rows']:,}")
+    for col, r in zip(cols[1:], tc.itertuples(index=False)):
+        col.metric(f"{r.risk_tier} · {r.risk_group}", f"{r.count:,}", f"{r.share * 100:.1f}%", delta_color="off")
+
+    # Score histogram
+    st.markdown("<div class='cs-section-title'>이탈 확률 분포</div>", unsafe_allow_html=True)
+    st.bar_chart(summary["histogram"], x="churn_proba", y="count", height=220)
+
+    # Category breakdown
+    dims = list(summary["by_category"])
+    if dims:
+        dim = st.radio("구분", dims, horizontal=True, key="dashboard_dim")
+        left, right = st.columns([1.2, 1])
+        with left:
+            st.markdown("<div class='cs-section-title'>범주별 평균 이탈 확률</div>", unsafe_allow_html=True)
+            st.dataframe(summary["by_category"][dim].round(4), use_container_width=True, hide_index=True)
+        with right:
+            st.markdown("<div class='cs-section-title'>상위 10% 구성</div>", unsafe_allow_html=True)
+            st.dataframe(summary["top_decile"][dim].round(4), use_container_width=True, hide_index=True)
+
+    # 실행별 티어 추이 (점수 이력 저장소의 실행 요약)
+    trend = tier_trend()
+    if len(trend) >= 2:
+        st.markdown("<div class='cs-section-title'>실행별 위험 티어 추이</div>", unsafe_allow_html=True)
+        st.line_chart(trend.set_index("run_at")[["Tier 1", "Tier 2", "Tier 3"]], height=220)
+        st.caption(f"최근 {len(trend)}회 실행 · 평균 이탈 확률 {trend['mean_proba'].iat[0]:.4f} → {trend['mean_proba'].iat[-1]:.4f}")
+
+    shell_close()
@@ -1,9 +1,105 @@
+import os
+import uuid
 import streamlit as st
-import pandas as pd
 from datetime import datetime
 
-from modules.ui import shell_open, shell_close, goto
-from modules.inference import predict_and_build
+from modules.ui import shell_open, shell_close
+from modules.inference import load_registry, predict_and_build, model_agreement
+from modules.ai_lib import category_levels
+from modules.validation import summarize, validate
+from modules.ingest import read_table
+from modules.jobs import submit_job, active_job
+from modules.drift import DriftAccumulator, compare, load_reference
+from modules.dashboard import build_summary
+from modules.customer_index import CustomerIndex
+from modules.preview import PREVIEW_MIN_ROWS, build_preview
+from modules.prefetch import PREFETCH_ENABLED, get_prefetcher
+from modules.marketing_strategy import prefetch_strategies
+from modules.evaluation import LABEL_COLUMNS, EvalAccumulator
+from modules.history import HAS_PYARROW as HAS_HISTORY, append_run
+
+NO_LABEL = "(사용 안 함)"
+
+def _score_job(up, id_col: str, label_col, prefetch: bool, progress, publish) -> dict:
+    """
+    백그라운드 작업 본문: 파일 로드(필요 컬럼만, 타입 지정) -> 예측.
+    반환 dict의 키는 그대로 session_state에 반영됨 (modules.jobs._apply_result)
+    대용량이면 층화 표본 미리보기를 먼저 게시(publish)한 뒤 전체 스코어링
+    prefetch=True면 끝에 고위험 고객 전략 사전 생성을 백그라운드로 요청 (완료를 기다리지 않음)
+    label_col이 파일에 있으면 같은 스코어링 pass에서 모델 평가를 누적 (modules.evaluation)
+    """
+    progress("파일 읽기", 0.0)
+    df_raw = read_table(up, id_col=id_col, extra_columns=[label_col] if label_col else ())
+
+    # ID 컬럼 사전 체크 (UX 개선)
+    if id_col not in df_raw.columns:
+        raise ValueError(f"선택한 ID 컬럼 '{id_col}'이 업로드 파일에 없습니다.")
+
+    # 행 단위 검증: 문제 행만 격리하고 나머지는 스코어링
+    progress("검증", 0.0)
+    total = len(df_raw)
+    df_raw, quarantine, validation = validate(
+        df_raw, id_col=id_col, categories=category_levels(load_registry()[0]["features"], id_col=id_col),
+    )
+    if len(df_raw) == 0:
+        raise ValueError(f"모든 행({total:,}건)이 검증에서 격리되었습니다. 사유: {', '.join(validation['code'].unique())}")
+
+    if len(df_raw) >= PREVIEW_MIN_ROWS:
+        progress("미리보기", 0.0)
+        publish(build_preview(df_raw, id_col=id_col))
+
+    # 드리프트 기준 프로파일이 있으면 전처리 pass에서 분포를 함께 누적
+    reference = load_reference()
+    drift_acc = DriftAccumulator.from_reference(reference) if reference is not None else None
+
+    # 라벨 컬럼이 있으면 예측 chunk마다 평가 count 누적 (추가 pass 없음)
+    evaluator = EvalAccumulator(label_col) if label_col and label_col in df_raw.columns else None
+
+    # 핵심 실행 위치
+    result_df = predict_and_build(df_raw, id_col=id_col, progress=progress, profile=drift_acc, evaluator=evaluator)
+
+    # 고객 ID 인덱스는 실행마다 1회 생성 (검색/내보내기/집계가 공유)
+    progress("인덱스 생성", 0.0)
+    customer_index = CustomerIndex(result_df, df_raw, id_col=id_col)
+
+    # 대시보드 집계는 여기서 1회만 계산 (페이지 전환 시 재집계 없음)
+    progress("요약 집계", 0.0)
+    summary = build_summary(result_df, df_raw, index=customer_index)
+
+    # 점수 이력에 이번 실행 추가 (세션 결과는 다음 실행에 덮어써지므로 추이는 이력 저장소에서 조회)
+    history_run = None
+    if HAS_HISTORY:
+        progress("이력 저장", 0.0)
+        history_run = append_run(result_df, id_col=id_col)
+
+    # 전략 사전 생성: 실행별 token으로 캐시 구분 (API 키가 없으면 생략)
+    prefetch_token = None
+    if prefetch and os.getenv("GPT_API_KEY"):
+        prefetch_token = uuid.uuid4().hex[:8]
+        prefetch_strategies(result_df, df_raw, customer_index, prefetch_token)
+
+    return {
+        "df": result_df,
+        "df_raw": df_raw,
+        # 격리 행 다운로드용 CSV는 실행마다 1회만 만듦 (추출 페이지 rerun마다 재생성하지 않음)
+        "quarantine_csv": quarantine.to_csv(index=False).encode("utf-8-sig") if len(quarantine) else None,
+        "validation_report": validation,
+        "validation_summary": summarize(total, quarantine, validation),
+        "drift_report": compare(drift_acc, reference) if drift_acc is not None else None,
+        "model_agreement": model_agreement(result_df),
+        "evaluation": evaluator.report() if evaluator is not None else None,
+        "model_version": str(result_df["model_version"].iat[0]),
+        "summary": summary,
+        "customer_index": customer_index,
+        # 이전 실행 기준의 캠페인 선정 결과는 무효화
+        "campaign_targets": None,
+        "campaign_summary": None,
+        "focus_customer": None,
+        "segment_memo": {},
+        "prefetch_token": prefetch_token,
+        "history_run": history_run,
+        "last_run_at": datetime.now().strftime("%Y-%m-%d %H:%M"),
+    }
 
 def render():
     shell_open()
@@ -13,7 +109,7 @@ def render():
 
     col1, col2 = st.columns([1.2, 1])
     with col1:
-        up = st.file_uploader("CSV 업로드", type=["csv"])
+        up = st.file_uploader("CSV / Parquet 업로드", type=["csv", "parquet"])
         st.text_input("데이터 설명(선택)", placeholder="예: 2025-12 기준 카드 이용 로그", key="data_desc")
 
         # 사용자가 선택한 ID 컬럼
@@ -23,10 +119,12 @@ def render():
             index=0
         )
 
-        st.selectbox(
+        # 라벨 컬럼이 파일에 있으면 예측과 함께 모델 성능(AUC/정밀도/재현율/보정) 평가
+        label_col = st.selectbox(
             "예측 대상(라벨) 컬럼(선택)",
-            options=["score", "churn_label"],
-            index=0
+            options=LABEL_COLUMNS + [NO_LABEL],
+            index=0,
+            key="label_col",
         )
 
     with col2:
@@ -39,38 +137,29 @@ def render():
             """,
             unsafe_allow_html=True
         )
+        prefetch = st.checkbox(
+            "고위험 고객 전략 미리 생성 (LLM 호출 비용 발생)",
+            value=PREFETCH_ENABLED,
+            key="prefetch_enabled",
+        )
         run = st.button("예측 결과 보기", use_container_width=True)
 
     if run:
         if up is None:
-            st.error("CSV 파일을 업로드하세요.")
+            st.error("CSV 또는 Parquet 파일을 업로드하세요.")
             shell_close()
             return
 
-        with st.spinner("분석 중입니다..."):
-            try:
-                df_raw = pd.read_csv(up)
-
-                # ID 컬럼 사전 체크 (UX 개선)
-                if id_col not in df_raw.columns:
-                    st.error(f"선택한 ID 컬럼 '{id_col}'이 업로드 파일에 없습니다.")
-                    shell_close()
-                    return
-
-                # 핵심 실행 위치
-                result_df = predict_and_build(df_raw, id_col=id_col)
-
-                # 결과를 세션에 저장
-                st.session_state.df = result_df
-                st.session_state.df_raw = df_raw
-                st.session_state.last_run_at = datetime.now().strftime("%Y-%m-%d %H:%M")
-
-                st.success("분석이 완료되었습니다.")
-
-                # 다음 단계로 이동
-                goto("extract")
+        if active_job() is not None:
+            st.warning("이미 실행 중인 분석이 있습니다. 사이드바에서 진행 상황을 확인하세요.")
+            shell_close()
+            return
 
-            except Exception as e:
-                st.error(f"분석 중 오류가 발생했습니다: {e}")
+        # 요청 스레드를 막지 않도록 백그라운드 작업으로 제출
+        # 완료되면 사이드바 작업 패널이 결과를 세션에 반영하고 extract 페이지로 이동
+        # 이전 실행의 남은 전략 사전 생성은 취소
+        get_prefetcher().cancel(st.session_state.get("prefetch_token"))
+        submit_job(up.name, _score_job, up, id_col, None if label_col == NO_LABEL else label_col, prefetch)
+        st.rerun()
 
     shell_close()
@@ -0,0 +1,182 @@
+# modules/drift.py
+"""
+입력 분포 드리프트 모니터링 (PSI / KS).
+
+- 기준 프로파일: 학습 데이터로 1회 생성해 models/drift_reference.pkl에 저장
+    python -m modules.drift --train data/train.csv
+- 스코어링 중 preprocess_data(profile=...)가 chunk마다 DriftAccumulator.update를 호출
+  -> 기준 bin 경계로 histogram/범주 빈도만 누적 (별도 pass 없음, 누적기끼리 merge 가능)
+- compare()로 피처별 PSI/KS와 상태를 표로 반환
+"""
+import argparse
+import os
+from typing import Dict, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.ai_lib import CORE_CATEGORICAL_FEATURES, HIGH_IMPORTANCE_FEATURES, prepare_frame
+
+DRIFT_REFERENCE_PATH = "models/drift_reference.pkl"
+NUM_BINS = 10
+PSI_EPS = 1e-4
+
+# PSI 통상 기준: 0.1 미만 안정 / 0.25 미만 주의 / 이상 경고
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+
+
+class DriftAccumulator:
+    """
+    수치형: 기준 bin 경계(edges) 기준 histogram count
+    범주형: 값별 빈도
+    count만 들고 있으므로 chunk/worker별 누적기를 merge로 합칠 수 있음.
+    """
+
+    def __init__(self, edges: Dict[str, np.ndarray]):
+        self.edges = {c: np.asarray(e, dtype=float) for c, e in edges.items()}
+        self.num_counts = {c: np.zeros(len(e) + 1, dtype=np.int64) for c, e in self.edges.items()}
+        self.cat_counts: Dict[str, Dict[str, int]] = {c: {} for c in CORE_CATEGORICAL_FEATURES}
+        self.rows = 0
+
+    @classmethod
+    def from_reference(cls, reference: dict) -> "DriftAccumulator":
+        return cls(reference["edges"])
+
+    def update(self, df: pd.DataFrame):
+        for c, e in self.edges.items():
+            if c in df.columns:
+                idx = np.searchsorted(e, df[c].to_numpy(dtype=float), side="right")
+                self.num_counts[c] += np.bincount(idx, minlength=len(e) + 1)
+
+        for c, counts in self.cat_counts.items():
+            if c in df.columns:
+                for k, v in df[c].value_counts(sort=False).items():
+                    counts[k] = counts.get(k, 0) + int(v)
+
+        self.rows += len(df)
+
+    def merge(self, other: "DriftAccumulator") -> "DriftAccumulator":
+        for c, counts in other.num_counts.items():
+            self.num_counts[c] += counts
+        for c, counts in other.cat_counts.items():
+            mine = self.cat_counts.setdefault(c, {})
+            for k, v in counts.items():
+                mine[k] = mine.get(k, 0) + v
+        self.rows += other.rows
+        return self
+
+    def to_profile(self) -> dict:
+        return {
+            "edges": self.edges,
+            "num_counts": self.num_counts,
+            "cat_counts": self.cat_counts,
+            "rows": self.rows,
+        }
+
+
+# =========================
+# Statistics
+# =========================
+def _psi(expected: np.ndarray, actual: np.ndarray) -> float:
+    e = expected / max(expected.sum(), 1)
+    a = actual / max(actual.sum(), 1)
+    e = np.clip(e, PSI_EPS, None)
+    a = np.clip(a, PSI_EPS, None)
+    return float(np.sum((a - e) * np.log(a / e)))
+
+
+def _ks_binned(expected: np.ndarray, actual: np.ndarray) -> float:
+    """같은 bin 경계에서의 누적분포 최대 차이 (정확한 KS의 구간 근사)."""
+    e = np.cumsum(expected) / max(expected.sum(), 1)
+    a = np.cumsum(actual) / max(actual.sum(), 1)
+    return float(np.max(np.abs(a - e)))
+
+
+def _status(psi: float) -> str:
+    if psi >= PSI_ALERT:
+        return "경고"
+    if psi >= PSI_WARN:
+        return "주의"
+    return "안정"
+
+
+def compare(acc: DriftAccumulator, reference: dict) -> pd.DataFrame:
+    """피처별 PSI/KS 표 (PSI 내림차순)."""
+    rows = []
+    for c, ref_counts in reference["num_counts"].items():
+        cur = acc.num_counts.get(c)
+        if cur is None:
+            continue
+        psi = _psi(np.asarray(ref_counts, dtype=float), cur.astype(float))
+        rows.append({
+            "feature": c, "type": "수치형", "psi": psi,
+            "ks": _ks_binned(np.asarray(ref_counts, dtype=float), cur.astype(float)),
+            "status": _status(psi),
+        })
+
+    for c, ref_counts in reference["cat_counts"].items():
+        cur = acc.cat_counts.get(c, {})
+        keys = sorted(set(ref_counts) | set(cur))
+        ref_arr = np.array([ref_counts.get(k, 0) for k in keys], dtype=float)
+        cur_arr = np.array([cur.get(k, 0) for k in keys], dtype=float)
+        psi = _psi(ref_arr, cur_arr)
+        rows.append({
+            "feature": c, "type": "범주형", "psi": psi,
+            "ks": None,
+            "status": _status(psi),
+        })
+
+    report = pd.DataFrame(rows, columns=["feature", "type", "psi", "ks", "status"])
+    return report.sort_values("psi", ascending=False).reset_index(drop=True)
+
+
+# =========================
+# Reference profile
+# =========================
+def build_reference(df_train: pd.DataFrame, id_col: str = "customer_id") -> dict:
+    """학습 데이터 분포로 bin 경계(분위수)와 기준 count를 만든다."""
+    df = prepare_frame(df_train, id_col=id_col)
+
+    edges = {}
+    qs = np.linspace(0, 1, NUM_BINS + 1)[1:-1]
+    for c in HIGH_IMPORTANCE_FEATURES:
+        edges[c] = np.unique(np.quantile(df[c].to_numpy(dtype=float), qs))
+
+    acc = DriftAccumulator(edges)
+    acc.update(df)
+    return acc.to_profile()
+
+
+@st.cache_resource(max_entries=1)
+def _load_reference(path: str, mtime: float) -> dict:
+    # mtime은 캐시 키 용도 (파일이 다시 쓰이면 새로 로드)
+    return joblib.load(path)
+
+
+def load_reference(path: str = DRIFT_REFERENCE_PATH) -> Optional[dict]:
+    """
+    드리프트 기준 프로파일 (없으면 None).
+    없는 경우는 캐시하지 않음 -> 실행 중에 기준 파일이 생기거나 바뀌어도 재시작 없이 반영.
+    """
+    if not os.path.exists(path):
+        return None
+    return _load_reference(path, os.path.getmtime(path))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="드리프트 기준 프로파일 생성")
+    parser.add_argument("--train", required=True, help="학습 데이터 CSV")
+    parser.add_argument("--id-col", default="customer_id")
+    parser.add_argument("--out", default=DRIFT_REFERENCE_PATH)
+    args = parser.parse_args(argv)
+
+    reference = build_reference(pd.read_csv(args.train), id_col=args.id_col)
+    joblib.dump(reference, args.out)
+    print(f"saved {args.out} (rows={reference['rows']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# modules/evaluation.py
+"""
+라벨(churn)이 있는 업로드의 스트리밍 모델 평가.
+
+predict_and_build가 chunk마다 EvalAccumulator.update(chunk, p, thresholds)를 호출
+  - 양성/음성별 확률 histogram (EVAL_BINS칸)       -> ROC-AUC, PR-AUC(average precision)
+  - 티어 임계값(T90/T95/T99) 이상 예측 수 / 그중 양성 수 -> 정확한 precision / recall
+  - 보정(calibration) 구간별 예측 합 / 양성 수 / 건수
+count만 누적하므로 메모리는 행 수와 무관하고, 누적기끼리 merge로 합칠 수 있음 (chunk/worker별).
+AUC는 histogram 근사 (구간 폭 1/EVAL_BINS 안의 순서만 무시).
+"""
+import json
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+EVAL_BINS = 1000
+CALIBRATION_BINS = 10
+THRESHOLD_KEYS = ["T99", "T95", "T90"]
+THRESHOLD_TIERS = {"T99": "Tier 1", "T95": "Tier 1~2", "T90": "Tier 1~3"}
+
+# 라벨로 쓸 수 있는 컬럼 후보 (업로드 화면 선택지)
+LABEL_COLUMNS = ["churn", "churn_label"]
+
+
+class EvalAccumulator:
+    def __init__(self, label_col: str = "churn", bins: int = EVAL_BINS):
+        self.label_col = label_col
+        self.bins = bins
+        self.pos = np.zeros(bins, dtype=np.int64)
+        self.neg = np.zeros(bins, dtype=np.int64)
+        self.cal_count = np.zeros(CALIBRATION_BINS, dtype=np.int64)
+        self.cal_pred = np.zeros(CALIBRATION_BINS, dtype=float)
+        self.cal_pos = np.zeros(CALIBRATION_BINS, dtype=np.int64)
+        self.thresholds: Optional[Dict[str, float]] = None
+        self.flagged = {k: 0 for k in THRESHOLD_KEYS}
+        self.flagged_pos = {k: 0 for k in THRESHOLD_KEYS}
+        self.unlabeled = 0
+
+    def update(self, chunk: pd.DataFrame, p: np.ndarray, thresholds: Dict[str, float]):
+        if self.thresholds is None:
+            self.thresholds = dict(thresholds)
+        if self.label_col not in chunk.columns:
+            self.unlabeled += len(chunk)
+            return
+
+        y = pd.to_numeric(chunk[self.label_col], errors="coerce").to_numpy(dtype=float)
+        labeled = np.isin(y, (0.0, 1.0))
+        self.unlabeled += int((~labeled).sum())
+        p = np.asarray(p, dtype=float)[labeled]
+        pos = y[labeled] == 1.0
+
+        b = np.clip((p * self.bins).astype(np.int64), 0, self.bins - 1)
+        self.pos += np.bincount(b[pos], minlength=self.bins)
+        self.neg += np.bincount(b[~pos], minlength=self.bins)
+
+        c = np.clip((p * CALIBRATION_BINS).astype(np.int64), 0, CALIBRATION_BINS - 1)
+        self.cal_count += np.bincount(c, minlength=CALIBRATION_BINS)
+        self.cal_pred += np.bincount(c, weights=p, minlength=CALIBRATION_BINS)
+        self.cal_pos += np.bincount(c[pos], minlength=CALIBRATION_BINS)
+
+        for k in THRESHOLD_KEYS:
+            hit = p >= self.thresholds[k]
+            self.flagged[k] += int(hit.sum())
+            self.flagged_pos[k] += int((hit & pos).sum())
+
+    def merge(self, other: "EvalAccumulator") -> "EvalAccumulator":
+        if other.bins != self.bins:
+            raise ValueError("histogram 구간 수가 다른 평가 누적기는 합칠 수 없습니다.")
+        if self.thresholds is None:
+            self.thresholds = other.thresholds
+        self.pos += other.pos
+        self.neg += other.neg
+        self.cal_count += other.cal_count
+        self.cal_pred += other.cal_pred
+        self.cal_pos += other.cal_pos
+        for k in THRESHOLD_KEYS:
+            self.flagged[k] += other.flagged[k]
+            self.flagged_pos[k] += other.flagged_pos[k]
+        self.unlabeled += other.unlabeled
+        return self
+
+    @property
+    def labeled(self) -> int:
+        return int(self.pos.sum() + self.neg.sum())
+
+    def report(self) -> Optional[Dict[str, object]]:
+        """평가 결과. 라벨이 있는 행이 없거나 한 클래스뿐이면 None."""
+        n_pos, n_neg = int(self.pos.sum()), int(self.neg.sum())
+        if n_pos == 0 or n_neg == 0:
+            return None
+
+        # 높은 확률 구간부터 누적 -> 구간 경계마다 (FPR, TPR), (recall, precision)
+        tp = np.concatenate([[0], np.cumsum(self.pos[::-1])])
+        fp = np.concatenate([[0], np.cumsum(self.neg[::-1])])
+        tpr, fpr = tp / n_pos, fp / n_neg
+        roc_auc = float(np.sum((fpr[1:] - fpr[:-1]) * (tpr[1:] + tpr[:-1]) / 2))
+
+        step = tp[1:] > tp[:-1]
+        precision = tp[1:] / np.maximum(tp[1:] + fp[1:], 1)
+        pr_auc = float(np.sum((tpr[1:] - tpr[:-1])[step] * precision[step]))
+
+        tiers = pd.DataFrame([
+            {
+                "threshold": k,
+                "value": self.thresholds[k],
+                "flagged_as": THRESHOLD_TIERS[k],
+                "flagged": self.flagged[k],
+                "precision": self.flagged_pos[k] / self.flagged[k] if self.flagged[k] else None,
+                "recall": self.flagged_pos[k] / n_pos,
+            }
+            for k in THRESHOLD_KEYS
+        ])
+
+        edges = np.linspace(0, 1, CALIBRATION_BINS + 1)
+        calibration = pd.DataFrame({
+            "bin": [f"{lo:.1f}~{hi:.1f}" for lo, hi in zip(edges[:-1], edges[1:])],
+            "count": self.cal_count,
+            "mean_pred": np.where(self.cal_count > 0, self.cal_pred / np.maximum(self.cal_count, 1), np.nan),
+            "observed_rate": np.where(self.cal_count > 0, self.cal_pos / np.maximum(self.cal_count, 1), np.nan),
+        })
+        # 기대 보정 오차(ECE): 구간별 |예측 평균 - 실제 비율| 가중 평균
+        valid = self.cal_count > 0
+        ece = float(np.sum(
+            self.cal_count[valid] * np.abs(calibration["mean_pred"].to_numpy()[valid] - calibration["observed_rate"].to_numpy()[valid])
+        ) / self.cal_count.sum())
+
+        return {
+            "label_col": self.label_col,
+            "labeled": n_pos + n_neg,
+            "unlabeled": self.unlabeled,
+            "positives": n_pos,
+            "base_rate": n_pos / (n_pos + n_neg),
+            "roc_auc": roc_auc,
+            "pr_auc": pr_auc,
+            "ece": ece,
+            "tiers": tiers,
+            "calibration": calibration,
+        }
+
+
+def report_json(report: Dict[str, object]) -> str:
+    """평가 결과 내보내기 (표는 records 목록)."""
+    out = {k: (v.to_dict("records") if isinstance(v, pd.DataFrame) else v) for k, v in report.items()}
+    return json.dumps(out, ensure_ascii=False, indent=2, default=float)
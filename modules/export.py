@@ -0,0 +1,379 @@
+# modules/export.py
+"""
+세그먼트(티어별 고객 리스트) + 생성된 전략 대량 내보내기.
+
+- 예측 결과(df)에서 선택 티어의 행 위치만 뽑고, chunk 단위로 원본(df_raw) 속성을 붙여 바로 파일에 기록
+  -> 병합된 전체 사본을 메모리에 만들지 않음 (메모리 피크 = chunk 크기)
+- 전략 캐시(ui_cache)는 고객당 1행으로 평탄화해서 left join
+  전략 컬럼은 고정 목록(STRATEGY_COLUMNS)이라 chunk마다 어떤 규칙/전략이 나와도 컬럼 구성이 같음
+  (메시지는 채널 이름이 아닌 순서로 message1_channel / message1_text ...)
+- 선택 시 전략이 없는 고객은 규칙 엔진(modules.rule_strategy)으로 chunk마다 일괄 채움
+- CSV / Parquet(row group 단위) / Excel(openpyxl write-only) 지원
+- 화면 내보내기는 EXPORT_PART_MB 내외의 파트 파일로 나눠 기록 -> 브라우저 다운로드는 파트 단위로 요청 시에만 읽음
+- exports/에는 고객 단위 개인정보가 남으므로 EXPORT_RETENTION_HOURS가 지난 파일은 새 내보내기 때 삭제
+"""
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.customer_index import CustomerIndex
+from modules.rule_strategy import CHANNELS, ENGINE_LLM, rule_codes, strategy_for_code
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    from openpyxl import Workbook
+except ImportError:
+    Workbook = None
+
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+EXPORT_CHUNK_ROWS = 100_000
+# 파트 파일 크기 (브라우저 다운로드는 파트 1개씩 메모리에 올림)
+EXPORT_PART_MB = 50
+EXPORT_PART_SLICE_ROWS = 10_000
+EXCEL_PART_ROWS = 200_000       # Excel은 저장 전 크기를 알 수 없어 행 수로 분할
+EXPORT_RETENTION_HOURS = float(os.getenv("EXPORT_RETENTION_HOURS", "24"))
+EXCEL_MAX_ROWS = 1_048_575
+
+FORMATS = {"CSV": ".csv", "Parquet": ".parquet", "Excel": ".xlsx"}
+TIERS = ["Tier 1", "Tier 2", "Tier 3", "Tier 4"]
+
+# 전략 -> 내보내기 컬럼 (고정). 카드 3개 / 채널 4개(프롬프트·규칙 엔진 모두 고정) / 메시지 최대 4개
+STRATEGY_CARDS = 3
+STRATEGY_MESSAGES = 4
+STRATEGY_NUMERIC_COLUMNS = [f"channel_{ch}_score" for ch in CHANNELS]
+STRATEGY_COLUMNS = (
+    ["strategy_engine"]
+    + [f"strategy{i}_{f}" for i in range(1, STRATEGY_CARDS + 1) for f in ("title", "headline", "desc", "bullets")]
+    + [c for ch in CHANNELS for c in (f"channel_{ch}_score", f"channel_{ch}_message_point")]
+    + [c for i in range(1, STRATEGY_MESSAGES + 1) for c in (f"message{i}_channel", f"message{i}_text")]
+)
+
+
+# =========================
+# Strategy cache -> columns
+# =========================
+def _flatten_strategy(data: dict) -> dict:
+    """전략 UI JSON -> 내보내기 컬럼 (카드 3개 / 채널별 점수·포인트 / 순서별 메시지). STRATEGY_COLUMNS 밖의 키는 만들지 않음."""
+    row = {"strategy_engine": data.get("engine", ENGINE_LLM)}
+    for i, card in enumerate((data.get("strategy_cards") or [])[:STRATEGY_CARDS], start=1):
+        row[f"strategy{i}_title"] = card.get("title")
+        row[f"strategy{i}_headline"] = card.get("headline")
+        row[f"strategy{i}_desc"] = card.get("desc")
+        row[f"strategy{i}_bullets"] = " / ".join(str(b) for b in (card.get("bullets") or []))
+
+    for ch in data.get("channel_table") or []:
+        name = ch.get("channel")
+        if name in CHANNELS:
+            row[f"channel_{name}_score"] = ch.get("score")
+            row[f"channel_{name}_message_point"] = ch.get("message_point")
+
+    # 같은 채널 메시지가 여러 개일 수 있으므로 채널 이름이 아닌 순서로 기록
+    for i, ex in enumerate((data.get("message_examples") or [])[:STRATEGY_MESSAGES], start=1):
+        row[f"message{i}_channel"] = ex.get("channel")
+        row[f"message{i}_text"] = ex.get("text")
+    return row
+
+
+def _strategy_table(rows: List[dict], lead: List[str]) -> pd.DataFrame:
+    """평탄화 행 -> 고정 컬럼(lead + STRATEGY_COLUMNS) DataFrame. 텍스트는 string, 점수는 Float64로 고정."""
+    out = pd.DataFrame(rows).reindex(columns=lead + STRATEGY_COLUMNS)
+    for c in out.columns:
+        out[c] = pd.to_numeric(out[c], errors="coerce").astype("Float64") if c in STRATEGY_NUMERIC_COLUMNS else out[c].astype("string")
+    return out
+
+
+def strategy_frame(ui_cache: Optional[dict]) -> Optional[pd.DataFrame]:
+    """
+    ui_cache(키: "customer_id|risk_group|model|brand_context")를 고객당 1행으로 평탄화.
+    같은 고객에 여러 전략이 있으면 마지막에 생성된 것 사용.
+    """
+    if not ui_cache:
+        return None
+
+    rows: Dict[str, dict] = {}
+    for key, data in ui_cache.items():
+        if not isinstance(data, dict):
+            continue
+        parts = str(key).split("|")
+        cid = parts[0]
+        row = {"customer_id": cid, "strategy_model": parts[2] if len(parts) > 2 else None}
+        row.update(_flatten_strategy(data))
+        rows[cid] = row
+
+    return _strategy_table(list(rows.values()), ["customer_id", "strategy_model"]) if rows else None
+
+
+def rule_strategy_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    규칙 엔진 전략을 고객당 1행 컬럼으로 (modules.rule_strategy).
+    조합 코드는 벡터 연산, 평탄화는 고유 코드(최대 64개)마다 1회 -> 행 수와 무관하게 take만 수행.
+    """
+    codes = rule_codes(df)
+    uniq, inv = np.unique(codes, return_inverse=True)
+    table = _strategy_table([_flatten_strategy(strategy_for_code(int(c))) for c in uniq], [])
+    out = table.iloc[inv].reset_index(drop=True)
+    out.insert(0, "customer_id", df["customer_id"].astype(str).to_numpy())
+    return out
+
+
+# =========================
+# Chunked segment iterator
+# =========================
+def iter_segment_chunks(
+    df_pred: pd.DataFrame,
+    df_raw: pd.DataFrame,
+    tiers: List[str],
+    strategies: Optional[pd.DataFrame] = None,
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    index: Optional[CustomerIndex] = None,
+    rule_fill: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    선택 티어 고객을 확률 내림차순(df_pred 순서)으로 chunk 단위 병합해서 yield.
+    rule_fill=True면 생성된 전략이 없는 행을 규칙 엔진 전략으로 채움
+    """
+    index = index if index is not None else CustomerIndex(df_pred, df_raw)
+    positions = np.flatnonzero(df_pred["risk_tier"].isin(tiers).to_numpy())
+    raw_cols = [i for i, c in enumerate(df_raw.columns) if c != "customer_id" and c not in df_pred.columns]
+
+    # 출력 컬럼은 첫 chunk 전에 고정 -> 모든 chunk를 같은 순서/구성으로 (CSV 헤더, Parquet 스키마 일치)
+    columns = list(df_pred.columns) + [df_raw.columns[i] for i in raw_cols]
+    if strategies is not None:
+        columns += [c for c in strategies.columns if c not in columns]
+    if rule_fill:
+        columns += [c for c in STRATEGY_COLUMNS if c not in columns]
+
+    for start in range(0, len(positions), chunk_rows):
+        pos = positions[start:start + chunk_rows]
+        pred = df_pred.iloc[pos].reset_index(drop=True)
+
+        # 전체 merge 대신 인덱스의 원본 행 위치로 chunk별 take
+        raw_pos = index.pred_raw_pos[pos]
+        raw = df_raw.iloc[np.where(raw_pos < 0, 0, raw_pos), raw_cols].reset_index(drop=True)
+        if (raw_pos < 0).any():
+            raw = raw.where(pd.Series(raw_pos >= 0), axis=0)
+
+        chunk = pd.concat([pred, raw], axis=1)
+        if strategies is not None:
+            chunk = chunk.merge(strategies, on="customer_id", how="left")
+        if rule_fill:
+            rules = rule_strategy_frame(chunk)
+            missing = chunk["strategy_engine"].isna() if "strategy_engine" in chunk.columns else pd.Series(True, index=chunk.index)
+            for c in rules.columns.drop("customer_id"):
+                chunk[c] = chunk[c].where(~missing, rules[c]) if c in chunk.columns else rules[c].where(missing)
+        yield chunk.reindex(columns=columns)
+
+
+# =========================
+# Writers
+# =========================
+def _write_csv(path: str, chunks: Iterator[pd.DataFrame]) -> int:
+    rows = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, header=(i == 0), index=False)
+            rows += len(chunk)
+    return rows
+
+
+def _write_parquet(path: str, chunks: Iterator[pd.DataFrame]) -> int:
+    if pq is None:
+        raise ValueError("Parquet 내보내기에는 pyarrow가 필요합니다. (pip install pyarrow)")
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            # object 컬럼은 string으로 고정 (앞 chunk가 전부 결측이어도 스키마가 흔들리지 않게)
+            for c in chunk.select_dtypes("object").columns:
+                chunk[c] = chunk[c].astype("string")
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def _write_excel(path: str, chunks: Iterator[pd.DataFrame]) -> int:
+    if Workbook is None:
+        raise ValueError("Excel 내보내기에는 openpyxl이 필요합니다. (pip install openpyxl)")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("segment")
+    rows = 0
+    for i, chunk in enumerate(chunks):
+        if rows + len(chunk) > EXCEL_MAX_ROWS:
+            raise ValueError(f"Excel은 최대 {EXCEL_MAX_ROWS:,}행까지 가능합니다. CSV/Parquet을 사용하세요.")
+        if i == 0:
+            ws.append(list(chunk.columns))
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            ws.append(row)
+        rows += len(chunk)
+    wb.save(path)
+    return rows
+
+
+_WRITERS = {".csv": _write_csv, ".parquet": _write_parquet, ".xlsx": _write_excel}
+
+
+def write_export(path: str, chunks: Iterator[pd.DataFrame]) -> int:
+    """확장자에 맞는 writer로 chunk를 순서대로 기록 (임시 파일 -> 원자적 교체). 반환: 행 수"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in _WRITERS:
+        raise ValueError(f"지원하지 않는 내보내기 형식입니다: {ext}")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = _tmp_path(path)
+    try:
+        rows = _WRITERS[ext](tmp, chunks)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return rows
+
+
+def _tmp_path(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    return path + ".tmp" + ext
+
+
+def _slices(chunks: Iterator[pd.DataFrame], rows: int) -> Iterator[pd.DataFrame]:
+    for chunk in chunks:
+        for start in range(0, len(chunk), rows):
+            yield chunk.iloc[start:start + rows]
+
+
+def write_export_parts(path: str, chunks: Iterator[pd.DataFrame], part_mb: float = EXPORT_PART_MB) -> List[Tuple[str, int]]:
+    """
+    chunk를 part_mb 내외 크기의 파트 파일로 나눠 기록: <이름>.part001<확장자>, part002 ...
+    파트마다 헤더/스키마를 가진 독립 파일. 반환: [(파트 경로, 행 수)]
+    크기는 EXPORT_PART_SLICE_ROWS행씩 쓸 때마다 확인하고, 다음 조각까지 쓰면 넘칠 것 같으면 새 파트로 넘어감.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    stem = path[:-len(ext)]
+    limit = part_mb * 1e6
+    slices = _slices(chunks, EXPORT_PART_SLICE_ROWS)
+    pending = next(slices, None)
+    if pending is None:
+        raise ValueError("선택한 티어에 해당하는 고객이 없습니다.")
+
+    def part_chunks(tmp: str) -> Iterator[pd.DataFrame]:
+        nonlocal pending
+        rows = written = 0
+        while pending is not None:
+            yield pending
+            rows += len(pending)
+            written += 1
+            pending = next(slices, None)
+            if ext == ".xlsx":
+                if rows + EXPORT_PART_SLICE_ROWS > EXCEL_PART_ROWS:
+                    return
+            else:
+                size = os.path.getsize(tmp) if os.path.exists(tmp) else 0
+                if size + size / written > limit:
+                    return
+
+    parts = []
+    while pending is not None:
+        part = f"{stem}.part{len(parts) + 1:03d}{ext}"
+        parts.append((part, write_export(part, part_chunks(_tmp_path(part)))))
+    return parts
+
+
+def cleanup_exports(root: str = EXPORT_DIR, max_age_hours: float = EXPORT_RETENTION_HOURS) -> int:
+    """보존 기간이 지난 내보내기 파일(임시 파일 포함) 삭제. 반환: 삭제한 파일 수"""
+    if not os.path.isdir(root):
+        return 0
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+# =========================
+# UI
+# =========================
+def render_export_panel(key: str, default_tiers: Optional[List[str]] = None):
+    """추출/전략 페이지 공용 내보내기 패널."""
+    df = st.session_state.get("df")
+    df_raw = st.session_state.get("df_raw")
+    if df is None or df_raw is None:
+        return
+
+    with st.expander("세그먼트 내보내기", expanded=False):
+        c1, c2, c3 = st.columns([1.4, 1, 1])
+        with c1:
+            tiers = st.multiselect("티어", TIERS, default=default_tiers or ["Tier 1", "Tier 2"], key=f"{key}_tiers")
+        with c2:
+            fmt = st.selectbox("형식", list(FORMATS), key=f"{key}_fmt")
+        with c3:
+            with_strategy = st.checkbox("생성된 전략 포함", value=True, key=f"{key}_strategy")
+            rule_fill = st.checkbox("나머지 고객은 규칙 엔진 전략으로 채우기", value=False, key=f"{key}_rule_fill")
+
+        if st.button("내보내기", use_container_width=True, key=f"{key}_run"):
+            if not tiers:
+                st.error("티어를 하나 이상 선택하세요.")
+            else:
+                strategies = strategy_frame(st.session_state.get("ui_cache")) if with_strategy else None
+                name = f"{st.session_state.get('run_id', 'run')}_{'_'.join(t.replace(' ', '') for t in tiers)}"
+                path = os.path.join(EXPORT_DIR, f"{name}_{datetime.now():%Y%m%d_%H%M%S}{FORMATS[fmt]}")
+                try:
+                    cleanup_exports()
+                    with st.spinner("내보내는 중입니다..."):
+                        chunks = iter_segment_chunks(
+                            df, df_raw, tiers, strategies, index=st.session_state.get("customer_index"),
+                            rule_fill=rule_fill,
+                        )
+                        parts = write_export_parts(path, chunks)
+                    st.session_state[f"{key}_last_export"] = parts
+                except Exception as e:
+                    st.error(f"내보내기 오류: {e}")
+
+        parts = [(p, n) for p, n in st.session_state.get(f"{key}_last_export") or [] if os.path.exists(p)]
+        if parts:
+            rows = sum(n for _, n in parts)
+            size_mb = sum(os.path.getsize(p) for p, _ in parts) / 1e6
+            st.caption(
+                f"{rows:,}행 · {size_mb:.1f}MB · 파트 {len(parts)}개 · 서버 경로: {os.path.dirname(parts[0][0])}"
+                f" · {EXPORT_RETENTION_HOURS:g}시간 후 자동 삭제"
+            )
+            # 파트는 "준비"를 누른 것만 읽음 (매 rerun마다 열어 메모리에 올리지 않음, 한 번에 파트 1개)
+            ready_key = f"{key}_download_ready"
+            for i, (path, n) in enumerate(parts):
+                c1, c2 = st.columns([2, 1])
+                c1.caption(f"{os.path.basename(path)} · {n:,}행 · {os.path.getsize(path) / 1e6:.1f}MB")
+                with c2:
+                    if st.session_state.get(ready_key) != path:
+                        if st.button("다운로드 준비", use_container_width=True, key=f"{key}_prepare_{i}"):
+                            st.session_state[ready_key] = path
+                            st.rerun()
+                    else:
+                        with open(path, "rb") as f:
+                            data = f.read()
+                        st.download_button(
+                            "파일 다운로드", data, file_name=os.path.basename(path),
+                            use_container_width=True, key=f"{key}_download_{i}",
+                            on_click=lambda: st.session_state.pop(ready_key, None),
+                        )
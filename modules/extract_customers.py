@@ -1,5 +1,170 @@
+import numpy as np
+import pandas as pd
 import streamlit as st
+from modules.ai_lib import RAW_COLS
 from modules.ui import shell_open, shell_close, goto
+from modules.export import render_export_panel
+from modules.campaign import render_campaign_panel
+from modules.customer_index import CustomerIndex, SEARCH_SEGMENT
+from modules.inference import RISK_GROUPS
+from modules.preview import render_preview
+from modules.evaluation import report_json
+
+PRED_COLS = ["churn_proba", "risk_tier", "risk_group"]
+TOP_N = 50
+
+def _render_drift_summary(report):
+    """스코어링 시 함께 계산된 입력 분포 드리프트(PSI/KS) 요약."""
+    if report is None or len(report) == 0:
+        return
+
+    alerts = report[report["status"] == "경고"]
+    warns = report[report["status"] == "주의"]
+    if len(alerts):
+        st.warning(f"입력 분포 드리프트 경고: {', '.join(alerts['feature'])} (PSI ≥ 0.25)")
+
+    title = f"입력 분포 드리프트 · 경고 {len(alerts)} / 주의 {len(warns)} / 전체 {len(report)}"
+    with st.expander(title, expanded=False):
+        st.dataframe(report.round(4), use_container_width=True, hide_index=True)
+
+def _render_validation_summary(summary, report, quarantine_csv):
+    """업로드 행 검증 결과: 격리 건수 / 기본값 보정 건수 / 격리 행 다운로드."""
+    if summary is None:
+        return
+
+    if summary["quarantined"]:
+        st.warning(f"검증에서 {summary['quarantined']:,}개 행이 격리되어 스코어링에서 제외되었습니다.")
+
+    title = (
+        f"입력 검증 · 정상 {summary['valid']:,} / 격리 {summary['quarantined']:,}"
+        f" / 기본값 보정 {summary['filled_values']:,}건"
+    )
+    with st.expander(title, expanded=False):
+        if report is not None and len(report):
+            st.dataframe(report, use_container_width=True, hide_index=True)
+        else:
+            st.caption("검증 사유가 없습니다.")
+        if quarantine_csv:
+            st.download_button(
+                "격리 행 다운로드 (CSV)",
+                data=quarantine_csv,
+                file_name=f"quarantine_{st.session_state.get('run_id', 'run')}.csv",
+                mime="text/csv",
+                use_container_width=True,
+                key="quarantine_download",
+            )
+
+def _render_model_agreement(agreement):
+    """champion/challenger 동시 스코어링 시 일치도 요약."""
+    if agreement is None or len(agreement) == 0:
+        return
+
+    with st.expander(f"챔피언/챌린저 비교 · 챌린저 {len(agreement)}개", expanded=False):
+        st.dataframe(agreement.round(4), use_container_width=True, hide_index=True)
+        st.caption("모델별 확률/티어는 결과 컬럼 churn_proba__<모델명>, risk_tier__<모델명>에 있습니다.")
+
+def _render_evaluation(report):
+    """업로드에 라벨이 있을 때 스코어링 pass에서 함께 계산한 모델 평가."""
+    if report is None:
+        return
+
+    title = (
+        f"모델 평가 ({report['label_col']}) · ROC-AUC {report['roc_auc']:.3f}"
+        f" / PR-AUC {report['pr_auc']:.3f} / 라벨 {report['labeled']:,}건"
+    )
+    with st.expander(title, expanded=False):
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("ROC-AUC", f"{report['roc_auc']:.3f}")
+        c2.metric("PR-AUC", f"{report['pr_auc']:.3f}")
+        c3.metric("실제 이탈률", f"{report['base_rate']:.2%}")
+        c4.metric("보정 오차(ECE)", f"{report['ece']:.3f}")
+        if report["unlabeled"]:
+            st.caption(f"라벨이 없거나 0/1이 아닌 {report['unlabeled']:,}개 행은 평가에서 제외했습니다.")
+
+        st.markdown("**티어 임계값별 정밀도 / 재현율**")
+        st.dataframe(report["tiers"].round(4), use_container_width=True, hide_index=True)
+
+        st.markdown("**보정(calibration): 구간별 예측 평균 vs 실제 이탈률**")
+        calibration = report["calibration"]
+        st.line_chart(calibration.set_index("bin")[["mean_pred", "observed_rate"]])
+        st.dataframe(calibration.round(4), use_container_width=True, hide_index=True)
+
+        st.download_button(
+            "평가 결과 다운로드 (JSON)",
+            data=report_json(report).encode("utf-8"),
+            file_name=f"evaluation_{st.session_state.get('run_id', 'run')}.json",
+            mime="application/json",
+            use_container_width=True,
+            key="evaluation_download",
+        )
+
+def _customer_index(df, df_raw) -> CustomerIndex:
+    index = st.session_state.get("customer_index")
+    if index is None:
+        index = st.session_state.customer_index = CustomerIndex(df, df_raw)
+    return index
+
+def _top_rows(df, df_raw, index: CustomerIndex, risk_group: str, n: int = TOP_N) -> pd.DataFrame:
+    """
+    위험군 상위 n명 + 원본 속성.
+    전체 merge 대신 인덱스의 원본 행 위치로 n행만 take -> 비용이 표시 행 수에만 비례.
+    """
+    positions = np.flatnonzero((df["risk_group"] == risk_group).to_numpy())
+    # predict_and_build 결과는 churn_proba 내림차순 (아니면 정렬)
+    if not df["churn_proba"].is_monotonic_decreasing:
+        p = df["churn_proba"].to_numpy()
+        positions = positions[np.argsort(-p[positions], kind="stable")]
+    positions = positions[:n]
+
+    pred = df.iloc[positions].reset_index(drop=True)
+    pred["customer_id"] = pred["customer_id"].astype(str)
+
+    raw_pos = index.pred_raw_pos[positions]
+    raw_cols = [c for c in RAW_COLS if c in df_raw.columns and c not in pred.columns]
+    raw = df_raw.iloc[np.where(raw_pos < 0, 0, raw_pos)][raw_cols].reset_index(drop=True)
+    if (raw_pos < 0).any():
+        raw = raw.mask(np.broadcast_to((raw_pos < 0)[:, None], raw.shape))
+    return pd.concat([pred, raw], axis=1)
+
+@st.fragment
+def _render_customer_search():
+    """
+    고객 ID 정확/접두 검색 -> 예측값 + 원본 속성 + 전략 페이지 이동.
+    fragment라 검색어 입력 시 이 영역만 rerun (페이지 본문은 다시 계산하지 않음)
+    """
+    df = st.session_state.df
+    df_raw = st.session_state.df_raw
+    index = _customer_index(df, df_raw)
+
+    query = st.text_input("고객 ID 검색", placeholder="ID 전체 또는 앞부분 입력", key="customer_search").strip()
+    if not query:
+        return
+
+    hit = index.lookup(query)
+    if hit is None:
+        matches = index.prefix(query)
+        if not matches:
+            st.info("일치하는 고객이 없습니다.")
+            return
+        query = st.selectbox(f"'{query}'로 시작하는 고객 (최대 {len(matches)}명)", matches, key="customer_search_pick")
+        hit = index.lookup(query)
+
+    pred_pos, raw_pos = hit
+    pred_row = df.iloc[pred_pos]
+    c1, c2, c3 = st.columns(3)
+    c1.metric("customer_id", str(pred_row["customer_id"]))
+    c2.metric("risk_tier", f"{pred_row['risk_tier']} · {pred_row['risk_group']}")
+    c3.metric("churn_proba", f"{float(pred_row['churn_proba']):.4f}")
+
+    if raw_pos >= 0:
+        raw_row = df_raw.iloc[raw_pos]
+        attrs = [c for c in RAW_COLS if c in raw_row.index]
+        st.dataframe(raw_row[attrs].to_frame("value").T, use_container_width=True, hide_index=True)
+
+    if st.button("이 고객 전략 보기 →", use_container_width=True, key="customer_search_go"):
+        st.session_state.focus_customer = str(pred_row["customer_id"])
+        st.session_state.strategy_segment = SEARCH_SEGMENT
+        goto("strategy")
 
 def render():
     shell_open()
@@ -11,6 +176,13 @@ def render():
     df = st.session_state.get("df")
     df_raw = st.session_state.get("df_raw")
 
+    # 전체 스코어링 진행 중이면 표본 미리보기만 표시 (완료 시 자동으로 정확한 결과로 교체)
+    preview = st.session_state.get("preview")
+    if preview is not None:
+        render_preview(preview)
+        shell_close()
+        return
+
     if df is None:
         st.warning("먼저 데이터 입력 페이지에서 예측을 실행하세요.")
         if st.button("데이터 입력으로 이동", use_container_width=True):
@@ -23,13 +195,7 @@ def render():
         shell_close()
         return
 
-    df = df.copy()
-    df_raw = df_raw.copy()
-
-    # (중요) 컬럼명 정리: BOM/공백 제거
-    df.columns = df.columns.str.replace("\ufeff", "").str.strip()
-    df_raw.columns = df_raw.columns.str.replace("\ufeff", "").str.strip()
-
+    # 컬럼명 BOM/공백 정리는 업로드 시점에 1회 수행됨 (modules.ingest)
     # (중요) 필수 컬럼 확인을 먼저
     required_pred = {"customer_id", "churn_proba", "risk_group", "risk_tier"}
     missing_pred = required_pred - set(df.columns)
@@ -45,13 +211,19 @@ def render():
         shell_close()
         return
 
-    # 타입 맞추기
-    df["customer_id"] = df["customer_id"].astype(str)
-    df_raw["customer_id"] = df_raw["customer_id"].astype(str)
+    if st.session_state.get("model_version"):
+        st.caption(f"모델 버전: {st.session_state.model_version} · 실행 시각: {st.session_state.get('last_run_at') or '-'}")
 
-    # merge: df_raw에서 customer_id는 제거하고 붙여서 중복 방지
-    df_merged = df.merge(df_raw, on="customer_id", how="left", suffixes=("", "_raw"))
+    _render_validation_summary(
+        st.session_state.get("validation_summary"),
+        st.session_state.get("validation_report"),
+        st.session_state.get("quarantine_csv"),
+    )
+    _render_drift_summary(st.session_state.get("drift_report"))
+    _render_model_agreement(st.session_state.get("model_agreement"))
+    _render_evaluation(st.session_state.get("evaluation"))
 
+    _render_customer_search()
 
     # 드롭다운
     colA, colB, colC = st.columns([1, 1.2, 1])
@@ -60,44 +232,30 @@ def render():
             "<div style='text-align:center; font-weight:900; margin-bottom:6px;'>위험 이탈 수준</div>",
             unsafe_allow_html=True
         )
-        options = ["고위험", "중위험", "저위험", "안정"]
+        options = list(RISK_GROUPS)
         default_selected = st.session_state.get("selected_risk", options[0])
         default_idx = options.index(default_selected) if default_selected in options else 0
         st.session_state.selected_risk = st.selectbox(" ", options, index=default_idx, label_visibility="collapsed")
 
     rk = st.session_state.selected_risk
 
-    # 여기부터는 df_merged만 사용
-    df_g = (
-        df_merged[df_merged["risk_group"] == rk]
-        .sort_values("churn_proba", ascending=False)
-        .head(50)
-        .reset_index(drop=True)
-    )
+    # 상위 TOP_N명만 원본 속성을 붙임 (전체 merge/복사 없음)
+    df_g = _top_rows(df, df_raw, _customer_index(df, df_raw), rk)
 
     st.markdown(
         f"<div class='cs-card'><div class='cs-section-title'>{rk}</div></div>",
         unsafe_allow_html=True
     )
 
-    RAW_COLS = [
-        "age", "gender", "region", "tenure_months",
-        "income_band", "card_grade", "contract_cancelled", "complaints_6m",
-        "marketing_open_rate_6m", "spent_m6", "txn_m6", "login_m6", "spent_m5",
-        "txn_m5", "login_m5", "spent_m4", "txn_m4", "login_m4", "spent_m3",
-        "txn_m3", "login_m3", "spent_m2", "txn_m2", "login_m2", "spent_m1",
-        "txn_m1", "login_m1", "total_spent_6m", "total_txn_6m",
-        "total_login_6m", "points_balance", "revolving_usage",
-        "cash_service_usage", "churn"
-    ]
-    PRED_COLS = ["churn_proba", "risk_tier", "risk_group"]
-
     show_cols = ["customer_id"] + PRED_COLS + RAW_COLS
     show_cols = [c for c in show_cols if c in df_g.columns]
     show_cols = list(dict.fromkeys(show_cols))  # 혹시 모를 중복 제거
 
     st.dataframe(df_g[show_cols], use_container_width=True, hide_index=True)
 
+    render_export_panel("extract_export")
+    render_campaign_panel()
+
     # 다음 페이지 이동
     col1, col2 = st.columns([1, 1])
     with col2:
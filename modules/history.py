@@ -0,0 +1,348 @@
+# modules/history.py
+"""
+스코어링 실행별 점수 이력 저장소 (append-only, 고객 해시 버킷 파티션 parquet).
+
+    data/score_history/meta.json                          버킷 수 (저장소 생성 시 고정)
+                      /bucket=007/<run_key>__<part>.parquet   실행 1회 x 버킷 1개 (추가만 함)
+                      /bucket=007/compacted-202609.parquet   월별로 합친 과거 실행
+                      /runs/<run_key>__<part>.json           실행 요약 (티어별 건수, 평균 확률)
+
+    python -m modules.history customer C000123 --months 24
+    python -m modules.history tiers
+    python -m modules.history compact --older-than 90 --retention 36
+
+- 행: customer_id, run_at, run_key, append_id, model_version, churn_proba(float32), risk_tier(int8 1~4)
+  append_id = append_run 호출마다 새로 만드는 id (배치 파티션처럼 run_key를 공유하는 조각도 서로 구분)
+- 버킷 = customer_id 해시 (modules.sharding.shard_of, 클러스터 샤드와 같은 해시) -> 고객 1명 조회는 버킷 1개 디렉터리만 읽음
+- 파일은 customer_id 순으로 정렬 + 작은 row group -> min/max 통계로 해당 고객 row group만 읽음
+- compact: 오래된 실행 파일을 버킷·월별 1개 파일로 병합 (파일 수를 월 수로 제한), 보존 기간 지난 월은 삭제
+  병합 파일을 먼저 쓰고 원본을 지우므로 그 사이 조회는 (append_id, customer_id) 중복 제거로 처리
+- 티어 추이는 실행 요약(runs/*.json)만 읽음 -> 행 수와 무관
+"""
+import argparse
+import glob
+import json
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.sharding import shard_of
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    pa = ds = pq = None
+    HAS_PYARROW = False
+
+HISTORY_DIR = os.getenv("SCORE_HISTORY_DIR", "data/score_history")
+HISTORY_BUCKETS = 64
+HISTORY_ROW_GROUP = 16_384
+HISTORY_MONTHS = 24
+COMPACT_AFTER_DAYS = 90
+META_NAME = "meta.json"
+RUNS_DIR = "runs"
+COMPACTED_PREFIX = "compacted-"
+TIERS = ["Tier 1", "Tier 2", "Tier 3", "Tier 4"]
+
+_SCHEMA = pa.schema([
+    ("customer_id", pa.string()),
+    ("run_at", pa.timestamp("s")),
+    ("run_key", pa.string()),
+    ("append_id", pa.string()),
+    ("model_version", pa.string()),
+    ("churn_proba", pa.float32()),
+    ("risk_tier", pa.int8()),
+]) if HAS_PYARROW else None
+
+
+def _require_pyarrow():
+    if not HAS_PYARROW:
+        raise ValueError("점수 이력 저장에는 pyarrow가 필요합니다. (pip install pyarrow)")
+
+
+def _atomic_write_json(path: str, obj: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _bucket_dir(root: str, b: int) -> str:
+    return os.path.join(root, f"bucket={b:03d}")
+
+
+def _buckets(root: str) -> Optional[int]:
+    """저장소의 버킷 수 (저장소가 없으면 None)."""
+    path = os.path.join(root, META_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return int(json.load(f)["buckets"])
+
+
+def new_run_key(now: Optional[datetime] = None) -> str:
+    """실행 키: 시각 순 정렬이 되도록 타임스탬프 + 충돌 방지 접미사."""
+    return f"{(now or datetime.now()):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+
+def _run_at(run_key: str) -> datetime:
+    return datetime.strptime(run_key[:15], "%Y%m%dT%H%M%S")
+
+
+def _write_parquet(path: str, table):
+    tmp = path + ".tmp"
+    pq.write_table(table, tmp, row_group_size=HISTORY_ROW_GROUP, compression="zstd")
+    os.replace(tmp, path)
+
+
+# =========================
+# Append
+# =========================
+def append_run(
+    out: pd.DataFrame,
+    run_key: Optional[str] = None,
+    id_col: str = "customer_id",
+    part: str = "all",
+    root: str = HISTORY_DIR,
+) -> Dict[str, object]:
+    """
+    predict_and_build 결과를 이력에 추가 (버킷별 파일 1개씩, 기존 파일은 건드리지 않음).
+    part: 같은 실행을 여러 조각으로 나눠 쓸 때(배치 파티션 등) 파일 이름 구분용
+    반환: 실행 요약 (runs/<run_key>__<part>.json과 같은 내용)
+    """
+    _require_pyarrow()
+    run_key = run_key or new_run_key()
+    run_at = _run_at(run_key)
+    append_id = uuid.uuid4().hex
+    os.makedirs(os.path.join(root, RUNS_DIR), exist_ok=True)
+
+    buckets = _buckets(root)
+    if buckets is None:
+        buckets = HISTORY_BUCKETS
+        _atomic_write_json(os.path.join(root, META_NAME), {"buckets": buckets, "created_at": run_at.isoformat()})
+
+    ids = out[id_col].astype(str)
+    tier = pd.Categorical(out["risk_tier"], categories=TIERS).codes.astype(np.int8) + 1
+    frame = pd.DataFrame({
+        "customer_id": ids.to_numpy(),
+        "run_at": np.full(len(out), np.datetime64(run_at, "s")),
+        "run_key": run_key,
+        "append_id": append_id,
+        "model_version": out["model_version"].astype(str).to_numpy() if "model_version" in out.columns else "",
+        "churn_proba": out["churn_proba"].to_numpy(dtype=np.float32),
+        "risk_tier": tier,
+    })
+
+    # 버킷 -> customer_id 순 정렬 후 버킷 경계로 잘라 파일 기록
+    b = shard_of(ids, buckets)
+    order = np.lexsort((frame["customer_id"].to_numpy(), b))
+    frame = frame.iloc[order].reset_index(drop=True)
+    bounds = np.searchsorted(b[order], np.arange(buckets + 1))
+    name = f"{run_key}__{part}.parquet"
+    for i in range(buckets):
+        if bounds[i + 1] == bounds[i]:
+            continue
+        os.makedirs(_bucket_dir(root, i), exist_ok=True)
+        table = pa.Table.from_pandas(frame.iloc[bounds[i]:bounds[i + 1]], schema=_SCHEMA, preserve_index=False)
+        _write_parquet(os.path.join(_bucket_dir(root, i), name), table)
+
+    summary = {
+        "run_key": run_key,
+        "part": part,
+        "append_id": append_id,
+        "run_at": run_at.isoformat(),
+        "model_version": str(frame["model_version"].iat[0]) if len(frame) else None,
+        "rows": int(len(frame)),
+        "tier_counts": {t: int(n) for t, n in zip(TIERS, np.bincount(tier - 1, minlength=len(TIERS)))},
+        "proba_sum": float(frame["churn_proba"].to_numpy(dtype=np.float64).sum()),
+    }
+    # 요약은 행 파일을 다 쓴 뒤 기록 -> 요약이 보이면 해당 실행 행도 모두 조회 가능
+    _atomic_write_json(os.path.join(root, RUNS_DIR, f"{run_key}__{part}.json"), summary)
+    return summary
+
+
+# =========================
+# Queries
+# =========================
+def _dedup(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    compaction 도중(병합 파일과 원본이 잠깐 공존) 같은 append의 행만 중복 제거 + 시간순 정렬.
+    run_key 기준이면 run_key를 공유하는 배치 파티션 행까지 합쳐져 티어 추이(조각 합산)와 어긋남
+    """
+    return df.drop_duplicates(["append_id", "customer_id"]).sort_values("run_at").reset_index(drop=True)
+
+
+def _file_month_end(path: str) -> datetime:
+    """파일이 담을 수 있는 가장 늦은 시각 (기간 밖 파일은 열지 않기 위한 용도)."""
+    name = os.path.basename(path)
+    if name.startswith(COMPACTED_PREFIX):
+        month = datetime.strptime(name[len(COMPACTED_PREFIX):len(COMPACTED_PREFIX) + 6], "%Y%m")
+        return (month + timedelta(days=32)).replace(day=1)
+    return _run_at(name)
+
+
+def customer_history(customer_id, months: int = HISTORY_MONTHS, root: str = HISTORY_DIR) -> pd.DataFrame:
+    """
+    고객 1명의 실행별 점수 추이 (오래된 순).
+    해당 고객의 버킷 디렉터리만, 기간 안의 파일만, customer_id 통계가 맞는 row group만 읽음.
+    """
+    cols = ["run_at", "run_key", "model_version", "churn_proba", "risk_tier"]
+    buckets = _buckets(root)
+    if buckets is None or not HAS_PYARROW:
+        return pd.DataFrame(columns=cols)
+
+    cid = str(customer_id)
+    b = int(shard_of(pd.Series([cid]), buckets)[0])
+    since = datetime.now() - timedelta(days=31 * months)
+    files = [
+        f for f in glob.glob(os.path.join(_bucket_dir(root, b), "*.parquet"))
+        if _file_month_end(f) >= since
+    ]
+    if not files:
+        return pd.DataFrame(columns=cols)
+
+    table = ds.dataset(files, format="parquet").to_table(
+        columns=["customer_id", "append_id"] + cols,
+        filter=(ds.field("customer_id") == cid) & (ds.field("run_at") >= pa.scalar(since, pa.timestamp("s"))),
+    )
+    df = _dedup(table.to_pandas())
+    df["risk_tier"] = [TIERS[t - 1] for t in df["risk_tier"]]
+    return df[cols]
+
+
+def tier_trend(root: str = HISTORY_DIR) -> pd.DataFrame:
+    """실행별 티어 고객 수 / 평균 확률 (실행 요약만 읽음, 같은 run_key의 조각은 합산)."""
+    rows = []
+    for path in glob.glob(os.path.join(root, RUNS_DIR, "*.json")):
+        with open(path, encoding="utf-8") as f:
+            s = json.load(f)
+        rows.append({"run_key": s["run_key"], "run_at": s["run_at"], "rows": s["rows"], "proba_sum": s["proba_sum"], **s["tier_counts"]})
+    if not rows:
+        return pd.DataFrame(columns=["run_key", "run_at", "rows", "mean_proba"] + TIERS)
+
+    df = pd.DataFrame(rows).groupby(["run_key", "run_at"], as_index=False).sum()
+    df["mean_proba"] = df["proba_sum"] / df["rows"].clip(lower=1)
+    df["run_at"] = pd.to_datetime(df["run_at"])
+    return df.drop(columns=["proba_sum"]).sort_values("run_at").reset_index(drop=True)
+
+
+# =========================
+# Compaction
+# =========================
+def compact(
+    root: str = HISTORY_DIR,
+    older_than_days: int = COMPACT_AFTER_DAYS,
+    retention_months: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    older_than_days보다 오래된 실행 파일을 버킷·월별 compacted-YYYYMM.parquet 하나로 병합.
+    같은 월의 기존 병합 파일도 함께 다시 씀. retention_months가 있으면 그보다 오래된 월은 삭제.
+    반환: {"merged": 병합된 원본 파일 수, "written": 새로 쓴 파일 수, "dropped": 보존 기간으로 삭제한 파일 수}
+    """
+    _require_pyarrow()
+    buckets = _buckets(root)
+    stats = {"merged": 0, "written": 0, "dropped": 0}
+    if buckets is None:
+        return stats
+
+    now = datetime.now()
+    cutoff = now - timedelta(days=older_than_days)
+    keep_from = None
+    if retention_months:
+        keep_from = f"{(now - timedelta(days=31 * retention_months)):%Y%m}"
+
+    for b in range(buckets):
+        groups: Dict[str, List[str]] = {}
+        for path in glob.glob(os.path.join(_bucket_dir(root, b), "*.parquet")):
+            name = os.path.basename(path)
+            if name.startswith(COMPACTED_PREFIX):
+                month = name[len(COMPACTED_PREFIX):len(COMPACTED_PREFIX) + 6]
+                if keep_from is not None and month < keep_from:
+                    os.remove(path)
+                    stats["dropped"] += 1
+                continue
+            run_at = _run_at(name)
+            if run_at < cutoff:
+                groups.setdefault(f"{run_at:%Y%m}", []).append(path)
+
+        for month, sources in groups.items():
+            if keep_from is not None and month < keep_from:
+                for path in sources:
+                    os.remove(path)
+                stats["dropped"] += len(sources)
+                continue
+            target = os.path.join(_bucket_dir(root, b), f"{COMPACTED_PREFIX}{month}.parquet")
+            inputs = sources + ([target] if os.path.exists(target) else [])
+            table = ds.dataset(inputs, schema=_SCHEMA, format="parquet").to_table()
+            table = table.sort_by([("customer_id", "ascending"), ("run_at", "ascending")])
+            _write_parquet(target, table)
+            for path in sources:
+                os.remove(path)
+            stats["merged"] += len(sources)
+            stats["written"] += 1
+
+    if keep_from is not None:
+        for path in glob.glob(os.path.join(root, RUNS_DIR, "*.json")):
+            if f"{_run_at(os.path.basename(path)):%Y%m}" < keep_from:
+                os.remove(path)
+    return stats
+
+
+# =========================
+# UI
+# =========================
+def render_history_sparkline(customer_id, root: str = HISTORY_DIR):
+    """전략 페이지 선택 고객의 점수 추이 (이력이 2회 이상일 때만)."""
+    try:
+        hist = customer_history(customer_id, root=root)
+    except Exception as e:
+        st.caption(f"점수 이력 조회 오류: {e}")
+        return
+    if len(hist) < 2:
+        st.caption("점수 이력: 이전 실행 기록이 없습니다." if len(hist) == 0 else "점수 이력: 이번 실행 1회뿐입니다.")
+        return
+
+    first, last = hist.iloc[0], hist.iloc[-1]
+    st.markdown(
+        f"<div class='cs-section-title'>점수 추이 · 최근 {len(hist)}회 "
+        f"({first['risk_tier']} → {last['risk_tier']}, {last['churn_proba'] - first['churn_proba']:+.4f})</div>",
+        unsafe_allow_html=True,
+    )
+    st.line_chart(hist.set_index("run_at")[["churn_proba"]], height=140)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="점수 이력 저장소 조회/정리")
+    parser.add_argument("--root", default=HISTORY_DIR)
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_c = sub.add_parser("customer", help="고객 1명 점수 추이")
+    p_c.add_argument("customer_id")
+    p_c.add_argument("--months", type=int, default=HISTORY_MONTHS)
+
+    sub.add_parser("tiers", help="실행별 티어 고객 수 추이")
+
+    p_k = sub.add_parser("compact", help="오래된 실행 파일 병합")
+    p_k.add_argument("--older-than", type=int, default=COMPACT_AFTER_DAYS, help="이 일수보다 오래된 실행만 병합")
+    p_k.add_argument("--retention", type=int, default=None, help="보존 개월 수 (넘으면 삭제)")
+    args = parser.parse_args(argv)
+
+    if args.cmd == "customer":
+        print(customer_history(args.customer_id, months=args.months, root=args.root).to_string(index=False))
+    elif args.cmd == "tiers":
+        print(tier_trend(args.root).to_string(index=False))
+    else:
+        stats = compact(args.root, older_than_days=args.older_than, retention_months=args.retention)
+        print(f"merged={stats['merged']} written={stats['written']} dropped={stats['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,166 @@
 # modules/inference.py
+import json
+import os
+import threading
+import time
+import warnings
 import numpy as np
 import pandas as pd
 import streamlit as st
 import joblib
-from typing import Dict, List, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 
-from modules.ai_lib import preprocess_data
+from modules.ai_lib import MATRIX_MODES, build_feature_matrix, preprocess_data
+from modules.artifacts import active_version, file_hash, read_manifest, verify, version_dir
 
 MODEL_PATH = "models/final_churn_model.pkl"
 THRESH_PATH = "models/risk_thresholds.pkl"
 
-@st.cache_resource
-def load_artifacts() -> Tuple[Any, Dict, List[str]]:
-    """
-    Streamlit rerun에도 안정적으로:
-      - 모델/threshold 로드 캐시
-      - 학습 피처 목록 확보
-    """
-    model = joblib.load(MODEL_PATH)
-    thresholds = joblib.load(THRESH_PATH)
+# 대용량 업로드는 chunk 단위로 전처리/예측 (메모리 피크 제한 + 진행률/취소 지점)
+SCORING_CHUNK_ROWS = 200_000
+
+# 피처 행렬 형식 (modules.ai_lib.MATRIX_MODES). 범주 카디널리티가 크면 narrow/sparse가 유리
+FEATURE_MATRIX_MODE = os.getenv("FEATURE_MATRIX_MODE", "dense")
+
+# champion/challenger 모델 목록 (없으면 MODEL_PATH/THRESH_PATH 단일 모델)
+# {"champion": "final",
+#  "models": {"final": {"model": "models/final_churn_model.pkl", "thresholds": "models/risk_thresholds.pkl"},
+#             "retrain_2601": {"model": "...", "thresholds": "..."}}}
+REGISTRY_PATH = "models/registry.json"
+
+# 활성 모델 버전/registry 변경 감지 주기(초). 0이면 감시 스레드 없음
+RELOAD_CHECK_SECONDS = 30
+
+def _read_registry_config() -> Dict[str, Any]:
+    if not os.path.exists(REGISTRY_PATH):
+        config = {"champion": "final", "models": {"final": {"model": MODEL_PATH, "thresholds": THRESH_PATH}}}
+    else:
+        with open(REGISTRY_PATH, encoding="utf-8") as f:
+            config = json.load(f)
+
+    models = config.get("models") or {}
+    if config.get("champion") not in models:
+        raise ValueError(f"{REGISTRY_PATH}의 champion '{config.get('champion')}'이(가) models에 없습니다.")
+
+    # 버전 저장소(modules.artifacts)에 활성 버전이 있으면 champion 아티팩트를 대체
+    version = active_version()
+    if version is not None:
+        manifest = read_manifest(version)
+        d = version_dir(version)
+        models[config["champion"]] = {
+            "model": os.path.join(d, manifest["model_file"]),
+            "thresholds": os.path.join(d, manifest["thresholds_file"]),
+            "version": version,
+            "manifest": manifest,
+        }
+    return config
+
+def _load_model_entry(name: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    manifest = spec.get("manifest")
+    if manifest is not None:
+        verify(manifest)
+
+    model = joblib.load(spec["model"])
+    thresholds = joblib.load(spec["thresholds"])
 
     if hasattr(model, "feature_names_in_"):
         model_features = list(model.feature_names_in_)
     else:
         raise ValueError(
-            "모델에 feature_names_in_가 없습니다. "
+            f"모델 '{name}'에 feature_names_in_가 없습니다. "
             "학습 시 사용한 MODEL_FEATURES를 별도 파일로 저장해서 로드하는 방식으로 바꿔야 합니다."
         )
+    if manifest is not None and manifest.get("features") != [str(f) for f in model_features]:
+        raise ValueError(f"모델 버전 '{spec['version']}'의 피처 목록이 manifest와 다릅니다.")
+
+    # 버전 저장소 밖의 모델은 이름 + 파일 해시 앞자리로 버전 표기
+    version = spec.get("version") or f"{name}-{file_hash(spec['model'])[:12]}"
+    return {"name": name, "version": version, "model": model, "thresholds": thresholds, "features": model_features}
+
+def _registry_token() -> Tuple:
+    """변경 감지용: 활성 버전 + 설정/기본 아티팩트 파일 수정 시각."""
+    def _mtime(path):
+        return os.path.getmtime(path) if os.path.exists(path) else None
+    return (active_version(), _mtime(REGISTRY_PATH), _mtime(MODEL_PATH), _mtime(THRESH_PATH))
+
+class ModelStore:
+    """
+    로드된 모델 목록(snapshot) 보관소.
+    새 버전이 감지되면 전부 새로 로드한 뒤 참조만 교체 -> 재시작 불필요.
+    진행 중인 스코어링은 시작 시점에 받은 snapshot을 끝까지 사용하므로 중간에 모델이 바뀌지 않음.
+    새 버전 로드가 실패하면 기존 snapshot을 계속 쓰고 last_error에 기록.
+    """
+
+    def __init__(self, check_seconds: float = RELOAD_CHECK_SECONDS):
+        self._lock = threading.Lock()
+        self._registry: Optional[List[Dict[str, Any]]] = None
+        self._token = None
+        self.loaded_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.refresh()
+
+        if check_seconds > 0:
+            threading.Thread(target=self._watch, args=(check_seconds,), daemon=True).start()
+
+    def current(self) -> List[Dict[str, Any]]:
+        return self._registry
+
+    def refresh(self) -> bool:
+        """변경이 있으면 다시 로드 후 교체. 교체했으면 True."""
+        with self._lock:
+            token = _registry_token()
+            if token == self._token:
+                return False
+            config = _read_registry_config()
+            champion = config["champion"]
+            names = [champion] + [n for n in config["models"] if n != champion]
+            registry = [_load_model_entry(n, config["models"][n]) for n in names]
+
+            self._registry = registry
+            self._token = token
+            self.loaded_at = time.time()
+            return True
 
-    return model, thresholds, model_features
+    def _watch(self, check_seconds: float):
+        while True:
+            time.sleep(check_seconds)
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+
+@st.cache_resource
+def get_model_store() -> ModelStore:
+    return ModelStore()
+
+def load_registry() -> List[Dict[str, Any]]:
+    """
+    현재 모델 snapshot. champion이 항상 첫 번째.
+    각 항목: {"name", "version", "model", "thresholds", "features"}
+    """
+    return get_model_store().current()
+
+def load_artifacts() -> Tuple[Any, Dict, List[str]]:
+    """
+    Streamlit rerun에도 안정적으로:
+      - 모델/threshold 로드 캐시 (load_registry의 champion)
+      - 학습 피처 목록 확보
+    """
+    champion = load_registry()[0]
+    return champion["model"], champion["thresholds"], champion["features"]
 
 def _as_prob(model, X: pd.DataFrame) -> np.ndarray:
     if not hasattr(model, "predict_proba"):
         raise ValueError("모델에 predict_proba가 없습니다. 저장 형태를 확인해야 합니다.")
 
-    proba = model.predict_proba(X)
+    if isinstance(X, pd.DataFrame):
+        proba = model.predict_proba(X)
+    else:
+        # sparse 행렬: 열 순서는 학습 피처와 같지만 이름이 없어 sklearn이 경고 -> 무시
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            proba = model.predict_proba(X)
     if len(proba.shape) == 2 and proba.shape[1] >= 2:
         return proba[:, 1]
     return proba.ravel()
@@ -73,6 +199,14 @@ def assign_risk_tier(p: float, T90: float, T95: float, T99: float) -> str:
     else:
         return "Tier 4"  # Low Risk
 
+def assign_risk_tiers(p: np.ndarray, th: Dict[str, float]) -> np.ndarray:
+    """assign_risk_tier의 벡터화 버전 (행 단위 apply 대신 np.select)."""
+    return np.select(
+        [p >= th["T99"], p >= th["T95"], p >= th["T90"]],
+        ["Tier 1", "Tier 2", "Tier 3"],
+        default="Tier 4",
+    )
+
 def tier_to_korean_label(tier: str) -> str:
     mapping = {
         "Tier 1": "즉시 이탈 위험",
@@ -82,9 +216,25 @@ def tier_to_korean_label(tier: str) -> str:
     }
     return mapping.get(tier, tier)
 
-def predict_and_build(df_raw: pd.DataFrame, id_col: str = "customer_id") -> pd.DataFrame:
+# 화면 선택지용 위험군 라벨 (Tier 1 -> Tier 4 순)
+RISK_GROUPS = [tier_to_korean_label(t) for t in ("Tier 1", "Tier 2", "Tier 3", "Tier 4")]
+
+def predict_and_build(
+    df_raw: pd.DataFrame,
+    id_col: str = "customer_id",
+    progress: Optional[Callable[[str, float], None]] = None,
+    profile=None,
+    matrix: Optional[str] = None,
+    evaluator=None,
+) -> pd.DataFrame:
     """
     업로드 raw df -> 전처리 -> 확률 예측 -> 티어/라벨 생성 -> 결과 df 반환
+    progress(stage, pct)가 주어지면 chunk마다 진행률을 보고 (백그라운드 작업 취소 지점 겸용)
+    profile은 preprocess_data로 그대로 전달 (드리프트 분포 누적)
+    matrix: 피처 행렬 형식 dense/narrow/sparse (None이면 FEATURE_MATRIX_MODE)
+    evaluator: chunk마다 champion 확률로 update(chunk, p, thresholds) 호출 (라벨 평가 누적, modules.evaluation)
+    registry에 challenger가 있으면 같은 전처리 결과로 함께 예측해 모델별 컬럼 추가
+    결과의 model_version은 champion 버전 (실행 중 모델이 교체돼도 시작 시점 snapshot 기준)
     """
     if df_raw is None or len(df_raw) == 0:
         raise ValueError("업로드 데이터가 비어 있습니다.")
@@ -92,21 +242,103 @@ def predict_and_build(df_raw: pd.DataFrame, id_col: str = "customer_id") -> pd.D
     if id_col not in df_raw.columns:
         raise ValueError(f"ID 컬럼 '{id_col}'이(가) 업로드 파일에 없습니다. 현재 컬럼 일부: {list(df_raw.columns)[:30]}")
 
-    model, thresholds_obj, model_features = load_artifacts()
-    th = _get_thresholds(thresholds_obj)
+    matrix = matrix or FEATURE_MATRIX_MODE
+    if matrix not in MATRIX_MODES:
+        raise ValueError(f"지원하지 않는 행렬 형식입니다: {matrix} ({'/'.join(MATRIX_MODES)})")
+
+    def _report(stage: str, pct: float):
+        if progress is not None:
+            progress(stage, pct)
+
+    registry = load_registry()
+    champion, challengers = registry[0], registry[1:]
+    th = {m["name"]: _get_thresholds(m["thresholds"]) for m in registry}
 
-    # 전처리: object -> numeric / one-hot / 컬럼정렬
-    X = preprocess_data(df_raw, model_features=model_features, id_col=id_col)
+    # 모든 모델 피처의 합집합으로 전처리는 1회만 (champion 피처가 앞쪽 -> 단일 모델이면 그대로 사용)
+    union_features = list(dict.fromkeys(f for m in registry for f in m["features"]))
+    union_pos = {f: j for j, f in enumerate(f for f in union_features if f != id_col)}
 
-    # 예측
-    p = _as_prob(model, X).astype(float)
+    # 전처리 + 예측을 chunk 단위로 수행: object -> numeric / one-hot / 컬럼정렬 -> 확률
+    n = len(df_raw)
+    parts = {m["name"]: [] for m in registry}
+    for start in range(0, n, SCORING_CHUNK_ROWS):
+        _report("전처리·예측", start / n)
+        chunk = df_raw.iloc[start:start + SCORING_CHUNK_ROWS]
+        if matrix == "dense":
+            X = preprocess_data(chunk, model_features=union_features, id_col=id_col, profile=profile)
+        else:
+            X = build_feature_matrix(chunk, model_features=union_features, id_col=id_col, profile=profile, mode=matrix)
+        for m in registry:
+            if m["features"] == union_features:
+                X_m = X
+            elif isinstance(X, pd.DataFrame):
+                X_m = X[m["features"]]
+            else:
+                X_m = X[:, [union_pos[f] for f in m["features"]]]
+            parts[m["name"]].append(_as_prob(m["model"], X_m).astype(float))
+        if evaluator is not None:
+            # 티어 판정과 같은 기준(반올림 확률)으로 평가
+            evaluator.update(chunk, np.round(parts[champion["name"]][-1], 6), th[champion["name"]])
 
+    _report("위험군 분류", 0.0)
+    p = np.round(np.concatenate(parts[champion["name"]]), 6)
     out = pd.DataFrame({
-        id_col: df_raw[id_col].astype(str),
-        "churn_proba": np.round(p, 6),
+        id_col: df_raw[id_col].astype(str).to_numpy(),
+        "churn_proba": p,
     })
 
-    out["risk_tier"] = out["churn_proba"].apply(lambda v: assign_risk_tier(v, th["T90"], th["T95"], th["T99"]))
-    out["risk_group"] = out["risk_tier"].apply(tier_to_korean_label)
+    out["risk_tier"] = assign_risk_tiers(p, th[champion["name"]])
+    out["risk_group"] = out["risk_tier"].map(tier_to_korean_label)
+    out["model_version"] = pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), categories=[champion["version"]])
 
+    # challenger: 모델별 확률/티어 컬럼 (churn_proba__<name>, risk_tier__<name>)
+    for m in challengers:
+        p_m = np.round(np.concatenate(parts[m["name"]]), 6)
+        out[f"churn_proba__{m['name']}"] = p_m
+        out[f"risk_tier__{m['name']}"] = assign_risk_tiers(p_m, th[m["name"]])
+
+    _report("정렬", 0.5)
     return out.sort_values("churn_proba", ascending=False).reset_index(drop=True)
+
+def score_rows(df_raw: pd.DataFrame, id_col: str = "customer_id") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    champion 모델로 입력 행 순서 그대로 (확률, 티어) 반환.
+    결과 df 구성/정렬/challenger 예측 없이 전처리 + 예측 1회 (what-if 시나리오 등 소량 배치용)
+    """
+    champion = load_registry()[0]
+    X = preprocess_data(df_raw, model_features=champion["features"], id_col=id_col)
+    p = np.round(_as_prob(champion["model"], X).astype(float), 6)
+    return p, assign_risk_tiers(p, _get_thresholds(champion["thresholds"]))
+
+def model_agreement(out: pd.DataFrame) -> Optional[pd.DataFrame]:
+    """
+    champion 대비 challenger별 일치도 요약. challenger가 없으면 None.
+      - tier_agreement: 티어 일치율
+      - pearson / spearman: 확률 상관
+      - mean_abs_diff: 확률 평균 절대차
+      - tier1_jaccard: Tier 1 고객 집합 Jaccard
+    """
+    names = [c[len("churn_proba__"):] for c in out.columns if c.startswith("churn_proba__")]
+    if not names:
+        return None
+
+    base_p = out["churn_proba"]
+    base_rank = base_p.rank()
+    base_t1 = out["risk_tier"].to_numpy() == "Tier 1"
+
+    rows = []
+    for name in names:
+        p_m = out[f"churn_proba__{name}"]
+        tier_m = out[f"risk_tier__{name}"].to_numpy()
+        t1_m = tier_m == "Tier 1"
+        union_t1 = int((base_t1 | t1_m).sum())
+        rows.append({
+            "model": name,
+            "tier_agreement": float((out["risk_tier"].to_numpy() == tier_m).mean()),
+            "pearson": float(base_p.corr(p_m)),
+            "spearman": float(base_rank.corr(p_m.rank())),
+            "mean_abs_diff": float((base_p - p_m).abs().mean()),
+            "tier1_jaccard": float((base_t1 & t1_m).sum() / union_t1) if union_t1 else None,
+            "tier1_count": int(t1_m.sum()),
+        })
+    return pd.DataFrame(rows)
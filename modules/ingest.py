@@ -0,0 +1,184 @@
+# modules/ingest.py
+"""
+업로드/배치 입력 파일 로더.
+
+- 모델(ai_lib)과 화면(ai_lib.RAW_COLS)이 실제로 쓰는 컬럼만 읽음
+- 컬럼별 dtype을 명시해 타입 추론 비용 제거
+- pyarrow가 있으면 멀티스레드 pyarrow CSV 엔진 사용
+- 헤더의 BOM/공백은 읽는 시점에 1회만 정리
+- 빈 문자열("")은 어느 경로(pyarrow / C 엔진 / Parquet)로 읽어도 결측(NA)으로 통일
+- CSV / Parquet 지원
+"""
+import csv
+import os
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from modules.ai_lib import _SPENT_M1_M6, CORE_CATEGORICAL_FEATURES, HIGH_IMPORTANCE_FEATURES, RAW_COLS
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    pa = pacsv = pq = None
+    HAS_PYARROW = False
+
+SUPPORTED_EXTS = (".csv", ".parquet")
+NUMERIC_DTYPE = "float64"
+CATEGORY_DTYPE = "category"
+
+
+def clean_column_name(name: str) -> str:
+    return str(name).replace("\ufeff", "").strip()
+
+
+def required_columns(id_col: str = "customer_id", extra: Sequence[str] = ()) -> List[str]:
+    """모델 입력(원본 기준) + 화면 표시 컬럼 + 추가 컬럼(라벨 등)의 합집합 (순서 유지)."""
+    cols = [id_col] + _SPENT_M1_M6 + HIGH_IMPORTANCE_FEATURES + CORE_CATEGORICAL_FEATURES + RAW_COLS + list(extra)
+    return list(dict.fromkeys(cols))
+
+
+def column_dtypes(id_col: str = "customer_id") -> Dict[str, str]:
+    dtypes = {c: NUMERIC_DTYPE for c in required_columns(id_col)}
+    for c in CORE_CATEGORICAL_FEATURES:
+        dtypes[c] = CATEGORY_DTYPE
+    dtypes[id_col] = "str"
+    return dtypes
+
+
+def _clean_header(raw_names: List[str]) -> List[str]:
+    """정리된 이름이 겹치면 뒤쪽에 .1, .2 ... 부여 (pandas 기본 규칙과 동일)."""
+    seen: Dict[str, int] = {}
+    out = []
+    for name in raw_names:
+        clean = clean_column_name(name)
+        if clean in seen:
+            seen[clean] += 1
+            clean = f"{clean}.{seen[clean]}"
+        else:
+            seen[clean] = 0
+        out.append(clean)
+    return out
+
+
+def _read_header(buf) -> List[str]:
+    first = buf.readline()
+    buf.seek(0)
+    if isinstance(first, bytes):
+        first = first.decode("utf-8-sig", errors="replace")
+    return next(csv.reader([first]), [])
+
+
+def _arrow_type(dtype: str):
+    if dtype == NUMERIC_DTYPE:
+        return pa.float64()
+    if dtype == CATEGORY_DTYPE:
+        return pa.dictionary(pa.int32(), pa.string())
+    return pa.string()
+
+
+def _read_csv_arrow(buf, names: List[str], usecols: List[str], dtypes: Dict[str, str]) -> pd.DataFrame:
+    # 헤더 행은 건너뛰고 정리된 이름(names)을 그대로 컬럼명으로 사용
+    table = pacsv.read_csv(
+        buf,
+        read_options=pacsv.ReadOptions(column_names=names, skip_rows=1, use_threads=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=usecols,
+            column_types={c: _arrow_type(t) for c, t in dtypes.items()},
+            # 빈 칸은 C 엔진과 같이 결측으로 (기본값은 문자열 컬럼에서 "")
+            strings_can_be_null=True,
+        ),
+    )
+    return table.to_pandas()
+
+
+def _blank_to_na(df: pd.DataFrame) -> pd.DataFrame:
+    """문자열/범주 컬럼의 빈 문자열 -> NA (범주는 범주 목록만 수정)."""
+    for c in df.columns:
+        s = df[c]
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            if "" in s.cat.categories:
+                df[c] = s.cat.remove_categories([""])
+        elif not pd.api.types.is_numeric_dtype(s):
+            blank = (s == "").to_numpy(dtype=bool, na_value=False)
+            if blank.any():
+                df[c] = s.mask(blank)
+    return df
+
+
+def _read_csv(buf, id_col: str, extra: Sequence[str] = ()) -> pd.DataFrame:
+    return _blank_to_na(_parse_csv(buf, id_col, extra))
+
+
+def _parse_csv(buf, id_col: str, extra: Sequence[str] = ()) -> pd.DataFrame:
+    names = _clean_header(_read_header(buf))
+    wanted = set(required_columns(id_col, extra))
+    usecols = [c for c in names if c in wanted]
+    dtypes = {c: t for c, t in column_dtypes(id_col).items() if c in usecols}
+    loose = {c: t for c, t in dtypes.items() if t != NUMERIC_DTYPE}
+
+    if HAS_PYARROW:
+        try:
+            return _read_csv_arrow(buf, names, usecols, dtypes)
+        except pa.ArrowInvalid:
+            # 숫자 컬럼에 비숫자 값이 섞인 경우: 숫자형 타입 지정만 빼고 다시 읽음
+            # (값 보정은 preprocess_data의 to_numeric(errors="coerce")가 담당)
+            buf.seek(0)
+            return _read_csv_arrow(buf, names, usecols, loose)
+
+    # pyarrow가 없으면 C 엔진: 헤더를 정리된 이름으로 대체해서 읽음
+    kwargs = dict(header=0, names=names, usecols=usecols)
+    try:
+        return pd.read_csv(buf, dtype=dtypes, **kwargs)
+    except ValueError:
+        buf.seek(0)
+        return pd.read_csv(buf, dtype=loose, **kwargs)
+
+
+def _read_parquet(buf, id_col: str, extra: Sequence[str] = ()) -> pd.DataFrame:
+    if not HAS_PYARROW:
+        raise ValueError("Parquet 파일을 읽으려면 pyarrow가 필요합니다. (pip install pyarrow)")
+
+    raw_names = pq.ParquetFile(buf).schema_arrow.names
+    buf.seek(0)
+    names = _clean_header(raw_names)
+    wanted = set(required_columns(id_col, extra))
+    raw_use = [r for r, c in zip(raw_names, names) if c in wanted]
+
+    df = pd.read_parquet(buf, columns=raw_use)
+    df.columns = [c for r, c in zip(raw_names, names) if c in wanted]
+
+    if id_col in df.columns:
+        df[id_col] = df[id_col].astype(str)
+    for c in CORE_CATEGORICAL_FEATURES:
+        if c in df.columns:
+            df[c] = df[c].astype(CATEGORY_DTYPE)
+    return _blank_to_na(df)
+
+
+def read_table(
+    src,
+    id_col: str = "customer_id",
+    name: Optional[str] = None,
+    extra_columns: Sequence[str] = (),
+) -> pd.DataFrame:
+    """
+    src: 파일 경로 또는 file-like(Streamlit UploadedFile 등)
+    name: file-like일 때 확장자 판별용 파일명 (없으면 src.name 사용)
+    extra_columns: 기본 컬럼 외에 함께 읽을 컬럼 (예: 평가용 라벨). 타입은 자동 추론
+    """
+    name = name or (src if isinstance(src, str) else getattr(src, "name", ""))
+    ext = os.path.splitext(str(name))[1].lower()
+    if ext not in SUPPORTED_EXTS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {ext or name} (CSV/Parquet만 가능)")
+
+    reader = _read_parquet if ext == ".parquet" else _read_csv
+    if isinstance(src, str):
+        with open(src, "rb") as f:
+            return reader(f, id_col, extra_columns)
+
+    src.seek(0)
+    return reader(src, id_col, extra_columns)
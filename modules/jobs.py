@@ -0,0 +1,252 @@
+# modules/jobs.py
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import streamlit as st
+
+from modules.ui import goto
+
+# 동시에 실행할 스코어링 작업 수 (모델 예측은 GIL을 놓으므로 thread pool로 충분)
+MAX_WORKERS = 2
+# 진행 중 작업이 있을 때 패널 갱신 주기(초)
+POLL_SECONDS = 1.0
+# 완료된 작업을 레지스트리에 남겨두는 최대 개수
+MAX_FINISHED_JOBS = 20
+
+FINISHED_STATUSES = ("done", "failed", "cancelled")
+
+STATUS_LABELS = {
+    "queued": "대기",
+    "running": "실행 중",
+    "done": "완료",
+    "failed": "실패",
+    "cancelled": "취소됨",
+}
+
+
+class JobCancelled(Exception):
+    """사용자가 취소한 작업을 중단할 때 progress 콜백에서 발생."""
+
+
+class Job:
+    """
+    백그라운드 스코어링 작업 1건의 상태.
+    작업 함수는 progress(stage, pct) 콜백으로 단계별 진행률을 보고하고,
+    취소 요청이 있으면 콜백이 JobCancelled를 발생시켜 다음 단계 진입 전에 멈춘다.
+    완료 전에 보여줄 중간 결과(미리보기 등)는 publish(dict)로 게시한다.
+    """
+
+    def __init__(self, job_id: str, label: str):
+        self.job_id = job_id
+        self.label = label
+        self.status = "queued"
+        self.stage = "대기"
+        self.progress = 0.0
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.finished_at: Optional[datetime] = None
+        self.consumed = False
+        self.partial: Optional[Dict[str, Any]] = None
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def report(self, stage: str, pct: float):
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.stage = stage
+        self.progress = float(max(0.0, min(1.0, pct)))
+
+    def publish(self, partial: Dict[str, Any]):
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.partial = partial
+
+    def cancel(self):
+        self._cancel.set()
+        # 아직 시작 전이면 바로 취소 처리
+        if self._future is not None and self._future.cancel():
+            self.status = "cancelled"
+            self.finished_at = datetime.now()
+
+
+class JobManager:
+    """프로세스 전역 작업 레지스트리 + thread pool (세션/rerun과 무관하게 유지)."""
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="churn-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, label: str, fn: Callable[..., Dict[str, Any]], *args, **kwargs) -> Job:
+        job = Job(uuid.uuid4().hex[:8], label)
+        with self._lock:
+            self._prune()
+            self._jobs[job.job_id] = job
+        job._future = self._executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: Job, fn: Callable[..., Dict[str, Any]], args, kwargs):
+        job.status = "running"
+        try:
+            result = fn(*args, progress=job.report, publish=job.publish, **kwargs)
+        except JobCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.error = str(e)
+            job.status = "failed"
+        else:
+            job.result = result
+            job.partial = None
+            job.progress = 1.0
+            job.stage = "완료"
+            job.status = "done"
+        finally:
+            job.finished_at = datetime.now()
+
+    def _prune(self):
+        finished = sorted(
+            (j for j in self._jobs.values() if j.finished),
+            key=lambda j: j.finished_at or j.created_at,
+        )
+        for j in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            self._jobs.pop(j.job_id, None)
+
+
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    return JobManager()
+
+
+# =========================
+# Session helpers
+# =========================
+def _session_jobs() -> List[Job]:
+    manager = get_job_manager()
+    jobs = [manager.get(jid) for jid in st.session_state.get("job_ids", [])]
+    return [j for j in jobs if j is not None]
+
+
+def submit_job(label: str, fn: Callable[..., Dict[str, Any]], *args, **kwargs) -> Job:
+    """작업을 제출하고 현재 세션의 작업 목록에 등록."""
+    job = get_job_manager().submit(label, fn, *args, **kwargs)
+    st.session_state.job_ids = st.session_state.get("job_ids", []) + [job.job_id]
+    return job
+
+
+def active_job() -> Optional[Job]:
+    """현재 세션에서 아직 끝나지 않은 작업(가장 최근 것)."""
+    running = [j for j in _session_jobs() if not j.finished]
+    return running[-1] if running else None
+
+
+def _apply_result(job: Job):
+    """완료된 작업 결과(dict)를 세션에 반영. 결과는 세션으로 넘긴 뒤 레지스트리에서 해제."""
+    for k, v in (job.result or {}).items():
+        st.session_state[k] = v
+    st.session_state.run_id = job.job_id
+    # 미리보기는 정확한 결과로 교체
+    st.session_state.preview = None
+    st.session_state.preview_job = None
+    job.consumed = True
+    job.result = None
+
+
+def _consume_finished() -> bool:
+    """완료됐지만 아직 세션에 반영되지 않은 작업 처리. 반영했으면 True."""
+    applied = False
+    for job in _session_jobs():
+        if job.status == "done" and not job.consumed:
+            _apply_result(job)
+            applied = True
+        elif job.finished and st.session_state.get("preview_job") == job.job_id:
+            # 실패/취소된 작업의 미리보기는 제거
+            st.session_state.preview = None
+            st.session_state.preview_job = None
+    return applied
+
+
+def _consume_partials() -> bool:
+    """진행 중 작업이 새로 게시한 중간 결과를 세션 preview로 반영. 반영했으면 True."""
+    job = active_job()
+    if job is None or job.partial is None or st.session_state.get("preview_job") == job.job_id:
+        return False
+    st.session_state.preview = job.partial
+    st.session_state.preview_job = job.job_id
+    return True
+
+
+def _sync_jobs() -> bool:
+    """
+    작업 결과를 세션에 반영. 반영한 것이 있으면 True.
+    - 완료: 데이터 입력 페이지에 머물러 있을 때만 추출 페이지로 이동 (다른 페이지면 알림만)
+    - 중간 결과: 세션 preview만 갱신하고 알림 (페이지는 그대로)
+    """
+    if _consume_finished():
+        if st.session_state.get("route") == "data":
+            goto("extract")
+        else:
+            st.toast("분석이 완료되었습니다.")
+        return True
+    if _consume_partials():
+        st.toast("미리보기 결과가 준비되었습니다. 고객 추출 페이지에서 확인할 수 있습니다.")
+        return True
+    return False
+
+
+def _render_job(job: Job):
+    status = STATUS_LABELS.get(job.status, job.status)
+    st.markdown(f"**{job.label}** · `{job.job_id}` · {status}")
+
+    if not job.finished:
+        st.progress(job.progress, text=f"{job.stage} {job.progress * 100:.0f}%")
+        if st.button("취소", key=f"job_cancel_{job.job_id}", use_container_width=True):
+            job.cancel()
+    elif job.status == "failed":
+        st.error(f"분석 중 오류가 발생했습니다: {job.error}")
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _poll_jobs():
+    # 반영된 결과가 현재 페이지에도 보이도록 전체 rerun
+    if _sync_jobs():
+        st.rerun()
+
+    for job in reversed(_session_jobs()):
+        _render_job(job)
+
+    # 모든 작업이 끝나면 polling을 멈추기 위해 전체 rerun
+    if active_job() is None:
+        st.rerun()
+
+
+def render_jobs_panel():
+    """사이드바 작업 패널. 진행 중 작업이 있을 때만 주기적으로 polling."""
+    # 페이지 렌더 전에 호출되므로 여기서 반영한 결과는 이번 실행에 바로 보임
+    _sync_jobs()
+
+    jobs = _session_jobs()
+    if not jobs:
+        return
+
+    with st.sidebar:
+        st.markdown("<div class='cs-section-title'>분석 작업</div>", unsafe_allow_html=True)
+        if active_job() is not None:
+            _poll_jobs()
+        else:
+            for job in reversed(jobs):
+                _render_job(job)
+            if st.button("작업 목록 비우기", use_container_width=True):
+                st.session_state.job_ids = []
+                st.rerun()
@@ -2,29 +2,77 @@
 
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import numpy as np
 import pandas as pd
 import streamlit as st
+from typing import Optional
 
 from dotenv import load_dotenv
 from openai import OpenAI
 from modules.ui import shell_open, shell_close, goto
+from modules.export import render_export_panel
+from modules.campaign import CAMPAIGN_SEGMENT
+from modules.customer_index import CustomerIndex, SEARCH_SEGMENT
+from modules.inference import RISK_GROUPS
+from modules.prefetch import PREFETCH_TOP_K, get_prefetcher, hit_rate
+from modules.whatif import render_whatif
+from modules.rule_strategy import ENGINE_LLM, ENGINE_RULES, rule_strategy
+from modules.history import render_history_sparkline
 
 load_dotenv()
 
+# 세션당 보관할 세그먼트 memo 수 (위험군/top_n 조합)
+SEGMENT_MEMO_SIZE = 8
 
-# =========================
-# Helpers: data
-# =========================
-def _clean_columns(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    df.columns = df.columns.str.replace("\ufeff", "").str.strip()
-    return df
+# 규칙 엔진을 직접 고를 때의 모델 선택지 값
+RULES_MODEL = "규칙 엔진(로컬)"
+MODELS = ["gpt-4.1-mini", "gpt-4.1-nano", RULES_MODEL]
+DEFAULT_TOP_N = 300
 
+# LLM 응답 대기 예산(초). 넘기면 규칙 엔진 결과로 대체
+LLM_BUDGET_SECONDS = float(os.getenv("STRATEGY_LLM_BUDGET", "8"))
+# 예산 초과 후에도 백그라운드에서 계속되는 호출의 상한 (스레드가 무한정 남지 않게)
+LLM_HARD_TIMEOUT = 60
+_LLM_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="strategy-llm")
 
-def _build_segment(df_pred: pd.DataFrame, df_raw: pd.DataFrame, risk_group: str, top_n: int = 300) -> pd.DataFrame:
-    df_pred = _clean_columns(df_pred)
-    df_raw = _clean_columns(df_raw)
 
+# =========================
+# Helpers: data
+# =========================
+def _customer_index(df_pred: pd.DataFrame, df_raw: pd.DataFrame) -> CustomerIndex:
+    index = st.session_state.get("customer_index")
+    if index is None:
+        index = st.session_state.customer_index = CustomerIndex(df_pred, df_raw)
+    return index
+
+
+def _attach_raw(df_pred: pd.DataFrame, df_raw: pd.DataFrame, positions: np.ndarray, index: CustomerIndex) -> pd.DataFrame:
+    """
+    df_pred의 positions 행에 원본 속성을 붙임.
+    전체 merge 대신 인덱스의 원본 행 위치로 take -> 비용이 세그먼트 크기에만 비례.
+    (겹치는 컬럼명은 기존 merge와 같이 _raw 접미사)
+    """
+    pred = df_pred.iloc[positions].reset_index(drop=True)
+    pred["customer_id"] = pred["customer_id"].astype(str)
+
+    raw_pos = index.pred_raw_pos[positions]
+    raw = df_raw.iloc[np.where(raw_pos < 0, 0, raw_pos)].drop(columns=["customer_id"]).reset_index(drop=True)
+    if (raw_pos < 0).any():
+        raw = raw.mask(np.broadcast_to((raw_pos < 0)[:, None], raw.shape))
+    raw.columns = [f"{c}_raw" if c in pred.columns else c for c in raw.columns]
+
+    return pd.concat([pred, raw], axis=1)
+
+
+def _build_segment(
+    df_pred: pd.DataFrame,
+    df_raw: pd.DataFrame,
+    risk_group: str,
+    top_n: int = DEFAULT_TOP_N,
+    index: Optional[CustomerIndex] = None,
+) -> pd.DataFrame:
+    # 컬럼명 BOM/공백 정리는 업로드 시점에 1회 수행됨 (modules.ingest)
     required_pred = {"customer_id", "churn_proba", "risk_group", "risk_tier"}
     missing = required_pred - set(df_pred.columns)
     if missing:
@@ -33,17 +81,61 @@ def _build_segment(df_pred: pd.DataFrame, df_raw: pd.DataFrame, risk_group: str,
     if "customer_id" not in df_raw.columns:
         raise ValueError("원본 데이터(df_raw)에 customer_id 컬럼이 없습니다.")
 
-    df_pred["customer_id"] = df_pred["customer_id"].astype(str)
-    df_raw["customer_id"] = df_raw["customer_id"].astype(str)
+    positions = np.flatnonzero((df_pred["risk_group"] == risk_group).to_numpy())
+
+    # predict_and_build 결과는 churn_proba 내림차순 -> 앞에서 top_n이 상위 N (아니면 정렬)
+    p = df_pred["churn_proba"].to_numpy()
+    if not df_pred["churn_proba"].is_monotonic_decreasing:
+        positions = positions[np.argsort(-p[positions], kind="stable")]
+
+    index = index if index is not None else _customer_index(df_pred, df_raw)
+    return _attach_raw(df_pred, df_raw, positions[:int(top_n)], index)
+
+
+def _build_campaign_segment(df_pred: pd.DataFrame, df_raw: pd.DataFrame, targets: pd.DataFrame, top_n: int = DEFAULT_TOP_N) -> pd.DataFrame:
+    """예산 기반 선정 고객(효율 순)에 원본 속성을 붙인 세그먼트."""
+    head = targets.head(int(top_n))[["customer_id", "campaign_channel", "campaign_cost", "expected_value"]]
+    head = head.assign(customer_id=head["customer_id"].astype(str)).reset_index(drop=True)
+
+    index = _customer_index(df_pred, df_raw)
+    positions = index.pred_positions(head["customer_id"])
+    head = head[positions >= 0].reset_index(drop=True)
+    seg = _attach_raw(df_pred, df_raw, positions[positions >= 0], index)
+    return pd.concat([head, seg.drop(columns=["customer_id"])], axis=1)
+
+
+def _build_customer_segment(df_pred: pd.DataFrame, df_raw: pd.DataFrame, customer_id: str) -> pd.DataFrame:
+    """ID 검색으로 지정된 고객 1명 세그먼트 (인덱스로 행 위치를 바로 조회)."""
+    index = _customer_index(df_pred, df_raw)
+    hit = index.lookup(customer_id)
+    if hit is None:
+        return df_pred.iloc[0:0]
+    return _attach_raw(df_pred, df_raw, np.array([hit[0]]), index)
+
+
+def _segment_cached(df_pred: pd.DataFrame, df_raw: pd.DataFrame, risk_group: str, top_n: int):
+    """
+    (결과 버전 run_id, 위험군, top_n)별 세그먼트/요약 memo.
+    행 클릭·텍스트 입력 등 rerun에서는 재구성 없이 재사용.
+    """
+    if risk_group == CAMPAIGN_SEGMENT:
+        # 캠페인 선정 결과는 다시 선정할 때마다 새 객체 -> 객체 id를 버전으로 사용
+        key = (st.session_state.get("run_id"), risk_group, top_n, id(st.session_state.campaign_targets))
+        build = lambda: _build_campaign_segment(df_pred, df_raw, st.session_state.campaign_targets, top_n=top_n)
+    elif risk_group == SEARCH_SEGMENT:
+        key = (st.session_state.get("run_id"), risk_group, st.session_state.focus_customer)
+        build = lambda: _build_customer_segment(df_pred, df_raw, st.session_state.focus_customer)
+    else:
+        key = (st.session_state.get("run_id"), risk_group, top_n)
+        build = lambda: _build_segment(df_pred, df_raw, risk_group=risk_group, top_n=top_n)
 
-    merged = df_pred.merge(df_raw, on="customer_id", how="left", suffixes=("", "_raw"))
-    seg = (
-        merged[merged["risk_group"] == risk_group]
-        .sort_values("churn_proba", ascending=False)
-        .head(int(top_n))
-        .reset_index(drop=True)
-    )
-    return seg
+    memo = st.session_state.setdefault("segment_memo", {})
+    if key not in memo:
+        seg = build()
+        memo[key] = (seg, _summarize_segment(seg))
+        while len(memo) > SEGMENT_MEMO_SIZE:
+            memo.pop(next(iter(memo)))
+    return memo[key]
 
 
 def _select_customer_fields(row: pd.Series) -> dict:
@@ -56,6 +148,8 @@ def _select_customer_fields(row: pd.Series) -> dict:
         "spent_change_ratio", "recent_3m_spent", "past_3m_spent",
         "total_spent_6m", "total_txn_6m", "total_login_6m",
         "points_balance", "revolving_usage", "cash_service_usage",
+        # 예산 기반 캠페인 타겟에서 온 경우
+        "campaign_channel", "expected_value",
     ]
     out = {}
     for k in keep:
@@ -74,6 +168,27 @@ def _summarize_segment(seg: pd.DataFrame) -> dict:
     }
 
 
+def _strategy_key(customer_id, risk_group: str, model: str, brand_context: str) -> str:
+    return str(customer_id) + "|" + risk_group + "|" + model + "|" + (brand_context or "")
+
+
+def prefetch_strategies(df_pred: pd.DataFrame, df_raw: pd.DataFrame, index: CustomerIndex, token: str) -> int:
+    """
+    스코어링 직후(백그라운드 작업 안에서) 위험군별 상위 PREFETCH_TOP_K명의 전략을 사전 생성 요청.
+    화면 기본값(모델/표시 고객 수/제약 없음)과 같은 프롬프트 -> 같은 캐시 키. 제출 건수 반환.
+    """
+    tasks = []
+    for risk_group in RISK_GROUPS[:3]:   # 즉시 이탈 위험 -> 고위험 -> 중위험 순 (안정 제외)
+        seg = _build_segment(df_pred, df_raw, risk_group, top_n=DEFAULT_TOP_N, index=index)
+        seg_summary = _summarize_segment(seg)
+        for _, row in seg.head(PREFETCH_TOP_K).iterrows():
+            customer = _select_customer_fields(row)
+            key = _strategy_key(customer["customer_id"], risk_group, MODELS[0], "")
+            tasks.append((key, _make_ui_json_prompt(customer, "", seg_summary)))
+
+    return get_prefetcher().submit(token, tasks, lambda prompt: _call_openai_json(model=MODELS[0], prompt=prompt))
+
+
 # =========================
 # OpenAI
 # =========================
@@ -82,7 +197,7 @@ def _call_openai_json(model: str, prompt: str) -> dict:
     if not api_key:
         raise ValueError("환경변수 GPT_API_KEY가 없습니다. .env에 GPT_API_KEY=sk-... 를 설정하세요.")
 
-    client = OpenAI(api_key=api_key)
+    client = OpenAI(api_key=api_key, timeout=LLM_HARD_TIMEOUT)
     resp = client.responses.create(model=model, input=prompt)
 
     text = getattr(resp, "output_text", None)
@@ -111,6 +226,26 @@ def _call_openai_json(model: str, prompt: str) -> dict:
         raise ValueError("GPT 응답이 JSON 파싱에 실패했습니다.\n\n원문:\n" + text)
 
 
+def _generate_strategy(model: str, customer: dict, row: pd.Series, brand_context: str, seg_summary: dict) -> dict:
+    """
+    전략 생성: LLM을 LLM_BUDGET_SECONDS까지만 기다리고, 초과/실패하면 규칙 엔진 결과로 대체.
+    반환 dict의 engine(llm/rules)과 fallback_reason으로 어느 엔진이 만들었는지 표시.
+    """
+    if model == RULES_MODEL:
+        return rule_strategy(row)
+
+    prompt = _make_ui_json_prompt(customer, brand_context, seg_summary)
+    future = _LLM_POOL.submit(_call_openai_json, model, prompt)
+    try:
+        data = future.result(timeout=LLM_BUDGET_SECONDS)
+    except FutureTimeout:
+        return {**rule_strategy(row), "fallback_reason": f"LLM 응답이 {LLM_BUDGET_SECONDS:.0f}초를 넘었습니다."}
+    except Exception as e:
+        return {**rule_strategy(row), "fallback_reason": f"LLM 호출 실패: {e}"}
+    data["engine"] = ENGINE_LLM
+    return data
+
+
 # =========================
 # Prompt: JSON only
 # =========================
@@ -266,33 +401,10 @@ def _render_message_box(examples: list):
 
 
 # =========================
-# Page
+# Selection / strategy (fragment)
 # =========================
-def render():
-    shell_open()
-
-    st.markdown('<div class="cs-title">마케팅 전략 (UI 카드형 · 고객 선택)</div>', unsafe_allow_html=True)
-    st.markdown('<div class="cs-sub">표에서 고객을 선택하면, GPT가 UI 렌더링용 JSON을 만들고 화면을 카드/표로 구성합니다.</div>', unsafe_allow_html=True)
-
-    df = st.session_state.get("df")
-    df_raw = st.session_state.get("df_raw")
-
-    if df is None or df_raw is None:
-        st.warning("먼저 데이터 입력 → 예측 실행 후, 이 페이지로 이동하세요.")
-        if st.button("데이터 입력으로 이동", use_container_width=True):
-            goto("data")
-        shell_close()
-        return
-
-    # Controls
-    c1, c2, c3 = st.columns([1.2, 1.2, 1])
-    with c1:
-        risk_group = st.selectbox("위험군", ["고위험", "중위험", "저위험", "안정"], index=0)
-    with c2:
-        top_n = st.slider("표시 고객 수(상위 N명)", 50, 1000, 300, 50)
-    with c3:
-        model = st.selectbox("모델", ["gpt-4.1-mini", "gpt-4.1-nano"], index=0)
-
+@st.fragment
+def _render_selection(seg: pd.DataFrame, seg_summary: dict, risk_group: str, model: str):
     # Context
     st.markdown("<div class='cs-card'>", unsafe_allow_html=True)
     st.markdown("<div class='cs-section-title'>정책/제약(선택)</div>", unsafe_allow_html=True)
@@ -303,20 +415,6 @@ def render():
     )
     st.markdown("</div>", unsafe_allow_html=True)
 
-    # Segment build
-    try:
-        seg = _build_segment(df, df_raw, risk_group=risk_group, top_n=top_n)
-        seg_summary = _summarize_segment(seg)
-    except Exception as e:
-        st.error(f"세그먼트 구성 오류: {e}")
-        shell_close()
-        return
-
-    if len(seg) == 0:
-        st.warning("선택한 위험군에 고객이 없습니다.")
-        shell_close()
-        return
-
     # Customer selection by clicking row (A)
     st.markdown("### 고객 리스트 (행 클릭으로 선택)")
     event = st.dataframe(
@@ -328,9 +426,10 @@ def render():
     )
 
     selected_rows = event.selection.rows
+    if not selected_rows and risk_group == SEARCH_SEGMENT:
+        selected_rows = [0]  # 검색 고객은 1명뿐이므로 바로 선택
     if not selected_rows:
         st.info("표에서 고객 한 명을 클릭하세요.")
-        shell_close()
         return
 
     selected_row = seg.iloc[int(selected_rows[0])]
@@ -344,30 +443,57 @@ def render():
     p2.metric("risk_tier", str(customer.get("risk_tier", "-")))
     churn = customer.get("churn_proba", None)
     p3.metric("churn_proba", f"{float(churn):.4f}" if churn is not None else "-")
+    render_history_sparkline(customer.get("customer_id"))
     st.markdown("</div>", unsafe_allow_html=True)
 
+    # What-if: 원본 행으로 조건 변화 시나리오를 일괄 예측 (별도 fragment라 슬라이더 조작 시 이 패널만 rerun)
+    df_raw = st.session_state.get("df_raw")
+    hit = _customer_index(st.session_state.df, df_raw).lookup(str(customer.get("customer_id")))
+    if hit is not None and hit[1] >= 0:
+        render_whatif(df_raw.iloc[[hit[1]]])
+
     # Generate button
     if "ui_cache" not in st.session_state:
         st.session_state.ui_cache = {}
 
-    cache_key = (
-        str(customer.get("customer_id")) + "|" +
-        risk_group + "|" + model + "|" +
-        (brand_context or "")
-    )
+    cache_key = _strategy_key(customer.get("customer_id"), risk_group, model, brand_context)
+    prefetch_token = st.session_state.get("prefetch_token")
+
+    stats = get_prefetcher().stats(prefetch_token)
+    if stats:
+        rate = hit_rate(stats)
+        st.caption(
+            f"전략 사전 생성: {stats['done']}/{stats['submitted']}건 완료 (실패 {stats['failed']})"
+            f" · 적중률 {'-' if rate is None else f'{rate * 100:.0f}%'} ({stats['hits']}/{stats['hits'] + stats['misses']})"
+        )
 
     st.markdown("<div style='height:8px;'></div>", unsafe_allow_html=True)
     gen = st.button("전략 생성", use_container_width=True)
 
     if gen:
         try:
-            if cache_key in st.session_state.ui_cache:
-                data = st.session_state.ui_cache[cache_key]
-            else:
-                prompt = _make_ui_json_prompt(customer, brand_context, seg_summary)
+            data = st.session_state.ui_cache.get(cache_key)
+            if data is not None and data.get("fallback_reason"):
+                data = None  # 지난번에 규칙 엔진으로 대체된 결과면 LLM 재시도
+            if data is None:
+                # 스코어링 직후 백그라운드에서 미리 생성된 전략이 있으면 사용
+                data = get_prefetcher().get(prefetch_token, cache_key)
+                if data is not None:
+                    st.caption("사전 생성된 전략입니다.")
+            if data is None:
                 with st.spinner("마케팅 전략 생성 중입니다..."):
-                    data = _call_openai_json(model=model, prompt=prompt)
-                st.session_state.ui_cache[cache_key] = data
+                    data = _generate_strategy(model, customer, selected_row, brand_context, seg_summary)
+            st.session_state.ui_cache[cache_key] = data
+
+            # 생성 엔진 표시
+            if data.get("engine") == ENGINE_RULES:
+                reason = data.get("fallback_reason")
+                st.caption(
+                    f"생성 엔진: 규칙 엔진(로컬){f' · {reason} 규칙 엔진 결과로 대체했습니다.' if reason else ''}"
+                    " · 정책/제약 입력은 반영되지 않습니다."
+                )
+            else:
+                st.caption(f"생성 엔진: LLM ({model})")
 
             # Basic validation
             cards = data.get("strategy_cards", [])
@@ -389,6 +515,64 @@ def render():
         except Exception as e:
             st.error(str(e))
 
+
+# =========================
+# Page
+# =========================
+def render():
+    shell_open()
+
+    st.markdown('<div class="cs-title">마케팅 전략 (UI 카드형 · 고객 선택)</div>', unsafe_allow_html=True)
+    st.markdown('<div class="cs-sub">표에서 고객을 선택하면, GPT가 UI 렌더링용 JSON을 만들고 화면을 카드/표로 구성합니다.</div>', unsafe_allow_html=True)
+
+    df = st.session_state.get("df")
+    df_raw = st.session_state.get("df_raw")
+
+    if df is None or df_raw is None:
+        st.warning("먼저 데이터 입력 → 예측 실행 후, 이 페이지로 이동하세요.")
+        if st.button("데이터 입력으로 이동", use_container_width=True):
+            goto("data")
+        shell_close()
+        return
+
+    # Controls
+    c1, c2, c3 = st.columns([1.2, 1.2, 1])
+    with c1:
+        groups = list(RISK_GROUPS)
+        if st.session_state.get("campaign_targets") is not None:
+            groups.append(CAMPAIGN_SEGMENT)
+        if st.session_state.get("focus_customer"):
+            groups.append(SEARCH_SEGMENT)
+        preferred = st.session_state.pop("strategy_segment", None)
+        if preferred in groups:
+            st.session_state.strategy_risk_group = preferred
+        elif st.session_state.get("strategy_risk_group") not in groups:
+            st.session_state.pop("strategy_risk_group", None)
+        risk_group = st.selectbox("위험군", groups, key="strategy_risk_group")
+    with c2:
+        top_n = st.slider("표시 고객 수(상위 N명)", 50, 1000, DEFAULT_TOP_N, 50)
+    with c3:
+        model = st.selectbox("모델", MODELS, index=0)
+
+    # Segment build (memo: 결과 버전/위험군/top_n이 같으면 재사용)
+    try:
+        seg, seg_summary = _segment_cached(df, df_raw, risk_group, top_n)
+    except Exception as e:
+        st.error(f"세그먼트 구성 오류: {e}")
+        shell_close()
+        return
+
+    if len(seg) == 0:
+        st.warning("선택한 위험군에 고객이 없습니다.")
+        shell_close()
+        return
+
+    # 선택/프로필/전략 영역은 fragment: 행 클릭·제약 입력 시 이 영역만 rerun
+    _render_selection(seg, seg_summary, risk_group, model)
+
+    # Export (segment + generated strategies)
+    render_export_panel("strategy_export")
+
     # Footer nav
     st.markdown("<div style='height:10px;'></div>", unsafe_allow_html=True)
     if st.button("← 고객 추출로", use_container_width=True):
@@ -0,0 +1,99 @@
+# modules/prefetch.py
+"""
+고위험 고객 전략 사전 생성(prefetch).
+
+스코어링 직후 위험군별 상위 고객의 전략을 백그라운드에서 미리 생성해 두고,
+전략 페이지에서 "전략 생성"을 누르면 이 캐시를 먼저 조회 -> 적중하면 LLM 왕복 없이 바로 표시.
+  - 동시 호출 수: PREFETCH_CONCURRENCY (프로세스 전체 공유 thread pool)
+  - 비용 예산: 실행 1회당 LLM 호출 최대 PREFETCH_MAX_CALLS건 (우선순위 순으로 자름)
+  - 실행별(token) 통계: 계획/생성/실패 건수, 조회 적중/미적중 -> 적중률로 top-K 튜닝
+프롬프트 구성과 LLM 호출은 호출 측(modules.marketing_strategy)이 넘겨줌.
+"""
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "0") == "1"
+PREFETCH_TOP_K = 10
+PREFETCH_CONCURRENCY = 3
+PREFETCH_MAX_CALLS = 30
+PREFETCH_CACHE_SIZE = 5000
+
+
+class StrategyPrefetcher:
+    def __init__(self, concurrency: int = PREFETCH_CONCURRENCY, cache_size: int = PREFETCH_CACHE_SIZE):
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="strategy-prefetch")
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[Tuple[str, str], dict]" = OrderedDict()
+        self._cache_size = cache_size
+        self._futures: Dict[str, list] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def submit(
+        self,
+        token: str,
+        tasks: List[Tuple[str, Any]],
+        generate: Callable[[Any], dict],
+        max_calls: int = PREFETCH_MAX_CALLS,
+    ) -> int:
+        """tasks: [(캐시 키, generate 인자)] 우선순위 순. 예산 안에서 제출한 건수 반환."""
+        chosen = tasks[:max(0, int(max_calls))]
+        with self._lock:
+            self._stats[token] = {
+                "planned": len(tasks), "submitted": len(chosen), "done": 0, "failed": 0,
+                "hits": 0, "misses": 0,
+            }
+            self._futures[token] = [self._executor.submit(self._run, token, key, generate, arg) for key, arg in chosen]
+        return len(chosen)
+
+    def _run(self, token: str, key: str, generate: Callable[[Any], dict], arg: Any):
+        try:
+            data = generate(arg)
+        except Exception:
+            with self._lock:
+                self._stats[token]["failed"] += 1
+            return
+        with self._lock:
+            self._cache[(token, key)] = data
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            self._stats[token]["done"] += 1
+
+    def get(self, token: Optional[str], key: str) -> Optional[dict]:
+        """사전 생성 결과 조회 (적중/미적중 집계)."""
+        if token is None:
+            return None
+        with self._lock:
+            data = self._cache.get((token, key))
+            stats = self._stats.get(token)
+            if stats is not None:
+                stats["hits" if data is not None else "misses"] += 1
+        return data
+
+    def cancel(self, token: Optional[str]):
+        """아직 시작 안 한 사전 생성 취소 (새 실행이 시작될 때 이전 실행분 정리)."""
+        with self._lock:
+            futures = self._futures.pop(token, [])
+        for f in futures:
+            f.cancel()
+
+    def stats(self, token: Optional[str]) -> Optional[Dict[str, int]]:
+        with self._lock:
+            stats = self._stats.get(token)
+            return dict(stats) if stats is not None else None
+
+
+@st.cache_resource
+def get_prefetcher() -> StrategyPrefetcher:
+    return StrategyPrefetcher()
+
+
+def hit_rate(stats: Optional[Dict[str, int]]) -> Optional[float]:
+    if not stats:
+        return None
+    lookups = stats["hits"] + stats["misses"]
+    return stats["hits"] / lookups if lookups else None
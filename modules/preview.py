@@ -0,0 +1,105 @@
+# modules/preview.py
+"""
+대용량 업로드의 빠른 미리보기 (층화 표본 스코어링).
+
+전체 스코어링 작업 안에서 먼저 PREVIEW_ROWS개 층화 표본(region별 비례 배분)만 예측해
+  - 티어별 추정 고객 수 + 95% 신뢰구간 (층화 추정량)
+  - 표본 내 상위 고객
+을 작업의 중간 결과로 게시(modules.jobs.Job.publish) -> 추출 페이지가 바로 표시하고,
+전체 결과가 반영되면 미리보기는 지워지고 정확한 결과로 교체됨.
+"""
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.inference import predict_and_build, tier_to_korean_label
+
+PREVIEW_ROWS = 50_000
+# 이보다 작은 업로드는 전체 스코어링도 금방 끝나므로 미리보기 생략
+PREVIEW_MIN_ROWS = 300_000
+PREVIEW_TOP_N = 50
+STRATA_COL = "region"
+Z_95 = 1.96
+TIERS = ["Tier 1", "Tier 2", "Tier 3", "Tier 4"]
+
+
+def stratified_sample(df: pd.DataFrame, n: int, strata_col: Optional[str] = STRATA_COL, seed: int = 0):
+    """
+    층별 비례 배분(층마다 최소 1행) 무작위 표본.
+    반환: (표본 행 위치, 표본 행의 층 코드, 층별 모집단 크기, 층별 표본 크기)
+    """
+    rng = np.random.default_rng(seed)
+    total = len(df)
+    if strata_col and strata_col in df.columns:
+        codes, _ = pd.factorize(df[strata_col].astype(str), sort=False)
+    else:
+        codes = np.zeros(total, dtype=np.int64)
+
+    sizes = np.bincount(codes)
+    alloc = np.minimum(sizes, np.maximum(1, np.floor(sizes * n / total).astype(np.int64)))
+
+    # 층 코드 -> 난수 순으로 정렬한 뒤 층 안 순위 < 배분 수인 행만 선택
+    order = np.lexsort((rng.random(total), codes))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    rank = np.arange(total) - starts[codes[order]]
+    pos = np.sort(order[rank < alloc[codes[order]]])
+    return pos, codes[pos], sizes, alloc
+
+
+def build_preview(df_raw: pd.DataFrame, id_col: str = "customer_id", n: int = PREVIEW_ROWS) -> Dict[str, object]:
+    """표본 스코어링 -> 티어별 추정치(신뢰구간) + 표본 상위 고객."""
+    pos, strata, sizes, alloc = stratified_sample(df_raw, n)
+    sample = df_raw.iloc[pos].reset_index(drop=True)
+    out = predict_and_build(sample, id_col=id_col)
+
+    # 표본 행 순서로 티어 정렬 (predict_and_build 결과는 확률순)
+    tier = out.set_index(id_col)["risk_tier"].reindex(sample[id_col].astype(str)).to_numpy()
+
+    total = len(df_raw)
+    w = sizes / total                                   # 층 가중치 N_h / N
+    fpc = 1.0 - alloc / np.maximum(sizes, 1)            # 유한모집단 보정
+    rows = []
+    for t in TIERS:
+        hit = np.bincount(strata, weights=(tier == t).astype(float), minlength=len(sizes))
+        p_h = hit / np.maximum(alloc, 1)
+        share = float((w * p_h).sum())
+        var = float((w ** 2 * p_h * (1 - p_h) / np.maximum(alloc - 1, 1) * fpc).sum())
+        half = Z_95 * np.sqrt(var)
+        rows.append({
+            "risk_tier": t,
+            "risk_group": tier_to_korean_label(t),
+            "est_count": int(round(share * total)),
+            "ci_low": int(round(max(0.0, share - half) * total)),
+            "ci_high": int(round(min(1.0, share + half) * total)),
+            "est_share": share,
+        })
+
+    return {
+        "rows_total": total,
+        "rows_sampled": int(len(pos)),
+        "tier_estimates": pd.DataFrame(rows),
+        "top_customers": out.head(PREVIEW_TOP_N),
+        "created_at": datetime.now().strftime("%H:%M:%S"),
+    }
+
+
+# =========================
+# UI
+# =========================
+def render_preview(preview: Dict[str, object]):
+    """추출 페이지 상단 미리보기 (전체 결과 반영 전까지)."""
+    st.info(
+        f"미리보기: 전체 {preview['rows_total']:,}명 중 {preview['rows_sampled']:,}명 층화 표본 기준 추정치입니다. "
+        "전체 스코어링이 끝나면 정확한 결과로 자동 교체됩니다."
+    )
+
+    est = preview["tier_estimates"]
+    cols = st.columns(len(est))
+    for col, r in zip(cols, est.itertuples(index=False)):
+        col.metric(f"{r.risk_tier} · {r.risk_group}", f"~{r.est_count:,}명", f"95% CI {r.ci_low:,}–{r.ci_high:,}", delta_color="off")
+
+    st.markdown("<div class='cs-section-title'>표본 내 상위 고객</div>", unsafe_allow_html=True)
+    st.dataframe(preview["top_customers"], use_container_width=True, hide_index=True)
@@ -0,0 +1,236 @@
+# modules/rule_strategy.py
+"""
+로컬 규칙 기반 전략 엔진 (LLM 대체/보조).
+
+LLM 프롬프트와 같은 UI JSON(strategy_cards / channel_table / message_examples)을
+고객 필드 몇 개로 결정적으로 만듦 -> 네트워크 없이 고객당 수 µs.
+  - 티어(risk_tier) + 신호 3개(불만 / 이용 감소 / 낮은 반응) + 상위 카드 등급
+    -> 조합 코드(최대 64개)로 요약하고, 코드별 전략은 1회만 구성해 캐시(lru_cache)
+  - rule_codes(df)는 벡터 연산으로 코드만 계산 -> 수백만 명 일괄 생성도 코드 take로 처리
+LLM이 예산 시간 안에 응답하지 않거나 실패하면 전략 페이지가 자동으로 이 엔진을 사용 (modules.marketing_strategy).
+결과 dict의 "engine"으로 생성 엔진을 구분.
+"""
+from functools import lru_cache
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+ENGINE_RULES = "rules"
+ENGINE_LLM = "llm"
+
+# 신호 기준
+COMPLAINT_MIN = 2            # 최근 6개월 불만 건수
+SPEND_DROP_RATIO = 0.7       # 최근 3개월 / 과거 3개월 이용금액
+LOW_OPEN_RATE = 0.15         # 마케팅 열람률
+PREMIUM_GRADES = {"gold", "platinum"}
+
+TIERS = ["Tier 1", "Tier 2", "Tier 3", "Tier 4"]
+CHANNELS = ["Push", "SMS", "Email", "In-app"]
+
+# 신호 비트 (코드 하위 3비트)
+COMPLAINT, SPEND_DROP, LOW_ENGAGEMENT = 4, 2, 1
+
+# 티어별 목표 KPI (이탈률 감소 %, 반응률 %) - 과장 없는 보수적 범위
+_TIER_KPI = {
+    "Tier 1": (15, 20),
+    "Tier 2": (12, 18),
+    "Tier 3": (8, 15),
+    "Tier 4": (5, 10),
+}
+_TIER_OFFER = {
+    "Tier 1": ("즉시 리텐션 오퍼", "이탈 직전 고객에게 7일 한정 캐시백과 연회비 혜택을 함께 제시", "캐시백 한도 상향 제안"),
+    "Tier 2": ("맞춤 혜택 제안", "주 이용 업종 중심 할인으로 이용 동기를 회복", "주 이용 업종 추가 적립"),
+    "Tier 3": ("가벼운 리워드", "포인트 추가 적립으로 관계를 유지하며 비용은 최소화", "포인트 2배 적립 이벤트"),
+    "Tier 4": ("관계 유지 혜택", "정기 혜택 안내로 만족도를 유지", "월간 혜택 큐레이션"),
+}
+
+
+# =========================
+# Signals -> code
+# =========================
+def _num(fields: Mapping, key: str) -> float:
+    v = fields.get(key)
+    try:
+        v = float(v)
+    except (TypeError, ValueError):
+        return 0.0
+    return 0.0 if np.isnan(v) else v
+
+
+def _spend_change(fields: Mapping) -> float:
+    """spent_change_ratio가 있으면 사용, 없으면 월별 이용금액으로 계산 (ai_lib.prepare_frame과 같은 식)."""
+    if fields.get("spent_change_ratio") is not None:
+        return _num(fields, "spent_change_ratio")
+    recent = sum(_num(fields, f"spent_m{i}") for i in (1, 2, 3))
+    past = sum(_num(fields, f"spent_m{i}") for i in (4, 5, 6))
+    return recent / (past + 1.0)
+
+
+def rule_code(fields: Mapping) -> int:
+    """고객 1명(dict/Series) -> 조합 코드."""
+    tier = TIERS.index(fields.get("risk_tier")) if fields.get("risk_tier") in TIERS else len(TIERS) - 1
+    premium = str(fields.get("card_grade") or "").strip().lower() in PREMIUM_GRADES
+    bits = (
+        COMPLAINT * (_num(fields, "complaints_6m") >= COMPLAINT_MIN)
+        + SPEND_DROP * (_spend_change(fields) < SPEND_DROP_RATIO)
+        + LOW_ENGAGEMENT * (_num(fields, "marketing_open_rate_6m") < LOW_OPEN_RATE)
+    )
+    return ((tier * 2 + premium) << 3) + bits
+
+
+def _col(df: pd.DataFrame, col: str) -> np.ndarray:
+    if col not in df.columns:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[col], errors="coerce").fillna(0.0).to_numpy(dtype=float)
+
+
+def rule_codes(df: pd.DataFrame) -> np.ndarray:
+    """rule_code의 벡터화 버전 (예측 결과 + 원본 속성이 붙은 DataFrame)."""
+    tier = pd.Categorical(df["risk_tier"], categories=TIERS).codes.astype(np.int64)
+    tier = np.where(tier < 0, len(TIERS) - 1, tier)
+    if "card_grade" in df.columns:
+        premium = df["card_grade"].astype(str).str.strip().str.lower().isin(PREMIUM_GRADES).to_numpy()
+    else:
+        premium = np.zeros(len(df), dtype=bool)
+
+    if "spent_change_ratio" in df.columns:
+        change = _col(df, "spent_change_ratio")
+    else:
+        recent = sum(_col(df, f"spent_m{i}") for i in (1, 2, 3))
+        past = sum(_col(df, f"spent_m{i}") for i in (4, 5, 6))
+        change = recent / (past + 1.0)
+
+    bits = (
+        COMPLAINT * (_col(df, "complaints_6m") >= COMPLAINT_MIN)
+        + SPEND_DROP * (change < SPEND_DROP_RATIO)
+        + LOW_ENGAGEMENT * (_col(df, "marketing_open_rate_6m") < LOW_OPEN_RATE)
+    )
+    return ((tier * 2 + premium) << 3) + bits.astype(np.int64)
+
+
+# =========================
+# Code -> UI JSON
+# =========================
+def _cause_card(bits: int, tier: str) -> dict:
+    if bits & COMPLAINT:
+        headline, desc = "불만 해소 우선", "최근 불만 이력이 이탈의 직접 원인일 가능성이 높아 해결 경험을 먼저 제공"
+        bullets = ["불만 이력 확인 후 전담 상담 연결", "처리 결과 사후 안내", "사과 혜택은 소액·즉시 지급"]
+    elif bits & SPEND_DROP:
+        headline, desc = "이용 감소 원인 점검", "과거 대비 이용금액이 줄어 주 이용처가 다른 카드로 옮겨갔을 가능성"
+        bullets = ["감소 업종 파악", "경쟁 카드 대비 혜택 비교 안내", "주 이용 업종 혜택 재설계"]
+    elif bits & LOW_ENGAGEMENT:
+        headline, desc = "소통 채널 재정비", "마케팅 열람률이 낮아 기존 채널로는 메시지가 닿지 않음"
+        bullets = ["열람 이력 있는 채널로 전환", "발송 빈도 축소", "제목/첫 문장 개인화"]
+    else:
+        headline, desc = "위험 신호 모니터링", "뚜렷한 단일 원인은 없으나 모델 점수 기준 이탈 위험 관리 필요"
+        bullets = ["월별 이용 추이 모니터링", "만족도 간단 설문", "이상 징후 시 우선 대응"]
+    churn_down, _ = _TIER_KPI[tier]
+    return {
+        "title": "추천 전략 01 - 이탈 원인 분석",
+        "headline": headline,
+        "desc": desc,
+        "bullets": bullets,
+        "kpi_left_label": "이탈률",
+        "kpi_left_value": churn_down,
+        "kpi_left_direction": "down",
+        "kpi_right_label": "불만 재발" if bits & COMPLAINT else "이용 회복",
+        "kpi_right_value": 30 if bits & COMPLAINT else 10,
+        "kpi_right_direction": "down" if bits & COMPLAINT else "up",
+    }
+
+
+def _offer_card(tier: str, premium: bool) -> dict:
+    headline, desc, first = _TIER_OFFER[tier]
+    bullets = [first, "유효기간 명확화", "혜택 사용 시 추가 적립"]
+    if premium:
+        bullets.insert(1, "상위 등급 전용 라운지/연회비 혜택 강조")
+    churn_down, response = _TIER_KPI[tier]
+    return {
+        "title": "추천 전략 02 - 혜택/오퍼",
+        "headline": headline,
+        "desc": desc,
+        "bullets": bullets[:4],
+        "kpi_left_label": "이탈률",
+        "kpi_left_value": churn_down,
+        "kpi_left_direction": "down",
+        "kpi_right_label": "반응률",
+        "kpi_right_value": response,
+        "kpi_right_direction": "up",
+    }
+
+
+def _reactivation_card(bits: int, tier: str) -> dict:
+    if bits & SPEND_DROP:
+        headline, desc = "이용 리마인드", "예전 이용 패턴을 기준으로 재이용 계기를 만들어 이용금액 회복"
+        bullets = ["자주 쓰던 업종 재이용 쿠폰", "3회 이용 시 보너스 적립", "월말 잔여 혜택 알림"]
+    elif bits & LOW_ENGAGEMENT:
+        headline, desc = "앱 재방문 유도", "열람이 적은 고객은 앱 안에서 바로 확인 가능한 혜택으로 접점 확보"
+        bullets = ["앱 전용 혜택 배너", "출석형 소액 리워드", "알림 동의 혜택"]
+    else:
+        headline, desc = "로열티 강화", "현재 이용을 유지하도록 누적형 혜택으로 관계를 장기화"
+        bullets = ["누적 이용 구간별 리워드", "기념일 혜택", "등급 상향 조건 안내"]
+    _, response = _TIER_KPI[tier]
+    return {
+        "title": "추천 전략 03 - 재활성화 유도",
+        "headline": headline,
+        "desc": desc,
+        "bullets": bullets,
+        "kpi_left_label": "이탈률",
+        "kpi_left_value": max(3, _TIER_KPI[tier][0] - 5),
+        "kpi_left_direction": "down",
+        "kpi_right_label": "재이용률",
+        "kpi_right_value": response,
+        "kpi_right_direction": "up",
+    }
+
+
+def _channel_table(bits: int, tier: str) -> list:
+    scores = {"Push": 4, "SMS": 4, "Email": 3, "In-app": 3}
+    points = {"Push": "혜택 + 긴급성", "SMS": "이탈 방지 혜택", "Email": "정보성 콘텐츠", "In-app": "행동 유도"}
+    reasons = {"Push": "즉각 반응", "SMS": "도달률 높음", "Email": "상세 안내", "In-app": "UX 연결"}
+    if tier in ("Tier 1", "Tier 2"):
+        scores["Push"] += 1
+        scores["SMS"] += 1
+    if bits & LOW_ENGAGEMENT:
+        scores["Email"] -= 1
+        scores["Push"] -= 1
+        reasons["SMS"] = "열람 낮은 고객도 확인"
+    if bits & COMPLAINT:
+        points["SMS"] = "상담 연결 안내"
+        scores["In-app"] += 1
+        reasons["In-app"] = "상담/처리 현황 확인"
+    return [
+        {"channel": c, "score": int(min(5, max(1, scores[c]))), "message_point": points[c], "reason": reasons[c]}
+        for c in CHANNELS
+    ]
+
+
+def _messages(bits: int, tier: str) -> list:
+    _, _, offer = _TIER_OFFER[tier]
+    out = [{"channel": "SMS" if bits & LOW_ENGAGEMENT else "Push", "text": f"고객님께만 드리는 {offer} 혜택, 이번 주까지 확인해 보세요."}]
+    if bits & COMPLAINT:
+        out.append({"channel": "SMS", "text": "불편을 드려 죄송합니다. 전담 상담사가 먼저 연락드리고 처리 결과를 안내해 드릴게요."})
+    if bits & SPEND_DROP:
+        out.append({"channel": "In-app", "text": "자주 이용하시던 업종에서 다시 쓰시면 추가 적립을 드려요."})
+    out.append({"channel": "Email", "text": "최근 이용이 줄어 맞춤 혜택을 준비했어요. 한 번에 확인할 수 있게 정리해 드립니다."})
+    return out[:4]
+
+
+@lru_cache(maxsize=None)
+def strategy_for_code(code: int) -> dict:
+    """조합 코드 -> UI JSON (코드당 1회 구성 후 캐시, 반환값은 수정하지 말 것)."""
+    tier = TIERS[(code >> 4) % len(TIERS)]
+    premium = bool((code >> 3) & 1)
+    bits = code & 7
+    return {
+        "strategy_cards": [_cause_card(bits, tier), _offer_card(tier, premium), _reactivation_card(bits, tier)],
+        "channel_table": _channel_table(bits, tier),
+        "message_examples": _messages(bits, tier),
+        "engine": ENGINE_RULES,
+    }
+
+
+def rule_strategy(fields: Mapping) -> dict:
+    """고객 1명 규칙 기반 전략. fields: _select_customer_fields 결과 또는 세그먼트 행(Series)."""
+    return strategy_for_code(rule_code(fields))
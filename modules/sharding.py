@@ -0,0 +1,14 @@
+# modules/sharding.py
+"""
+customer_id 해시 분할 (클러스터 샤드, 점수 이력 버킷 공용).
+
+- 고정 키 해시(pandas hash_pandas_object)라 실행/호스트/프로세스가 달라도 같은 고객은 같은 번호
+"""
+import numpy as np
+import pandas as pd
+
+
+def shard_of(ids: pd.Series, n_shards: int) -> np.ndarray:
+    """customer_id -> 샤드 번호 (고정 키 해시라 실행/호스트가 달라도 같은 값)."""
+    h = pd.util.hash_pandas_object(ids.astype(str), index=False).to_numpy()
+    return (h % np.uint64(n_shards)).astype(np.int64)
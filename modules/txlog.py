@@ -0,0 +1,311 @@
+# modules/txlog.py
+"""
+long 형식 거래/이벤트 로그 -> 월별 wide 피처 집계.
+
+    python -m modules.txlog --logs data/logs --as-of 2026-10-01 --attributes data/customers.csv \
+        --output data/features.parquet --workers 4 [--score data/scored.csv]
+
+로그 컬럼: customer_id, date, amount, type
+  - type이 TXN_TYPES  -> spent_m{k} += amount, txn_m{k} += 1
+  - type이 LOGIN_TYPES -> login_m{k} += 1
+  - k = as_of 기준 몇 달 전인지 (as_of가 속한 달은 미완료 -> 제외, 직전 달이 m1), 1..MONTHS 밖은 버림
+
+- 파일을 chunk(record batch) 단위로 스트리밍, chunk마다 (고객, 슬롯) groupby 한 번으로 부분 집계
+- 부분 집계(LogAggregator)는 고객 x 18 컬럼 합계라 merge 가능 -> 파일별 프로세스 병렬 후 합침
+- 결과에 recent_3m_spent / past_3m_spent / spent_change_ratio / total_*_6m 포함
+  (age/region 등 고객 속성은 로그에 없으므로 --attributes 파일과 customer_id로 결합)
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from modules.inference import predict_and_build
+from modules.ingest import HAS_PYARROW, clean_column_name, pa, pacsv, pq, read_table
+
+MONTHS = 6
+LOG_CHUNK_ROWS = 2_000_000
+# 부분 집계 목록이 이 행 수를 넘으면 한 번 합쳐서 메모리 유지
+COMPACT_ROWS = 5_000_000
+
+TXN_TYPES = ("purchase", "payment", "txn")
+LOGIN_TYPES = ("login",)
+
+LOG_EXTS = (".csv", ".parquet")
+
+SPENT_COLS = [f"spent_m{m}" for m in range(1, MONTHS + 1)]
+TXN_COLS = [f"txn_m{m}" for m in range(1, MONTHS + 1)]
+LOGIN_COLS = [f"login_m{m}" for m in range(1, MONTHS + 1)]
+FEATURE_COLS = SPENT_COLS + TXN_COLS + LOGIN_COLS
+
+
+def _month_number(d) -> int:
+    return int(d.year) * 12 + int(d.month) - 1
+
+
+def _months_back(dates: pd.Series, as_of_month: int):
+    """as_of 기준 몇 달 전인지 + 파싱 불가 여부. 날짜 문자열은 고유값만 파싱."""
+    codes, uniques = pd.factorize(dates, sort=False)
+    parsed = pd.to_datetime(pd.Index(uniques).astype(str), errors="coerce")
+    month = parsed.year.to_numpy(dtype=float) * 12 + parsed.month.to_numpy(dtype=float) - 1
+    unparsed = np.append(np.isnan(month), True)      # 마지막 칸 = 결측(code -1)
+    back = np.append(as_of_month - np.nan_to_num(month, nan=0.0), 0).astype(np.int64)
+    return back[codes], unparsed[codes]
+
+
+class LogAggregator:
+    """
+    고객별 월 슬롯 합계 누적기.
+    update(chunk)로 부분 집계를 쌓고, merge로 다른 누적기(다른 파일/워커)를 합침.
+    """
+
+    def __init__(
+        self,
+        as_of,
+        id_col: str = "customer_id",
+        date_col: str = "date",
+        amount_col: str = "amount",
+        type_col: str = "type",
+        txn_types: Sequence[str] = TXN_TYPES,
+        login_types: Sequence[str] = LOGIN_TYPES,
+    ):
+        self.as_of = pd.Timestamp(as_of)
+        self.as_of_month = _month_number(self.as_of)
+        self.id_col, self.date_col, self.amount_col, self.type_col = id_col, date_col, amount_col, type_col
+        self.txn_types = list(txn_types)
+        self.login_types = list(login_types)
+        self.rows_read = 0
+        self.rows_used = 0
+        self.rows_invalid = 0
+        self._parts: List[pd.DataFrame] = []
+        self._part_rows = 0
+
+    @property
+    def columns(self) -> List[str]:
+        return [self.id_col, self.date_col, self.amount_col, self.type_col]
+
+    def update(self, chunk: pd.DataFrame):
+        n = len(chunk)
+        self.rows_read += n
+        if n == 0:
+            return
+
+        back, unparsed = _months_back(chunk[self.date_col], self.as_of_month)
+        # 이벤트 유형도 고유값만 정규화: 0 = 거래, 1 = 로그인, -1 = 집계 대상 아님
+        t_codes, t_uniques = pd.factorize(chunk[self.type_col], sort=False)
+        types = pd.Index(t_uniques).astype(str).str.strip().str.lower()
+        kind_u = np.select([types.isin(self.txn_types), types.isin(self.login_types)], [0, 1], -1)
+        kind = np.append(kind_u, -1)[t_codes]
+        amount = pd.to_numeric(chunk[self.amount_col], errors="coerce").to_numpy(dtype=float)
+
+        invalid = unparsed | ((kind == 0) & np.isnan(amount))
+        self.rows_invalid += int(invalid.sum())
+        keep = ~invalid & (back >= 1) & (back <= MONTHS) & (kind >= 0)
+        if not keep.any():
+            return
+        self.rows_used += int(keep.sum())
+
+        # 슬롯: 0..5 = 거래월 m1..m6, 6..11 = 로그인월 m1..m6
+        frame = pd.DataFrame({
+            "cid": chunk[self.id_col].astype(str).to_numpy()[keep],
+            "slot": kind[keep] * MONTHS + back[keep] - 1,
+            "amount": np.nan_to_num(amount[keep], nan=0.0),
+        })
+        g = frame.groupby(["cid", "slot"], sort=False)["amount"].agg(["sum", "size"])
+        sums = g["sum"].unstack(fill_value=0.0).reindex(columns=range(2 * MONTHS), fill_value=0.0)
+        counts = g["size"].unstack(fill_value=0).reindex(columns=range(2 * MONTHS), fill_value=0)
+
+        part = pd.DataFrame(
+            np.hstack([
+                sums.to_numpy()[:, :MONTHS],
+                counts.to_numpy()[:, :MONTHS],
+                counts.to_numpy()[:, MONTHS:],
+            ]).astype(float),
+            index=sums.index,
+            columns=FEATURE_COLS,
+        )
+        self._add(part)
+
+    def _add(self, part: pd.DataFrame):
+        self._parts.append(part)
+        self._part_rows += len(part)
+        if self._part_rows > COMPACT_ROWS and len(self._parts) > 1:
+            self._compact()
+
+    def _compact(self):
+        if len(self._parts) > 1:
+            merged = pd.concat(self._parts).groupby(level=0, sort=False).sum()
+            self._parts = [merged]
+            self._part_rows = len(merged)
+
+    def merge(self, other: "LogAggregator") -> "LogAggregator":
+        if other.as_of_month != self.as_of_month:
+            raise ValueError("as_of 월이 다른 누적기는 합칠 수 없습니다.")
+        self.rows_read += other.rows_read
+        self.rows_used += other.rows_used
+        self.rows_invalid += other.rows_invalid
+        for part in other._parts:
+            self._add(part)
+        return self
+
+    def to_frame(self) -> pd.DataFrame:
+        """고객별 wide 피처 (customer_id + 월별 18컬럼 + 파생변수)."""
+        self._compact()
+        wide = self._parts[0] if self._parts else pd.DataFrame(columns=FEATURE_COLS, dtype=float)
+        wide = wide.rename_axis(self.id_col).reset_index()
+
+        wide["total_spent_6m"] = wide[SPENT_COLS].sum(axis=1)
+        wide["total_txn_6m"] = wide[TXN_COLS].sum(axis=1)
+        wide["total_login_6m"] = wide[LOGIN_COLS].sum(axis=1)
+        # ai_lib.prepare_frame과 같은 정의
+        wide["recent_3m_spent"] = wide[SPENT_COLS[:3]].sum(axis=1)
+        wide["past_3m_spent"] = wide[SPENT_COLS[3:]].sum(axis=1)
+        wide["spent_change_ratio"] = wide["recent_3m_spent"] / (wide["past_3m_spent"] + 1.0)
+        return wide
+
+
+# =========================
+# Streaming readers
+# =========================
+def _iter_csv(path: str, columns: List[str], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if HAS_PYARROW:
+        with open(path, "rb") as f:
+            header = f.readline().decode("utf-8-sig", errors="replace").rstrip("\r\n").split(",")
+        names = [clean_column_name(h) for h in header]
+        # 문자열/날짜는 dictionary로 읽어 반복값 변환 비용을 줄임 (날짜 파싱도 고유값만)
+        reader = pacsv.open_csv(
+            path,
+            read_options=pacsv.ReadOptions(column_names=names, skip_rows=1, block_size=64 << 20),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=columns,
+                column_types={
+                    columns[0]: pa.string(),
+                    columns[1]: pa.dictionary(pa.int32(), pa.string()),
+                    columns[3]: pa.dictionary(pa.int32(), pa.string()),
+                },
+            ),
+        )
+        for batch in reader:
+            yield batch.to_pandas()
+        return
+
+    for chunk in pd.read_csv(path, usecols=lambda c: clean_column_name(c) in columns, dtype=str, chunksize=chunk_rows):
+        chunk.columns = [clean_column_name(c) for c in chunk.columns]
+        yield chunk
+
+
+def _iter_parquet(path: str, columns: List[str], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if not HAS_PYARROW:
+        raise ValueError("Parquet 파일을 읽으려면 pyarrow가 필요합니다. (pip install pyarrow)")
+    f = pq.ParquetFile(path)
+    raw = {clean_column_name(n): n for n in f.schema_arrow.names}
+    missing = [c for c in columns if c not in raw]
+    if missing:
+        raise ValueError(f"로그 파일 {path}에 필요한 컬럼이 없습니다: {missing}")
+    for batch in f.iter_batches(batch_size=chunk_rows, columns=[raw[c] for c in columns]):
+        chunk = batch.to_pandas()
+        chunk.columns = columns
+        yield chunk
+
+
+def iter_log_chunks(path: str, columns: List[str], chunk_rows: int = LOG_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    if path.lower().endswith(".parquet"):
+        return _iter_parquet(path, columns, chunk_rows)
+    return _iter_csv(path, columns, chunk_rows)
+
+
+def _log_files(paths: Iterable[str]) -> List[str]:
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            for root, _, names in os.walk(p):
+                files += [os.path.join(root, n) for n in names if n.lower().endswith(LOG_EXTS)]
+        else:
+            files.append(p)
+    return sorted(files)
+
+
+def aggregate_file(path: str, as_of, **kwargs) -> LogAggregator:
+    """로그 파일 1개를 스트리밍 집계 (워커 프로세스 단위)."""
+    acc = LogAggregator(as_of, **kwargs)
+    for chunk in iter_log_chunks(path, acc.columns):
+        acc.update(chunk)
+    acc._compact()
+    return acc
+
+
+def aggregate_logs(paths: Iterable[str], as_of, workers: int = 1, **kwargs) -> LogAggregator:
+    """여러 로그 파일/디렉터리 -> 파일별 부분 집계를 병렬로 만든 뒤 merge."""
+    files = _log_files(paths)
+    if not files:
+        raise ValueError("집계할 로그 파일이 없습니다.")
+
+    total = LogAggregator(as_of, **kwargs)
+    if workers <= 1:
+        for path in files:
+            total.merge(aggregate_file(path, as_of, **kwargs))
+        return total
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futures = [ex.submit(aggregate_file, path, as_of, **kwargs) for path in files]
+        for fut in futures:
+            total.merge(fut.result())
+    return total
+
+
+def build_features(
+    paths: Iterable[str],
+    as_of,
+    attributes: Optional[pd.DataFrame] = None,
+    id_col: str = "customer_id",
+    workers: int = 1,
+) -> pd.DataFrame:
+    """
+    로그 집계 결과에 고객 속성(age/region 등)을 결합한 스코어링 입력 (업로드 wide 형식).
+    속성 파일 고객 중 기간 내 로그가 없는 고객은 월별 값 0.
+    """
+    wide = aggregate_logs(paths, as_of, workers=workers, id_col=id_col).to_frame()
+    if attributes is None:
+        return wide
+
+    attrs = attributes.drop(columns=[c for c in attributes.columns if c in wide.columns and c != id_col])
+    attrs = attrs.assign(**{id_col: attrs[id_col].astype(str)})
+    out = attrs.merge(wide, on=id_col, how="outer")
+    out[FEATURE_COLS] = out[FEATURE_COLS].fillna(0.0)
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="long 형식 거래 로그 -> 월별 wide 피처")
+    parser.add_argument("--logs", nargs="+", required=True, help="로그 파일 또는 디렉터리 (csv/parquet)")
+    parser.add_argument("--as-of", default=date.today().isoformat(), help="기준일 (이 날짜가 속한 달의 직전 달이 m1)")
+    parser.add_argument("--attributes", default=None, help="고객 속성 파일 (업로드와 같은 형식, 월별 컬럼은 무시)")
+    parser.add_argument("--output", required=True, help="피처 출력 경로 (.csv/.parquet)")
+    parser.add_argument("--id-col", default="customer_id")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--score", default=None, help="지정하면 피처로 바로 스코어링해 CSV로 저장")
+    args = parser.parse_args(argv)
+
+    attributes = read_table(args.attributes, id_col=args.id_col) if args.attributes else None
+    features = build_features(args.logs, args.as_of, attributes=attributes, id_col=args.id_col, workers=args.workers)
+
+    tmp = args.output + ".tmp"
+    if args.output.lower().endswith(".parquet"):
+        features.to_parquet(tmp, index=False)
+    else:
+        features.to_csv(tmp, index=False)
+    os.replace(tmp, args.output)
+    print(f"customers={len(features):,} -> {args.output}")
+
+    if args.score:
+        out = predict_and_build(features, id_col=args.id_col)
+        out.to_csv(args.score, index=False)
+        print(f"scored={len(out):,} -> {args.score}")
+
+
+if __name__ == "__main__":
+    main()
@@ -261,6 +261,7 @@ def topbar(active: str):
     nav_html = (
         nav_link("data", "데이터 입력")
         + nav_link("extract", "이탈가능 고객 추출")
+        + nav_link("dashboard", "포트폴리오 요약")
         + nav_link("strategy", "마케팅 전략")
     )
 
@@ -0,0 +1,161 @@
+# modules/validation.py
+"""
+업로드 행 단위 검증 + 격리(quarantine).
+
+한 번의 컬럼별 벡터 연산으로
+  - customer_id 누락/중복
+  - 수치 컬럼 타입(숫자로 해석 불가) / 범위
+  - 학습 때 없던 범주 값
+  - 결측 -> 0 / UNKNOWN 보정 건수 (preprocess_data가 조용히 채우는 값)
+를 확인. 격리 사유가 있는 행만 빼고 나머지는 그대로 스코어링하고,
+격리 행은 원본 값 + 행 번호 + 사유 코드(; 구분)로 따로 내려받게 함.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import CategoricalDtype, is_numeric_dtype
+
+from modules.ai_lib import CORE_CATEGORICAL_FEATURES
+
+# 수치 컬럼 허용 범위 (하한, 상한). None = 제한 없음
+RANGE_RULES: Dict[str, Tuple[Optional[float], Optional[float]]] = {
+    "age": (0, 120),
+    "tenure_months": (0, 600),
+    "complaints_6m": (0, None),
+    "marketing_open_rate_6m": (0, 1),
+    **{f"spent_m{i}": (0, None) for i in range(1, 7)},
+    **{f"txn_m{i}": (0, None) for i in range(1, 4)},
+    **{f"login_m{i}": (0, None) for i in range(1, 4)},
+}
+
+# 사유 코드 (컬럼별 코드는 "<코드>:<컬럼>")
+MISSING_ID = "MISSING_ID"
+DUPLICATE_ID = "DUPLICATE_ID"
+NON_NUMERIC = "NON_NUMERIC"
+OUT_OF_RANGE = "OUT_OF_RANGE"
+UNKNOWN_CATEGORY = "UNKNOWN_CATEGORY"
+# 보정(격리 아님) 코드
+MISSING_COLUMN = "MISSING_COLUMN"
+ZERO_FILLED = "ZERO_FILLED"
+UNKNOWN_FILLED = "UNKNOWN_FILLED"
+
+ACTION_LABELS = {
+    "quarantine": "격리",
+    "filled": "기본값 보정",
+    "warn": "경고(스코어링 포함)",
+}
+
+
+def _as_text(s: pd.Series) -> pd.Series:
+    # category는 범주 값만 문자열로 바꾸면 됨 (행 단위 변환 생략)
+    if isinstance(s.dtype, CategoricalDtype):
+        return s.cat.rename_categories(s.cat.categories.astype(str))
+    return s.astype(str)
+
+
+def _absent(s: pd.Series) -> np.ndarray:
+    """결측 또는 공백 문자열."""
+    # to_numpy()는 copy-on-write에서 읽기 전용일 수 있으므로 in-place 연산 대신 새 배열로
+    absent = s.isna().to_numpy()
+    if not is_numeric_dtype(s):
+        absent = np.logical_or(absent, (_as_text(s).str.strip() == "").to_numpy())
+    return absent
+
+
+def validate(
+    df_raw: pd.DataFrame,
+    id_col: str = "customer_id",
+    categories: Optional[Dict[str, List[str]]] = None,
+    reject_unknown_categories: bool = False,
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    반환: (정상 행 df, 격리 행 df, 사유별 집계 df)
+      - 격리 df: 원본 컬럼 + row_number(1부터, 헤더 제외) + reject_reasons
+      - 집계 df: code, column, rows, action
+    categories: 범주형 변수별 학습 값 목록 (ai_lib.category_levels). 없으면 범주 검사 생략.
+    reject_unknown_categories=False면 처음 보는 범주는 경고만 (모델 입력에서는 전부 0)
+    """
+    n = len(df_raw)
+    reject = np.zeros(n, dtype=bool)
+    masks: Dict[str, np.ndarray] = {}   # 격리 사유 코드 -> 해당 행 (적중이 있는 검사만 보관)
+    rows: List[dict] = []
+
+    def _record(code: str, column: Optional[str], mask_or_count, action: str):
+        count = int(mask_or_count.sum()) if isinstance(mask_or_count, np.ndarray) else int(mask_or_count)
+        if count == 0:
+            return
+        rows.append({"code": code, "column": column or "", "rows": count, "action": ACTION_LABELS[action]})
+        if action == "quarantine":
+            key = f"{code}:{column}" if column else code
+            masks[key] = mask_or_count
+            reject[:] |= mask_or_count
+
+    # ID
+    missing_id = _absent(df_raw[id_col])
+    ids = df_raw[id_col].astype(str).str.strip()
+    _record(MISSING_ID, None, missing_id, "quarantine")
+    _record(DUPLICATE_ID, None, ids.duplicated(keep="first").to_numpy() & ~missing_id, "quarantine")
+
+    # 수치 컬럼: 타입 / 범위 / 결측 보정
+    for c, (lo, hi) in RANGE_RULES.items():
+        if c not in df_raw.columns:
+            _record(MISSING_COLUMN, c, n, "filled")
+            continue
+        s = df_raw[c]
+        absent = _absent(s)
+        v = (s if is_numeric_dtype(s) else pd.to_numeric(s, errors="coerce")).to_numpy(dtype=float)
+        nan = np.isnan(v)
+
+        _record(ZERO_FILLED, c, absent, "filled")
+        _record(NON_NUMERIC, c, nan & ~absent, "quarantine")
+
+        bad = np.isinf(v)
+        if lo is not None:
+            bad |= v < lo
+        if hi is not None:
+            bad |= v > hi
+        _record(OUT_OF_RANGE, c, bad, "quarantine")
+
+    # 범주 컬럼: 결측 보정 / 처음 보는 값
+    for c in CORE_CATEGORICAL_FEATURES:
+        if c not in df_raw.columns:
+            _record(MISSING_COLUMN, c, n, "filled")
+            continue
+        s = df_raw[c]
+        absent = _absent(s)
+        _record(UNKNOWN_FILLED, c, absent, "filled")
+
+        levels = (categories or {}).get(c)
+        if levels:
+            unknown = ~_as_text(s).isin(levels).to_numpy() & ~absent
+            _record(UNKNOWN_CATEGORY, c, unknown, "quarantine" if reject_unknown_categories else "warn")
+
+    report = pd.DataFrame(rows, columns=["code", "column", "rows", "action"])
+
+    if not reject.any():
+        return df_raw, df_raw.iloc[0:0].assign(row_number=[], reject_reasons=[]), report
+
+    # 격리 행만 사유 문자열 생성 (사유 코드별 벡터 연산)
+    rej = np.flatnonzero(reject)
+    reasons = pd.Series("", index=range(len(rej)), dtype=object)
+    for key, mask in masks.items():
+        reasons += np.where(mask[rej], key + ";", "")
+
+    quarantine = df_raw.iloc[rej].reset_index(drop=True)
+    quarantine["row_number"] = rej + 1
+    quarantine["reject_reasons"] = reasons.str.rstrip(";").to_numpy()
+
+    valid = df_raw[~reject].reset_index(drop=True)
+    return valid, quarantine, report
+
+
+def summarize(total: int, quarantine: pd.DataFrame, report: pd.DataFrame) -> Dict[str, int]:
+    """화면/배치 manifest용 요약 수치."""
+    filled = report.loc[report["action"] == ACTION_LABELS["filled"], "rows"]
+    return {
+        "total": int(total),
+        "valid": int(total - len(quarantine)),
+        "quarantined": int(len(quarantine)),
+        "filled_values": int(filled.sum()) if len(filled) else 0,
+    }
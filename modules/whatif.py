@@ -0,0 +1,172 @@
+# modules/whatif.py
+"""
+선택 고객 what-if 시뮬레이터 (전략 페이지).
+
+"불만이 0건이 되거나 이용이 회복되면 이탈 위험이 얼마나 내려가나?"를 CSV 수정/재업로드 없이 확인.
+고객 원본 행 1개를 복제해
+  - 현재 / 조합 시나리오(움직인 슬라이더 값을 함께 적용) 각 1행
+  - 레버별 단독 변화 grid (나머지는 현재 값 유지)
+를 한 DataFrame으로 만든 뒤 전처리 + 예측을 한 번에 수행 (modules.inference.score_rows).
+수십~백여 행이라 예측 1회가 수 ms -> 슬라이더를 움직일 때마다 다시 계산해도 즉시 반영.
+
+레버
+  - complaints_6m, marketing_open_rate_6m: 값 자체를 변경
+  - spent/txn/login: 최근 3개월(m1~m3)을 기준 수준(과거 3개월 m4~m6 평균, 없으면 최근 평균) 대비 배율로 설정
+"""
+import time
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from modules.inference import score_rows
+
+RECENT_MONTHS = (1, 2, 3)
+PAST_MONTHS = (4, 5, 6)
+RECENT_LEVERS = {"spent": "이용금액", "txn": "이용건수", "login": "접속수"}
+LEVERS = {
+    "complaints_6m": "불만 건수(6개월)",
+    "marketing_open_rate_6m": "마케팅 열람률(6개월)",
+    **{k: f"최근 3개월 {v} (기준 대비 배율)" for k, v in RECENT_LEVERS.items()},
+}
+OPEN_RATE_GRID = np.round(np.linspace(0.0, 1.0, 21), 2)
+RATIO_GRID = np.round(np.linspace(0.0, 1.5, 16), 2)
+COMPLAINTS_MIN_MAX = 5
+
+
+def _num(row: pd.DataFrame, col: str) -> float:
+    if col not in row.columns:
+        return 0.0
+    v = pd.to_numeric(row[col], errors="coerce").iat[0]
+    return 0.0 if pd.isna(v) else float(v)
+
+
+def _reference(row: pd.DataFrame, lever: str) -> Tuple[float, float]:
+    """(기준 월평균, 현재 최근 3개월 월평균). 과거 3개월이 0이면 최근 평균을 기준으로."""
+    recent = np.mean([_num(row, f"{lever}_m{i}") for i in RECENT_MONTHS])
+    past = np.mean([_num(row, f"{lever}_m{i}") for i in PAST_MONTHS])
+    return (past if past > 0 else recent), recent
+
+
+def current_values(row: pd.DataFrame) -> Dict[str, float]:
+    """레버별 현재 값 (recent 레버는 기준 대비 배율)."""
+    out = {
+        "complaints_6m": _num(row, "complaints_6m"),
+        "marketing_open_rate_6m": _num(row, "marketing_open_rate_6m"),
+    }
+    for lever in RECENT_LEVERS:
+        ref, recent = _reference(row, lever)
+        out[lever] = recent / ref if ref > 0 else 1.0
+    return out
+
+
+def lever_grids(current: Dict[str, float]) -> Dict[str, np.ndarray]:
+    top = int(max(COMPLAINTS_MIN_MAX, np.ceil(current["complaints_6m"])))
+    return {
+        "complaints_6m": np.arange(top + 1, dtype=float),
+        "marketing_open_rate_6m": OPEN_RATE_GRID,
+        **{k: RATIO_GRID for k in RECENT_LEVERS},
+    }
+
+
+def _apply(batch: pd.DataFrame, row: pd.DataFrame, lever: str, values: np.ndarray, mask: np.ndarray):
+    """mask 행에만 레버 값(행별 배열)을 벡터로 적용. 나머지 행은 원본 값 유지."""
+    if lever in RECENT_LEVERS:
+        ref, _ = _reference(row, lever)
+        targets = [(f"{lever}_m{i}", values * ref) for i in RECENT_MONTHS]
+    else:
+        targets = [(lever, values)]
+    for col, new in targets:
+        base = pd.to_numeric(batch[col], errors="coerce").to_numpy(dtype=float) if col in batch.columns else np.zeros(len(batch))
+        batch[col] = np.where(mask, new, base)
+
+
+def build_scenarios(row: pd.DataFrame, settings: Dict[str, float]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    row: 고객 원본 1행, settings: 조합 시나리오에서 바꿀 레버 값 (없는 레버는 현재 값 유지)
+    반환: (예측 입력 batch, 시나리오 메타[scenario, lever, value])
+      0행 = 현재, 1행 = 조합, 이후 = 레버별 grid
+    """
+    grids = lever_grids(current_values(row))
+
+    meta = [("현재", None, np.nan), ("조합", None, np.nan)]
+    for lever, grid in grids.items():
+        meta += [("grid", lever, float(v)) for v in grid]
+    meta = pd.DataFrame(meta, columns=["scenario", "lever", "value"])
+
+    batch = row.iloc[np.zeros(len(meta), dtype=np.int64)].reset_index(drop=True)
+    for lever in LEVERS:
+        # 조합 행은 settings 값, grid 행은 해당 레버만 grid 값, 그 외는 원본 그대로
+        values = np.full(len(meta), np.nan)
+        values[1] = settings.get(lever, np.nan)
+        on = (meta["lever"] == lever).to_numpy()
+        values[on] = meta["value"].to_numpy()[on]
+        mask = ~np.isnan(values)
+        if mask.any():
+            _apply(batch, row, lever, values, mask)
+    return batch, meta
+
+
+def simulate(row: pd.DataFrame, settings: Dict[str, float], id_col: str = "customer_id") -> pd.DataFrame:
+    """시나리오 전체를 예측 1회로 계산 -> 메타 + churn_proba / risk_tier / delta(현재 대비)."""
+    batch, meta = build_scenarios(row, settings)
+    p, tiers = score_rows(batch, id_col=id_col)
+    meta["churn_proba"] = p
+    meta["risk_tier"] = tiers
+    meta["delta"] = p - p[0]
+    return meta
+
+
+# =========================
+# UI
+# =========================
+@st.fragment
+def render_whatif(row: pd.DataFrame, id_col: str = "customer_id"):
+    """선택 고객 what-if 패널. fragment라 슬라이더 변경 시 이 패널만 다시 실행."""
+    cid = str(row[id_col].iat[0])
+    current = current_values(row)
+    grids = lever_grids(current)
+
+    with st.expander("What-if 시뮬레이션 (조건 변화에 따른 이탈 확률)", expanded=False):
+        st.caption("최근 3개월 레버는 기준 수준(과거 3개월 평균) 대비 배율입니다. 1.0 = 예전 수준으로 회복.")
+        cols = st.columns(len(LEVERS))
+        settings = {}
+        for col, (lever, label) in zip(cols, LEVERS.items()):
+            step = 1.0 if lever == "complaints_6m" else 0.05
+            default = float(round(current[lever] / step) * step)
+            hi = float(max(grids[lever][-1], default))
+            value = col.slider(label, 0.0, hi, default, step, key=f"whatif_{lever}_{cid}")
+            # 움직인 레버만 조합 시나리오에 반영 (나머지는 원본 월별 값 그대로)
+            if value != default:
+                settings[lever] = value
+
+        t0 = time.perf_counter()
+        try:
+            result = simulate(row, settings, id_col=id_col)
+        except Exception as e:
+            st.error(f"시뮬레이션 오류: {e}")
+            return
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+
+        base, combo = result.iloc[0], result.iloc[1]
+        m1, m2, m3 = st.columns(3)
+        m1.metric("현재", f"{base['churn_proba']:.4f}", base["risk_tier"], delta_color="off")
+        m2.metric("조합 시나리오", f"{combo['churn_proba']:.4f}", f"{combo['delta']:+.4f}", delta_color="inverse")
+        m3.metric("티어 변화", f"{base['risk_tier']} → {combo['risk_tier']}")
+        st.caption(f"시나리오 {len(result)}건 일괄 예측 · {elapsed_ms:.0f} ms")
+
+        sweeps = result[result["scenario"] == "grid"]
+        tabs = st.tabs(list(LEVERS.values()))
+        for tab, lever in zip(tabs, LEVERS):
+            with tab:
+                s = sweeps[sweeps["lever"] == lever]
+                st.line_chart(s.set_index("value")[["churn_proba"]])
+                changes = s[s["risk_tier"] != base["risk_tier"]]
+                if len(changes):
+                    st.dataframe(
+                        changes[["value", "churn_proba", "risk_tier", "delta"]].round(4),
+                        use_container_width=True, hide_index=True,
+                    )
+                else:
+                    st.caption("이 범위에서는 티어가 바뀌지 않습니다.")
@@ -0,0 +1,44 @@
+import os
+import tempfile
+
+# 저장소 경로는 modules import 시점에 읽으므로 테스트 모듈 import 전에 임시 디렉터리로
+_STORE = tempfile.mkdtemp(prefix="churn_tests_")
+os.environ.setdefault("SCORE_HISTORY_DIR", os.path.join(_STORE, "score_history"))
+os.environ.setdefault("EXPORT_DIR", os.path.join(_STORE, "exports"))
+
+import pytest  # noqa: E402
+
+from benchmarks.synth import CARD_GRADES, GENDERS, INCOME_BANDS, REGIONS, make_customers  # noqa: E402
+from modules.ai_lib import CORE_CATEGORICAL_FEATURES, HIGH_IMPORTANCE_FEATURES, preprocess_data  # noqa: E402
+
+_LEVELS = {"gender": GENDERS, "region": REGIONS, "income_band": INCOME_BANDS, "card_grade": CARD_GRADES}
+
+
+class _Store:
+    def __init__(self, registry):
+        self._registry = registry
+
+    def current(self):
+        return self._registry
+
+
+@pytest.fixture(scope="session")
+def test_registry():
+    """합성 데이터로 학습한 작은 champion (배포 모델 파일 없이 스코어링 경로 전체를 실행하기 위함)."""
+    tree = pytest.importorskip("sklearn.tree")
+    features = HIGH_IMPORTANCE_FEATURES + [f"{c}_{v}" for c in CORE_CATEGORICAL_FEATURES for v in _LEVELS[c]]
+    train = make_customers(2_000, seed=42)
+    model = tree.DecisionTreeClassifier(max_depth=4, random_state=0)
+    model.fit(preprocess_data(train, model_features=features), train["churn"])
+    return [{
+        "name": "test", "version": "test-v1", "model": model,
+        "thresholds": {"T90": 0.08, "T95": 0.09, "T99": 0.1}, "features": features,
+    }]
+
+
+@pytest.fixture
+def scoring_model(monkeypatch, test_registry):
+    """load_registry()가 테스트 champion을 돌려주도록 모델 저장소를 교체."""
+    import modules.inference as inference
+    monkeypatch.setattr(inference, "get_model_store", lambda: _Store(test_registry))
+    return test_registry[0]
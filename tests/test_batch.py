@@ -0,0 +1,62 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import modules.batch as batch
+from benchmarks.synth import make_customers
+
+
+@pytest.fixture
+def dirs(tmp_path, monkeypatch, scoring_model):
+    # 워커 프로세스에는 테스트 모델이 없으므로 같은 프로세스의 스레드로 실행
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", ThreadPoolExecutor)
+    input_dir = tmp_path / "incoming"
+    (input_dir / "sub").mkdir(parents=True)
+    make_customers(300, seed=1).to_csv(input_dir / "a.csv", index=False)
+    make_customers(200, seed=2).to_parquet(input_dir / "a.parquet", index=False)
+    bad = make_customers(50, seed=3)
+    bad["age"] = 999
+    bad.loc[0, "age"] = 40
+    bad.to_csv(input_dir / "sub" / "b.csv", index=False)
+    broken = make_customers(10, seed=4)
+    broken["age"] = 999
+    broken.to_csv(input_dir / "sub" / "broken.csv", index=False)
+    # 출력 디렉터리가 입력 디렉터리 안에 있어도 다시 읽지 않음
+    return str(input_dir), str(input_dir / "scored")
+
+
+def _manifest(output_dir):
+    with open(os.path.join(output_dir, batch.MANIFEST_NAME), encoding="utf-8") as f:
+        return json.load(f)["partitions"]
+
+
+def test_batch_checkpoints_and_skips_unchanged(dirs):
+    input_dir, output_dir = dirs
+
+    assert batch.run_batch(input_dir, output_dir, workers=2) == {"scored": 3, "skipped": 0, "failed": 1}
+    parts = _manifest(output_dir)
+    assert parts["a.csv"]["output"] == "a.csv.scored.csv"
+    assert parts["a.parquet"]["output"] == "a.parquet.scored.csv"
+    assert parts[os.path.join("sub", "broken.csv")]["status"] == "failed"
+    assert len(pd.read_csv(os.path.join(output_dir, "a.csv.scored.csv"))) == 300
+    assert len(pd.read_csv(os.path.join(output_dir, "a.parquet.scored.csv"))) == 200
+    assert parts[os.path.join("sub", "b.csv")]["validation"]["quarantined"] == 49
+    assert os.path.exists(os.path.join(output_dir, "sub", "b.csv.quarantine.csv"))
+
+    # 두 번째 실행: 완료된 파티션은 건너뛰고 실패한 것만 재시도
+    assert batch.run_batch(input_dir, output_dir, workers=2) == {"scored": 0, "skipped": 3, "failed": 1}
+
+    # 내용이 바뀐 파티션만 재스코어링
+    make_customers(120, seed=9).to_csv(os.path.join(input_dir, "a.csv"), index=False)
+    assert batch.run_batch(input_dir, output_dir, workers=2) == {"scored": 1, "skipped": 2, "failed": 1}
+    assert _manifest(output_dir)["a.csv"]["rows"] == 120
+
+    assert batch.run_batch(input_dir, output_dir, workers=2, force=True)["scored"] == 3
+
+
+def test_missing_input_dir(tmp_path):
+    with pytest.raises(ValueError):
+        batch.run_batch(str(tmp_path / "nope"), str(tmp_path / "out"))
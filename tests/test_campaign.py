@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+from modules.campaign import DEFAULT_CHANNELS, _fill_budget, select_targets
+
+
+def _frames(rows):
+    df_pred = pd.DataFrame({
+        "customer_id": [r[0] for r in rows],
+        "churn_proba": [r[1] for r in rows],
+        "risk_tier": "Tier 1",
+        "risk_group": "즉시 이탈 위험",
+    })
+    df_raw = pd.DataFrame({"customer_id": [r[0] for r in rows], "total_spent_6m": [r[2] for r in rows]})
+    return df_pred, df_raw
+
+
+def test_high_value_customer_gets_call():
+    df_pred, df_raw = _frames([("A", 0.9, 50_000_000), ("B", 0.9, 5_000)])
+    out, summary = select_targets(df_pred, df_raw, budget=1_000_000, channels=DEFAULT_CHANNELS)
+    channel = dict(zip(out["customer_id"], out["campaign_channel"]))
+    assert channel["A"] == "Call"
+    assert channel["B"] != "Call"
+    assert summary["total_cost"] <= 1_000_000
+
+
+def test_budget_limits_upgrades():
+    # 예산이 Call 비용보다 작으면 고가치 고객도 싼 채널로 선정
+    df_pred, df_raw = _frames([("A", 0.9, 50_000_000)])
+    out, _ = select_targets(df_pred, df_raw, budget=100, channels=DEFAULT_CHANNELS)
+    assert out["campaign_channel"].tolist() == ["SMS"]
+    assert np.isclose(out["campaign_cost"].sum(), 20.0)
+
+
+def test_unprofitable_customers_excluded():
+    df_pred, df_raw = _frames([("A", 0.01, 10)])
+    out, summary = select_targets(df_pred, df_raw, budget=1_000_000, channels=DEFAULT_CHANNELS)
+    assert len(out) == 0
+    assert summary["selected"] == 0
+
+
+def test_expensive_upgrade_does_not_stop_filling():
+    # A의 Call 업그레이드(1,480원)는 남은 예산에 안 맞음 -> 건너뛰고 B 고객들로 예산을 계속 채움
+    rows = [("A", 0.9, 1e9)] + [(f"B{i}", 0.5, 1_000) for i in range(500)]
+    df_pred, df_raw = _frames(rows)
+    budget = 1_400
+    out, summary = select_targets(df_pred, df_raw, budget=budget, channels=DEFAULT_CHANNELS)
+    channel = dict(zip(out["customer_id"], out["campaign_channel"]))
+
+    assert channel["A"] == "SMS"
+    assert summary["total_cost"] <= budget
+    # 남은 후보 단계 중 가장 싼 것(B의 In-app -> Push 업그레이드, 4원)보다 잔액이 작아야 함
+    assert (out["campaign_channel"] == "In-app").any()
+    assert budget - summary["total_cost"] < 4
+
+
+def test_fill_budget_matches_sequential_greedy():
+    rng = np.random.default_rng(0)
+    d_cost = np.array([1.0, 4.0, 15.0, 1480.0])
+    n = 300
+    levels = rng.integers(1, len(d_cost) + 1, n)
+    ci = np.concatenate([np.full(k, i) for i, k in enumerate(levels)])
+    cj = np.concatenate([np.arange(k) for k in levels])
+    # 고객 안에서는 단계 순서를 유지하는 임의 순서
+    key = rng.random(len(ci)) + cj
+    order = np.argsort(key, kind="stable")
+    ci, cj = ci[order], cj[order]
+
+    for budget in [0.0, 3.0, 500.0, 2_000.0, 10_000.0, 1e9]:
+        expected, remaining, dead = [], budget, {}
+        for t, (i, j) in enumerate(zip(ci, cj)):
+            if j >= dead.get(i, len(d_cost)):
+                continue
+            if d_cost[j] <= remaining:
+                expected.append(t)
+                remaining -= d_cost[j]
+            else:
+                dead[i] = min(dead.get(i, len(d_cost)), j)
+        assert _fill_budget(ci, cj, d_cost, budget, n).tolist() == expected
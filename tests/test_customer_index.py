@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+from modules.customer_index import CustomerIndex
+
+
+def _index():
+    # 예측은 확률 내림차순 -> 중복 ID는 첫 행(최고 확률)이 대표
+    df_pred = pd.DataFrame({"customer_id": ["B2", "A1", "B2", "A10", 7], "churn_proba": [0.9, 0.8, 0.5, 0.4, 0.1]})
+    df_raw = pd.DataFrame({"customer_id": ["A1", "B2", "A1", "7"], "age": [30, 40, 50, 60]})
+    return CustomerIndex(df_pred, df_raw)
+
+
+def test_exact_lookup_uses_first_rows():
+    index = _index()
+    assert len(index) == 4
+    assert index.lookup("B2") == (0, 1)
+    assert index.lookup(" A1 ") == (1, 0)
+    assert index.lookup("7") == (4, 3)
+    # 원본에 없는 고객은 원본 위치 -1
+    assert index.lookup("A10") == (3, -1)
+    assert index.lookup("Z") is None
+
+
+def test_positions_and_prefix():
+    index = _index()
+    assert np.array_equal(index.pred_positions(["A10", "Z", "B2"]), [3, -1, 0])
+    assert index.prefix("A") == ["A1", "A10"]
+    assert index.prefix("A", limit=1) == ["A1"]
+    assert index.prefix("A1") == ["A1", "A10"]
+    assert index.prefix("") == []
+    assert index.prefix("C") == []
@@ -0,0 +1,36 @@
+import io
+
+import pandas as pd
+
+from benchmarks.synth import make_customers
+from modules.data_input import _score_job
+
+
+def _upload(df: pd.DataFrame) -> io.BytesIO:
+    buf = io.BytesIO(df.to_csv(index=False).encode("utf-8-sig"))
+    buf.name = "upload.csv"
+    return buf
+
+
+def test_score_job_smoke(scoring_model):
+    df = make_customers(3_000, seed=1)
+    df.loc[5, "age"] = 500                  # 범위 밖 -> 격리
+    df.loc[7, "gender"] = ""               # 빈 범주 -> 기본값 보정
+    stages, partials = [], []
+
+    result = _score_job(
+        _upload(df), "customer_id", "churn", False,
+        progress=lambda stage, pct: stages.append(stage), publish=partials.append,
+    )
+
+    out = result["df"]
+    assert len(out) == len(df) - 1
+    assert out["churn_proba"].is_monotonic_decreasing
+    assert set(out["risk_tier"]) <= {"Tier 1", "Tier 2", "Tier 3", "Tier 4"}
+    assert result["model_version"] == "test-v1"
+    assert result["validation_summary"]["quarantined"] == 1
+    assert result["quarantine_csv"].decode("utf-8-sig").count("OUT_OF_RANGE:age") == 1
+    assert result["evaluation"]["labeled"] == len(out)
+    assert result["history_run"]["rows"] == len(out)
+    assert result["customer_index"].lookup(out["customer_id"].iat[0])[0] == 0
+    assert "전처리·예측" in stages
@@ -0,0 +1,39 @@
+import os
+
+import joblib
+
+from benchmarks.synth import make_customers
+from modules.ai_lib import prepare_frame
+from modules.drift import DriftAccumulator, build_reference, compare, load_reference
+
+
+def test_same_distribution_is_stable_and_shift_is_flagged():
+    reference = build_reference(make_customers(5_000, seed=0))
+
+    same = DriftAccumulator.from_reference(reference)
+    same.update(prepare_frame(make_customers(5_000, seed=1)))
+    assert (compare(same, reference)["status"] == "안정").all()
+
+    shifted_raw = make_customers(5_000, seed=2)
+    shifted_raw["age"] = shifted_raw["age"] + 30
+    shifted = DriftAccumulator.from_reference(reference)
+    # chunk별 누적기를 merge해도 한 번에 누적한 것과 같음
+    half = len(shifted_raw) // 2
+    other = DriftAccumulator.from_reference(reference)
+    shifted.update(prepare_frame(shifted_raw.iloc[:half]))
+    other.update(prepare_frame(shifted_raw.iloc[half:]))
+    report = compare(shifted.merge(other), reference)
+    assert report.iloc[0]["feature"] == "age"
+    assert report.iloc[0]["status"] == "경고"
+
+
+def test_load_reference_picks_up_file_created_later(tmp_path):
+    path = str(tmp_path / "drift_reference.pkl")
+    assert load_reference(path) is None
+
+    joblib.dump({"rows": 1}, path)
+    assert load_reference(path) == {"rows": 1}
+
+    joblib.dump({"rows": 2}, path)
+    os.utime(path, (os.path.getmtime(path) + 10,) * 2)
+    assert load_reference(path) == {"rows": 2}
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.evaluation import EvalAccumulator
+
+THRESHOLDS = {"T99": 0.9, "T95": 0.7, "T90": 0.5}
+
+
+def _data(n=5_000, seed=0):
+    rng = np.random.default_rng(seed)
+    y = rng.integers(0, 2, n)
+    p = np.clip(rng.normal(0.35 + 0.3 * y, 0.2), 0, 1)
+    return pd.DataFrame({"churn": y}), p
+
+
+def test_chunked_merge_matches_single_pass():
+    metrics = pytest.importorskip("sklearn.metrics")
+    df, p = _data()
+    df.loc[:9, "churn"] = np.nan  # 라벨 없는 행은 평가에서 제외
+
+    whole = EvalAccumulator()
+    whole.update(df, p, THRESHOLDS)
+
+    merged = EvalAccumulator()
+    for lo in range(0, len(df), 1_500):
+        part = EvalAccumulator()
+        part.update(df.iloc[lo:lo + 1_500], p[lo:lo + 1_500], THRESHOLDS)
+        merged.merge(part)
+
+    a, b = whole.report(), merged.report()
+    assert a["labeled"] == b["labeled"] == len(df) - 10
+    assert a["unlabeled"] == b["unlabeled"] == 10
+    assert a["roc_auc"] == pytest.approx(b["roc_auc"])
+    pd.testing.assert_frame_equal(a["tiers"], b["tiers"])
+
+    y, q = df["churn"].to_numpy()[10:], p[10:]
+    assert a["roc_auc"] == pytest.approx(metrics.roc_auc_score(y, q), abs=1e-3)
+    assert a["pr_auc"] == pytest.approx(metrics.average_precision_score(y, q), abs=5e-3)
+    t99 = a["tiers"].set_index("threshold").loc["T99"]
+    assert t99["flagged"] == int((q >= 0.9).sum())
+    assert t99["recall"] == pytest.approx(((q >= 0.9) & (y == 1)).sum() / (y == 1).sum())
+
+
+def test_report_needs_both_classes():
+    acc = EvalAccumulator()
+    acc.update(pd.DataFrame({"churn": [1, 1]}), np.array([0.2, 0.8]), THRESHOLDS)
+    acc.update(pd.DataFrame({"other": [0]}), np.array([0.1]), THRESHOLDS)
+    assert acc.report() is None
+    assert acc.unlabeled == 1
+
+    with pytest.raises(ValueError):
+        acc.merge(EvalAccumulator(bins=10))
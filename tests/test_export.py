@@ -0,0 +1,109 @@
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.export import (
+    STRATEGY_COLUMNS, cleanup_exports, iter_segment_chunks, rule_strategy_frame, strategy_frame, write_export,
+    write_export_parts,
+)
+from modules.rule_strategy import rule_strategy
+
+
+def _frames():
+    # A: 신호 없음(Push) / B: 낮은 반응(SMS) / C: 불만 + 이용 감소(SMS 2개 + In-app)
+    df_pred = pd.DataFrame({
+        "customer_id": ["A", "B", "C", "D"],
+        "churn_proba": [0.99, 0.95, 0.9, 0.8],
+        "risk_tier": ["Tier 1", "Tier 1", "Tier 2", "Tier 2"],
+        "risk_group": "즉시 이탈 위험",
+    })
+    df_raw = pd.DataFrame({
+        "customer_id": ["A", "B", "C", "D"],
+        "complaints_6m": [0, 0, 3, 0],
+        "marketing_open_rate_6m": [0.5, 0.05, 0.05, 0.5],
+        "spent_change_ratio": [1.0, 1.0, 0.2, 1.0],
+        "card_grade": ["gold", "silver", "silver", "silver"],
+    })
+    return df_pred, df_raw
+
+
+def _expected_messages(df_raw, cid):
+    fields = df_raw.set_index("customer_id").loc[cid].to_dict()
+    fields["risk_tier"] = _frames()[0].set_index("customer_id").loc[cid, "risk_tier"]
+    return [(m["channel"], m["text"]) for m in rule_strategy(fields)["message_examples"]]
+
+
+def _messages(row):
+    out = []
+    for i in range(1, 5):
+        ch = row[f"message{i}_channel"]
+        if pd.notna(ch):
+            out.append((ch, row[f"message{i}_text"]))
+    return out
+
+
+def test_rule_strategy_frame_has_fixed_columns():
+    df_pred, df_raw = _frames()
+    out = rule_strategy_frame(df_pred.merge(df_raw, on="customer_id"))
+    assert list(out.columns) == ["customer_id"] + STRATEGY_COLUMNS
+    # 불만 고객은 SMS 메시지가 2개 -> 순서별 컬럼이라 덮어쓰지 않음
+    c = out[out["customer_id"] == "C"].iloc[0]
+    assert [ch for ch, _ in _messages(c)].count("SMS") == 2
+
+
+@pytest.mark.parametrize("ext", [".csv", ".parquet"])
+def test_multi_chunk_export_keeps_columns_aligned(tmp_path, ext):
+    if ext == ".parquet":
+        pytest.importorskip("pyarrow")
+    df_pred, df_raw = _frames()
+    llm = {
+        "strategy_cards": [{"title": "t", "headline": "h", "desc": "d", "bullets": ["x"]}],
+        "channel_table": [{"channel": "Email", "score": 5, "message_point": "p"}],
+        "message_examples": [{"channel": "Email", "text": "llm"}],
+    }
+    strategies = strategy_frame({"D|즉시 이탈 위험|gpt|": llm})
+
+    path = str(tmp_path / f"segment{ext}")
+    chunks = iter_segment_chunks(df_pred, df_raw, ["Tier 1", "Tier 2"], strategies, chunk_rows=1, rule_fill=True)
+    assert write_export(path, chunks) == 4
+
+    out = pd.read_csv(path) if ext == ".csv" else pd.read_parquet(path)
+    out = out.set_index("customer_id")
+    for cid in ["A", "B", "C"]:
+        assert _messages(out.loc[cid]) == _expected_messages(df_raw, cid)
+        assert out.loc[cid, "strategy_engine"] == "rules"
+    assert out.loc["D", "strategy_engine"] == "llm"
+    assert _messages(out.loc["D"]) == [("Email", "llm")]
+    assert out.loc["D", "channel_Email_score"] == 5
+
+
+@pytest.mark.parametrize("ext", [".csv", ".parquet"])
+def test_export_parts_are_independent_files(tmp_path, monkeypatch, ext):
+    if ext == ".parquet":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr("modules.export.EXPORT_PART_SLICE_ROWS", 500)
+    n = 20_000
+    rng = np.random.default_rng(0)
+    # 압축이 거의 안 되는 값 (Parquet도 파트가 나뉘도록)
+    df = pd.DataFrame({"customer_id": [f"C{i:06d}" for i in range(n)], "text": [rng.bytes(30).hex() for _ in range(n)]})
+    chunks = (df.iloc[i:i + 3_000] for i in range(0, n, 3_000))
+
+    parts = write_export_parts(str(tmp_path / f"segment{ext}"), chunks, part_mb=0.5)
+    assert len(parts) > 1
+    assert sum(rows for _, rows in parts) == n
+    read = pd.read_csv if ext == ".csv" else pd.read_parquet
+    back = pd.concat([read(p) for p, _ in parts], ignore_index=True)
+    assert back["customer_id"].tolist() == df["customer_id"].tolist()
+    assert all(os.path.getsize(p) <= 0.5e6 for p, _ in parts)
+
+
+def test_cleanup_exports_removes_only_expired(tmp_path):
+    old, new = tmp_path / "old.csv", tmp_path / "new.csv"
+    old.write_text("a")
+    new.write_text("b")
+    os.utime(old, (time.time() - 3 * 3600, time.time() - 3 * 3600))
+    assert cleanup_exports(str(tmp_path), max_age_hours=1) == 1
+    assert not old.exists() and new.exists()
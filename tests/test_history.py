@@ -0,0 +1,61 @@
+import glob
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from modules.history import COMPACTED_PREFIX, append_run, compact, customer_history, new_run_key, tier_trend
+
+
+def _scored(ids, proba):
+    proba = np.asarray(proba, dtype=float)
+    tiers = np.where(proba >= 0.99, "Tier 1", np.where(proba >= 0.9, "Tier 2", "Tier 4"))
+    return pd.DataFrame({
+        "customer_id": ids,
+        "churn_proba": proba,
+        "risk_tier": tiers,
+        "model_version": "v1",
+    })
+
+
+def test_append_query_compact_roundtrip(tmp_path):
+    root = str(tmp_path)
+    now = datetime.now()
+    old_key = new_run_key(now - timedelta(days=40))
+    new_key = new_run_key(now)
+
+    summary = append_run(_scored(["A", "B", "C"], [0.995, 0.5, 0.2]), run_key=old_key, root=root)
+    append_run(_scored(["A", "B"], [0.95, 0.4]), run_key=new_key, root=root)
+
+    assert summary["rows"] == 3
+    assert summary["tier_counts"]["Tier 1"] == 1
+    assert summary["proba_sum"] == pytest.approx(1.695, rel=1e-6)
+
+    hist = customer_history("A", root=root)
+    assert hist["run_key"].tolist() == [old_key, new_key]
+    assert hist["risk_tier"].tolist() == ["Tier 1", "Tier 2"]
+
+    stats = compact(root=root, older_than_days=30)
+    assert stats["merged"] >= 1 and stats["written"] >= 1
+    assert glob.glob(os.path.join(root, "bucket=*", f"{COMPACTED_PREFIX}*.parquet"))
+
+    after = customer_history("A", root=root)
+    pd.testing.assert_frame_equal(after.reset_index(drop=True), hist.reset_index(drop=True))
+    assert customer_history("C", root=root)["churn_proba"].tolist() == pytest.approx([0.2])
+
+
+def test_partitions_sharing_run_key_are_kept(tmp_path):
+    # 배치 파티션처럼 run_key를 공유하는 append는 서로 다른 append_id로 구분
+    root = str(tmp_path)
+    key = new_run_key()
+    append_run(_scored(["A"], [0.5]), run_key=key, part="p1", root=root)
+    append_run(_scored(["A"], [0.95]), run_key=key, part="p2", root=root)
+
+    assert len(customer_history("A", root=root)) == 2
+    trend = tier_trend(root=root)
+    assert len(trend) == 1
+    assert trend["rows"].iat[0] == 2
@@ -0,0 +1,61 @@
+import io
+
+import pandas as pd
+import pytest
+
+import modules.ingest as ingest
+from modules.ingest import read_table
+
+CSV = (
+    "﻿customer_id, gender ,region,age,spent_m1,unused\n"
+    "C1,M,Seoul,30,100,x\n"
+    "C2,,Busan,,abc,y\n"
+    ",F,,41,300,z\n"
+)
+
+
+def _read(monkeypatch, arrow: bool) -> pd.DataFrame:
+    if not arrow:
+        monkeypatch.setattr(ingest, "HAS_PYARROW", False)
+    buf = io.BytesIO(CSV.encode("utf-8"))
+    buf.name = "upload.csv"
+    return read_table(buf)
+
+
+@pytest.mark.parametrize("arrow", [True, False])
+def test_csv_header_columns_and_blanks(monkeypatch, arrow):
+    if arrow:
+        pytest.importorskip("pyarrow")
+    df = _read(monkeypatch, arrow)
+
+    assert list(df.columns) == ["customer_id", "gender", "region", "age", "spent_m1"]
+    assert isinstance(df["gender"].dtype, pd.CategoricalDtype)
+    # 빈 칸은 경로와 무관하게 결측
+    assert df["customer_id"].isna().tolist() == [False, False, True]
+    assert df["gender"].isna().tolist() == [False, True, False]
+    assert "" not in df["region"].cat.categories
+    assert pd.isna(df["age"].iat[1])
+
+
+def test_arrow_and_c_engine_agree(monkeypatch):
+    pytest.importorskip("pyarrow")
+    a = _read(monkeypatch, True)
+    c = _read(monkeypatch, False)
+    for col in ["customer_id", "gender", "region"]:
+        assert a[col].astype(object).where(a[col].notna(), None).tolist() == \
+            c[col].astype(object).where(c[col].notna(), None).tolist()
+    assert pd.to_numeric(a["spent_m1"], errors="coerce").tolist()[::2] == [100.0, 300.0]
+
+
+def test_parquet_blank_strings_become_na(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "upload.parquet"
+    pd.DataFrame({"customer_id": ["C1", ""], "gender": ["", "F"], "age": [1.0, 2.0]}).to_parquet(path)
+    df = read_table(str(path))
+    assert df["customer_id"].isna().tolist() == [False, True]
+    assert df["gender"].isna().tolist() == [True, False]
+
+
+def test_unsupported_extension():
+    with pytest.raises(ValueError):
+        read_table(io.BytesIO(b""), name="upload.xlsx")
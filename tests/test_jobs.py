@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from modules.jobs import JobManager
+
+
+def _wait(job, timeout=10):
+    job._future.result(timeout=timeout)
+    return job
+
+
+def test_job_runs_and_reports_progress():
+    manager = JobManager(max_workers=1)
+
+    def work(x, progress, publish):
+        progress("단계", 0.5)
+        publish({"preview": x})
+        return {"value": x * 2}
+
+    job = _wait(manager.submit("test", work, 21))
+    assert job.status == "done"
+    assert job.result == {"value": 42}
+    assert job.partial is None          # 완료되면 중간 결과는 정리
+    assert job.progress == 1.0
+    assert manager.get(job.job_id) is job
+
+
+def test_failed_job_keeps_error():
+    manager = JobManager(max_workers=1)
+
+    def work(progress, publish):
+        raise ValueError("boom")
+
+    job = _wait(manager.submit("test", work))
+    assert job.status == "failed"
+    assert job.error == "boom"
+    assert job.finished
+
+
+def test_cancel_stops_at_next_progress_call():
+    manager = JobManager(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+
+    def work(progress, publish):
+        started.set()
+        release.wait(5)
+        progress("다음 단계", 0.1)
+        return {"value": 1}
+
+    job = manager.submit("test", work)
+    assert started.wait(5)
+    job.cancel()
+    release.set()
+    _wait(job)
+    assert job.status == "cancelled"
+    assert job.result is None
+
+
+def test_queued_job_cancels_immediately():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+    blocker = manager.submit("block", lambda progress, publish: release.wait(5) and {})
+    queued = manager.submit("queued", lambda progress, publish: {"value": 1})
+
+    queued.cancel()
+    assert queued.status == "cancelled"
+    release.set()
+    _wait(blocker)
+    with pytest.raises(Exception):
+        queued._future.result(timeout=1)
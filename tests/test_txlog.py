@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+from modules.txlog import FEATURE_COLS, LogAggregator, build_features
+
+AS_OF = "2024-07-15"  # 7월은 미완료 -> 6월이 m1
+
+
+def _logs():
+    return pd.DataFrame({
+        "customer_id": ["A", "A", "A", "B", "B", "A", "B", "C"],
+        "date": ["2024-06-03", "2024-06-20", "2024-01-10", "2024-05-01", "2024-07-01", "not a date", "2023-12-31", "2024-02-02"],
+        "amount": [10.0, 5.0, 7.0, None, 3.0, 1.0, 9.0, 4.0],
+        "type": ["purchase", " Payment ", "login", "login", "purchase", "purchase", "txn", "refund"],
+    })
+
+
+def test_monthly_slots_and_derived_columns():
+    acc = LogAggregator(AS_OF)
+    acc.update(_logs())
+    wide = acc.to_frame().set_index("customer_id")
+
+    assert acc.rows_read == 8
+    assert acc.rows_invalid == 1                 # 날짜 파싱 불가
+    assert acc.rows_used == 4                    # 이번 달 / 6개월 밖 / 알 수 없는 유형 제외
+    assert wide.loc["A", "spent_m1"] == 15.0
+    assert wide.loc["A", "txn_m1"] == 2
+    assert wide.loc["A", "login_m6"] == 1
+    assert wide.loc["B", "login_m2"] == 1
+    assert wide.loc["A", "recent_3m_spent"] == 15.0
+    assert wide.loc["A", "spent_change_ratio"] == pytest.approx(15.0)
+    assert "C" not in wide.index
+
+
+def test_merge_matches_single_pass():
+    df = _logs()
+    whole = LogAggregator(AS_OF)
+    whole.update(df)
+    merged = LogAggregator(AS_OF)
+    for lo in range(0, len(df), 3):
+        part = LogAggregator(AS_OF)
+        part.update(df.iloc[lo:lo + 3])
+        merged.merge(part)
+
+    a = whole.to_frame().set_index("customer_id").sort_index()
+    b = merged.to_frame().set_index("customer_id").sort_index()
+    pd.testing.assert_frame_equal(a, b)
+    with pytest.raises(ValueError):
+        merged.merge(LogAggregator("2024-01-01"))
+
+
+def test_build_features_joins_attributes(tmp_path):
+    path = tmp_path / "logs.csv"
+    _logs().to_csv(path, index=False)
+    attrs = pd.DataFrame({"customer_id": ["A", "Z"], "age": [30, 40]})
+
+    out = build_features([str(tmp_path)], AS_OF, attributes=attrs).set_index("customer_id")
+    assert out.loc["A", "age"] == 30
+    assert out.loc["A", "spent_m1"] == 15.0
+    # 로그가 없는 고객은 월별 값 0
+    assert (out.loc["Z", FEATURE_COLS] == 0).all()
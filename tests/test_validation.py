@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+from modules.validation import summarize, validate
+
+
+def _raw():
+    return pd.DataFrame({
+        "customer_id": pd.Series(["C1", "C2", "C2", "", None, "C6"], dtype="string"),
+        "age": [30, 41, 52, 33, 28, 250],
+        "marketing_open_rate_6m": ["0.2", "abc", "0.5", "0.1", "0.3", ""],
+        "gender": ["M", "F", "F", None, "M", " "],
+        "region": ["Seoul", "Busan", "Seoul", "Seoul", "Mars", "Seoul"],
+    })
+
+
+def test_string_ids_are_validated():
+    df = _raw()
+    valid, quarantine, report = validate(df, categories={"region": ["Seoul", "Busan"]})
+
+    assert valid["customer_id"].tolist() == ["C1"]
+    reasons = dict(zip(quarantine["row_number"], quarantine["reject_reasons"]))
+    assert reasons[2] == "NON_NUMERIC:marketing_open_rate_6m"
+    assert reasons[3] == "DUPLICATE_ID"
+    assert reasons[4] == "MISSING_ID"
+    assert reasons[5] == "MISSING_ID"
+    assert reasons[6] == "OUT_OF_RANGE:age"
+
+    counts = {(r.code, r.column): r.rows for r in report.itertuples()}
+    assert counts[("UNKNOWN_FILLED", "gender")] == 2
+    assert counts[("ZERO_FILLED", "marketing_open_rate_6m")] == 1
+    assert counts[("UNKNOWN_CATEGORY", "region")] == 1
+
+    assert summarize(len(df), quarantine, report)["valid"] == 1
+    # 입력 DataFrame은 수정하지 않음
+    pd.testing.assert_frame_equal(df, _raw())
+
+
+def test_clean_frame_passes_through():
+    df = pd.DataFrame({"customer_id": ["A", "B"], "age": [20, 30]})
+    valid, quarantine, _ = validate(df)
+    assert valid is df
+    assert len(quarantine) == 0
+    assert np.array_equal(quarantine.columns[-2:], ["row_number", "reject_reasons"])